@@ -0,0 +1,26 @@
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  // users.positive_score / negative_score become the source for rating reads;
+  // bring them in line with the ratings table once.
+  await knex.schema.raw(`
+    UPDATE users AS u
+    SET positive_score = COALESCE(r.positive, 0),
+        negative_score = COALESCE(r.negative, 0)
+    FROM users AS base
+    LEFT JOIN (
+      SELECT rated_user_id,
+             COUNT(*) FILTER (WHERE score = 1) AS positive,
+             COUNT(*) FILTER (WHERE score = -1) AS negative
+      FROM ratings
+      GROUP BY rated_user_id
+    ) AS r ON r.rated_user_id = base.id
+    WHERE base.id = u.id
+      AND (u.positive_score IS DISTINCT FROM COALESCE(r.positive, 0)
+        OR u.negative_score IS DISTINCT FROM COALESCE(r.negative, 0));
+  `);
+}
+
+/** @type {import('knex').Knex} */
+export async function down() {
+  // Counters are derived data; nothing to undo.
+}
@@ -0,0 +1,27 @@
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  await knex.schema.raw('CREATE EXTENSION IF NOT EXISTS pg_trgm;');
+
+  // Suggestion fallback: similarity on active product names
+  await knex.schema.raw(`
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_active_name_trgm
+    ON products USING GIN (name gin_trgm_ops)
+    WHERE status = 'ACTIVE';
+  `);
+
+  // Category search: lets ILIKE '%term%' use an index
+  await knex.schema.raw(`
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_categories_name_trgm
+    ON categories USING GIN (name gin_trgm_ops);
+  `);
+}
+
+/** @type {import('knex').Knex} */
+export async function down(knex) {
+  await knex.schema.raw('DROP INDEX CONCURRENTLY IF EXISTS idx_categories_name_trgm;');
+  await knex.schema.raw('DROP INDEX CONCURRENTLY IF EXISTS idx_products_active_name_trgm;');
+}
+
+export const config = {
+  transaction: false
+};
@@ -0,0 +1,85 @@
+// Rebuilds products.search_vector with an accent-insensitive configuration
+// ("dien thoai" matches "điện thoại") and name/description weights for
+// ts_rank_cd. Runs outside a transaction so the backfill commits per batch
+// and never holds row locks on the whole table while bids come in.
+const BATCH_SIZE = Number(process.env.SEARCH_VECTOR_BATCH_SIZE || 2000);
+
+const weightedVector = (config, row) => `
+  setweight(to_tsvector('${config}', coalesce(${row}.name, '')), 'A') ||
+  setweight(to_tsvector('${config}', coalesce(${row}.description, '')), 'B')
+`;
+
+const plainVector = (config, row) =>
+  `to_tsvector('${config}', coalesce(${row}.name, '') || ' ' || coalesce(${row}.description, ''))`;
+
+const replaceTrigger = async (knex, vector, columns) => {
+  await knex.schema.raw(`
+    CREATE OR REPLACE FUNCTION products_search_vector_trigger()
+    RETURNS trigger AS $$
+    begin
+      new.search_vector := ${vector};
+      return new;
+    end
+    $$ LANGUAGE plpgsql;
+  `);
+  await knex.schema.raw('DROP TRIGGER IF EXISTS trg_products_search_vector ON products');
+  await knex.schema.raw(`
+    CREATE TRIGGER trg_products_search_vector
+    BEFORE INSERT OR UPDATE${columns ? ` OF ${columns}` : ''} ON products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_trigger();
+  `);
+};
+
+// Walks the table in id order, one short autocommitted UPDATE per batch.
+const rebuildVectors = async (knex, vector) => {
+  let lastId = 0;
+  for (;;) {
+    const result = await knex.raw(
+      `
+      WITH batch AS (
+        SELECT id FROM products WHERE id > ? ORDER BY id LIMIT ?
+      )
+      UPDATE products p
+      SET search_vector = ${vector}
+      FROM batch
+      WHERE p.id = batch.id
+      RETURNING p.id
+    `,
+      [lastId, BATCH_SIZE]
+    );
+    if (!result.rows.length) break;
+    lastId = Math.max(...result.rows.map((row) => Number(row.id)));
+  }
+};
+
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  await knex.schema.raw('CREATE EXTENSION IF NOT EXISTS unaccent;');
+  await knex.schema.raw(`
+    DO $$
+    BEGIN
+      IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'vn_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION vn_unaccent (COPY = simple);
+        ALTER TEXT SEARCH CONFIGURATION vn_unaccent
+          ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+      END IF;
+    END
+    $$;
+  `);
+
+  // New rows and name/description edits get the new vector right away;
+  // bids and status changes no longer recompute it.
+  await replaceTrigger(knex, weightedVector('vn_unaccent', 'new'), 'name, description');
+  await rebuildVectors(knex, weightedVector('vn_unaccent', 'p'));
+}
+
+/** @type {import('knex').Knex} */
+export async function down(knex) {
+  await replaceTrigger(knex, plainVector('simple', 'new'));
+  await rebuildVectors(knex, plainVector('simple', 'p'));
+  await knex.schema.raw('DROP TEXT SEARCH CONFIGURATION IF EXISTS vn_unaccent;');
+}
+
+export const config = {
+  transaction: false
+};
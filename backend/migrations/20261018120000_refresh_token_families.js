@@ -0,0 +1,83 @@
+// Groups every rotation chain under one family_id so logout/revocation is a
+// single indexed UPDATE, and adds the index the compaction job deletes by.
+// Runs outside a transaction: indexes are built CONCURRENTLY and the
+// backfill commits one batch of chains at a time.
+const BATCH_SIZE = Number(process.env.REFRESH_FAMILY_BATCH_SIZE || 1000);
+
+const backfillFamilies = async (knex) => {
+  let lastId = 0;
+  for (;;) {
+    // Chain roots: first token of a login, or a token whose parent is gone.
+    const { rows: roots } = await knex.raw(
+      `
+      SELECT t.id FROM refresh_tokens t
+      WHERE t.id > ?
+        AND t.family_id IS NULL
+        AND (
+          t.rotated_from IS NULL
+          OR NOT EXISTS (SELECT 1 FROM refresh_tokens parent WHERE parent.id = t.rotated_from)
+        )
+      ORDER BY t.id
+      LIMIT ?
+    `,
+      [lastId, BATCH_SIZE]
+    );
+    if (!roots.length) break;
+    const rootIds = roots.map((row) => Number(row.id));
+
+    await knex.raw(
+      `
+      WITH RECURSIVE chain AS (
+        SELECT id, gen_random_uuid() AS family_id
+        FROM refresh_tokens
+        WHERE id = ANY(?::int[])
+        UNION ALL
+        SELECT t.id, chain.family_id
+        FROM refresh_tokens t
+        JOIN chain ON t.rotated_from = chain.id
+      )
+      UPDATE refresh_tokens r
+      SET family_id = chain.family_id
+      FROM chain
+      WHERE r.id = chain.id
+    `,
+      [rootIds]
+    );
+    lastId = rootIds[rootIds.length - 1];
+  }
+};
+
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  await knex.schema.raw('ALTER TABLE refresh_tokens ADD COLUMN IF NOT EXISTS family_id UUID;');
+
+  // Only needed to walk chains during the backfill.
+  await knex.schema.raw(`
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_rotated_from
+    ON refresh_tokens (rotated_from);
+  `);
+  await backfillFamilies(knex);
+  await knex.schema.raw('DROP INDEX CONCURRENTLY IF EXISTS idx_refresh_tokens_rotated_from;');
+
+  await knex.schema.raw(`
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_family_id
+    ON refresh_tokens (family_id);
+  `);
+  // Compaction: revoked rows past the retention window
+  await knex.schema.raw(`
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_revoked_at
+    ON refresh_tokens (revoked_at)
+    WHERE revoked_at IS NOT NULL;
+  `);
+}
+
+/** @type {import('knex').Knex} */
+export async function down(knex) {
+  await knex.schema.raw('DROP INDEX CONCURRENTLY IF EXISTS idx_refresh_tokens_revoked_at;');
+  await knex.schema.raw('DROP INDEX CONCURRENTLY IF EXISTS idx_refresh_tokens_family_id;');
+  await knex.schema.raw('ALTER TABLE refresh_tokens DROP COLUMN IF EXISTS family_id;');
+}
+
+export const config = {
+  transaction: false
+};
@@ -0,0 +1,60 @@
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  await knex.schema.createTable('mail_outbox', (table) => {
+    table.bigIncrements('id').primary();
+    table.string('kind', 40).notNullable();
+    // recipients are resolved at send time; `email` is for non-user addresses
+    table
+      .bigInteger('user_id')
+      .unsigned()
+      .references('id')
+      .inTable('users')
+      .onDelete('CASCADE');
+    table.string('email', 255);
+    table.jsonb('payload').notNullable().defaultTo('{}');
+    table.string('coalesce_key', 255);
+    table.integer('coalesced_count').notNullable().defaultTo(0);
+    table.string('status', 16).notNullable().defaultTo('PENDING');
+    table.integer('attempts').notNullable().defaultTo(0);
+    table.timestamp('available_at', { useTz: true }).notNullable().defaultTo(knex.fn.now());
+    table.timestamp('locked_at', { useTz: true });
+    table.timestamp('sent_at', { useTz: true });
+    table.text('last_error');
+    table.timestamp('created_at', { useTz: true }).notNullable().defaultTo(knex.fn.now());
+  });
+
+  await knex.schema.raw(`
+    ALTER TABLE mail_outbox
+    ADD CONSTRAINT mail_outbox_status_check
+    CHECK (status IN ('PENDING', 'SENDING', 'SENT', 'FAILED'));
+  `);
+  // dispatcher claim order
+  await knex.schema.raw(`
+    CREATE INDEX idx_mail_outbox_due
+    ON mail_outbox (available_at)
+    WHERE status = 'PENDING';
+  `);
+  // at most one queued mail per coalesce key; later ones update it
+  await knex.schema.raw(`
+    CREATE UNIQUE INDEX idx_mail_outbox_pending_key
+    ON mail_outbox (coalesce_key)
+    WHERE status = 'PENDING' AND coalesce_key IS NOT NULL;
+  `);
+  // last delivery per key, for the coalescing window
+  await knex.schema.raw(`
+    CREATE INDEX idx_mail_outbox_delivered_key
+    ON mail_outbox (coalesce_key, locked_at DESC)
+    WHERE status IN ('SENDING', 'SENT') AND coalesce_key IS NOT NULL;
+  `);
+  // retention cleanup
+  await knex.schema.raw(`
+    CREATE INDEX idx_mail_outbox_finished
+    ON mail_outbox (created_at)
+    WHERE status IN ('SENT', 'FAILED');
+  `);
+}
+
+/** @type {import('knex').Knex} */
+export async function down(knex) {
+  await knex.schema.dropTableIfExists('mail_outbox');
+}
@@ -0,0 +1,20 @@
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  // IMMEDIATE: one mail per bid/outbid; DIGEST: one summary per window
+  await knex.schema.alterTable('users', (table) => {
+    table.string('notification_mode', 16).notNullable().defaultTo('IMMEDIATE');
+  });
+
+  await knex.schema.raw(`
+    ALTER TABLE users
+    ADD CONSTRAINT users_notification_mode_check
+    CHECK (notification_mode IN ('IMMEDIATE', 'DIGEST'));
+  `);
+}
+
+/** @type {import('knex').Knex} */
+export async function down(knex) {
+  await knex.schema.alterTable('users', (table) => {
+    table.dropColumn('notification_mode');
+  });
+}
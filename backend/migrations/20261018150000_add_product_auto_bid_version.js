@@ -0,0 +1,15 @@
+/** @type {import('knex').Knex} */
+export async function up(knex) {
+  // Bumped in the transaction of every auto_bids write; cached proxy-bid
+  // ladders are only used while their version matches the locked row.
+  await knex.schema.alterTable('products', (table) => {
+    table.integer('auto_bid_version').notNullable().defaultTo(0);
+  });
+}
+
+/** @type {import('knex').Knex} */
+export async function down(knex) {
+  await knex.schema.alterTable('products', (table) => {
+    table.dropColumn('auto_bid_version');
+  });
+}
@@ -0,0 +1,46 @@
+import db from '../src/db/knex.js';
+import {
+  backfillRatingCounters,
+  countRatingCounterDrift,
+  findRatingCounterDrift
+} from '../src/repositories/rating.repository.js';
+
+const SAMPLE_LIMIT = 20;
+
+// Usage: node scripts/rating-counters.js [--fix]
+// Compares users.positive_score / negative_score with the ratings table.
+// Exits non-zero when drift is found and --fix was not given.
+const run = async () => {
+  const fix = process.argv.includes('--fix');
+
+  const drifted = await countRatingCounterDrift();
+  if (!drifted) {
+    console.log('Rating counters are in sync.');
+    return;
+  }
+
+  const sample = await findRatingCounterDrift(SAMPLE_LIMIT);
+  console.log(`Rating counters drifted for ${drifted} user(s):`);
+  sample.forEach((row) => {
+    console.log(
+      `  user=${row.id} positive=${row.positive_score}->${row.expected_positive} ` +
+        `negative=${row.negative_score}->${row.expected_negative}`
+    );
+  });
+
+  if (!fix) {
+    console.log('Run with --fix to rewrite them from the ratings table.');
+    process.exitCode = 1;
+    return;
+  }
+
+  const fixed = await db.transaction((trx) => backfillRatingCounters(trx));
+  console.log(`Backfilled rating counters for ${fixed} user(s).`);
+};
+
+run()
+  .catch((error) => {
+    console.error('Rating counter check failed:', error);
+    process.exitCode = 1;
+  })
+  .finally(() => db.destroy());
@@ -160,7 +160,25 @@ const deleteSeedData = async (trx, productIds) => {
   const questionIds = await trx('questions').whereIn('product_id', productIds).pluck('id');
 
   if (orderIds.length) {
+    const ratedUserIds = [
+      ...new Set(await trx('ratings').whereIn('order_id', orderIds).pluck('rated_user_id'))
+    ];
     await trx('ratings').whereIn('order_id', orderIds).del();
+    // keep users.positive_score / negative_score in step with ratings
+    if (ratedUserIds.length) {
+      await trx('users')
+        .whereIn('id', ratedUserIds)
+        .update({
+          positive_score: trx('ratings')
+            .count('*')
+            .whereRaw('ratings.rated_user_id = users.id')
+            .andWhere('score', 1),
+          negative_score: trx('ratings')
+            .count('*')
+            .whereRaw('ratings.rated_user_id = users.id')
+            .andWhere('score', -1)
+        });
+    }
     await trx('order_messages').whereIn('order_id', orderIds).del();
     await trx('orders').whereIn('id', orderIds).del();
   }
@@ -6,6 +6,7 @@ import fs from 'node:fs';
 import path from 'node:path';
 import routes from '../routes/index.js';
 import { notFoundHandler, errorHandler } from '../middlewares/error.js';
+import { recordRequestMetrics } from '../middlewares/metrics.js';
 import corsConfig from '../config/cors.js';
 import passport from '../config/passport.js';
 import cookieParser from 'cookie-parser';
@@ -16,6 +17,7 @@ if (!fs.existsSync(uploadsDir)) {
   fs.mkdirSync(uploadsDir, { recursive: true });
 }
 
+app.use(recordRequestMetrics);
 app.use(passport.initialize());
 app.use(helmet());
 app.use(cors(corsConfig));
@@ -1,6 +1,6 @@
 import { Strategy as JwtStrategy, ExtractJwt } from 'passport-jwt';
 import passport from 'passport';
-import db from '../db/knex.js';
+import { loadPrincipal } from '../services/principal.service.js';
 
 const opts = {
   jwtFromRequest: ExtractJwt.fromAuthHeaderAsBearerToken(),
@@ -9,10 +9,7 @@ const opts = {
 
 const strategy = new JwtStrategy(opts, async (payload, done) => {
   try {
-    const user = await db('users')
-      .select('id', 'email', 'role', 'status')
-      .where({ id: payload.sub })
-      .first();
+    const user = await loadPrincipal(payload.sub);
 
     if (!user || user.status !== 'CONFIRMED') {
       return done(null, false);
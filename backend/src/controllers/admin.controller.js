@@ -14,6 +14,8 @@ import {
   adminFinalizeAuctions,
   adminUpdateExtendSettings
 } from '../services/admin.service.js';
+import { getSearchCacheStats } from '../services/search.service.js';
+import { getSuggestIndexStats } from '../services/suggest.service.js';
 import { ApiError, sendSuccess } from '../utils/response.js';
 
 const categorySchema = Joi.object({
@@ -44,6 +46,9 @@ export const getDashboard = async (_req, res, next) => {
   }
 };
 
+export const getSearchCacheStatsAdmin = (_req, res) =>
+  sendSuccess(res, { ...getSearchCacheStats(), suggest: getSuggestIndexStats() });
+
 export const createCategoryAdmin = async (req, res, next) => {
   try {
     const { value, error } = categorySchema.validate(req.body, { abortEarly: false, stripUnknown: true });
@@ -1,10 +1,27 @@
-import { buildHomepagePayload } from '../services/homepage.service.js';
+import { getHomepageSnapshot } from '../services/homepage.service.js';
 import { sendSuccess } from '../utils/response.js';
 
-export const getHomepageContent = async (_req, res, next) => {
+const matchesEtag = (header, etag) =>
+  Boolean(header) &&
+  header.split(',').some((value) => {
+    const candidate = value.trim();
+    return candidate === '*' || candidate === etag || `W/${candidate}` === etag;
+  });
+
+export const getHomepageContent = async (req, res, next) => {
   try {
-    const sections = await buildHomepagePayload();
-    return sendSuccess(res, sections);
+    const snapshot = await getHomepageSnapshot();
+    res.set('ETag', snapshot.etag);
+    res.set('Cache-Control', 'public, max-age=0, must-revalidate');
+
+    if (matchesEtag(req.get('If-None-Match'), snapshot.etag)) {
+      return res.status(304).end();
+    }
+
+    return sendSuccess(res, snapshot.payload, null, {
+      version: snapshot.version,
+      generatedAt: snapshot.generatedAt
+    });
   } catch (err) {
     next(err);
   }
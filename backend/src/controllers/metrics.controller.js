@@ -0,0 +1,34 @@
+import crypto from 'node:crypto';
+import { getMetricsText } from '../services/metrics.service.js';
+import { ApiError } from '../utils/response.js';
+
+const METRICS_TOKEN = process.env.METRICS_TOKEN || '';
+// without a token the endpoint is only open outside production
+const METRICS_OPEN = !METRICS_TOKEN && process.env.NODE_ENV !== 'production';
+
+const tokenMatches = (header = '') => {
+  const expected = Buffer.from(`Bearer ${METRICS_TOKEN}`);
+  const received = Buffer.from(header);
+  return expected.length === received.length && crypto.timingSafeEqual(expected, received);
+};
+
+// Prometheus scrape endpoint; requires `Authorization: Bearer <METRICS_TOKEN>`.
+// In production it is disabled until METRICS_TOKEN is set.
+export const getMetrics = async (req, res, next) => {
+  try {
+    if (!METRICS_OPEN) {
+      if (!METRICS_TOKEN) {
+        throw new ApiError(404, 'METRICS.DISABLED', 'Metrics are disabled');
+      }
+      if (!tokenMatches(req.get('Authorization'))) {
+        throw new ApiError(401, 'METRICS.UNAUTHORIZED', 'Metrics token required');
+      }
+    }
+    const body = await getMetricsText();
+    res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+    res.set('Cache-Control', 'no-store');
+    return res.send(body);
+  } catch (err) {
+    next(err);
+  }
+};
@@ -10,6 +10,7 @@ import {
   appendProductDescription as appendDescriptionService,
   rejectBidder as rejectBidderService
 } from '../services/product.service.js';
+import { openProductStream } from '../services/productStream.service.js';
 import { cleanupUploadedFiles, buildPublicUrl } from '../middlewares/upload.js';
 import { ApiError, sendCreated, sendSuccess } from '../utils/response.js';
 
@@ -17,7 +18,10 @@ const querySchema = Joi.object({
   page: Joi.number().integer().min(1).optional(),
   limit: Joi.number().integer().min(1).max(100).optional(),
   sort: Joi.string().pattern(/^[a-z_]+,(asc|desc)$/i).optional(),
-  categoryId: Joi.number().integer().min(1).optional()
+  categoryId: Joi.number().integer().min(1).optional(),
+  cursor: Joi.string().max(512).optional(),
+  includeTotal: Joi.boolean().optional(),
+  countMode: Joi.string().valid('auto', 'exact', 'estimate', 'none').optional()
 });
 
 const idParamSchema = Joi.object({
@@ -153,6 +157,18 @@ export const getProductBids = async (req, res, next) => {
   }
 };
 
+export const streamProduct = async (req, res, next) => {
+  try {
+    const { value: params, error } = idParamSchema.validate(req.params, { convert: true });
+    if (error) {
+      throw new ApiError(422, 'PRODUCTS.INVALID_ID', 'Invalid product identifier');
+    }
+    await openProductStream(params.id, req, res);
+  } catch (err) {
+    next(err);
+  }
+};
+
 export const createProduct = async (req, res, next) => {
   const uploadedFiles = req.files || [];
   try {
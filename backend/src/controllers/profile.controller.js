@@ -7,7 +7,8 @@ const updateProfileSchema = Joi.object({
   fullName: Joi.string().min(2).max(120).optional(),
   phoneNumber: Joi.string().max(30).allow('', null),
   address: Joi.string().max(255).allow('', null),
-  dateOfBirth: Joi.date().iso().allow(null)
+  dateOfBirth: Joi.date().iso().allow(null),
+  notificationMode: Joi.string().valid('IMMEDIATE', 'DIGEST').optional()
 }).min(1);
 
 export const getProfile = async (req, res, next) => {
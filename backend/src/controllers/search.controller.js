@@ -1,6 +1,7 @@
 import Joi from 'joi';
 import { searchActiveProducts, searchCategoriesByName } from '../services/search.service.js';
-import { sendSuccess } from '../utils/response.js';
+import { suggest as suggestCompletions } from '../services/suggest.service.js';
+import { sendSuccess, ApiError } from '../utils/response.js';
 
 const searchSchema = Joi.object({
   q: Joi.string().trim().min(2).max(120).required(),
@@ -8,8 +9,12 @@ const searchSchema = Joi.object({
   limit: Joi.number().integer().min(1).max(60).default(12),
   categoryId: Joi.number().integer().min(1).optional(),
   sort: Joi.string()
-    .valid('end_at,asc', 'end_at,desc', 'price,asc', 'price,desc', 'bid_count,desc', 'created_at,desc')
+    .valid('relevance,desc', 'end_at,asc', 'end_at,desc', 'price,asc', 'price,desc', 'bid_count,desc', 'created_at,desc')
     .optional(),
+  cursor: Joi.string().max(512).optional(),
+  includeTotal: Joi.boolean().optional(),
+  countMode: Joi.string().valid('auto', 'exact', 'estimate', 'none').optional(),
+  facets: Joi.boolean().default(false),
   priceMin: Joi.number().integer().min(0).optional(),
   priceMax: Joi.number().integer().min(0).optional(),
   priceLogic: Joi.string().lowercase().valid('and', 'or').optional(),
@@ -26,6 +31,11 @@ const searchSchema = Joi.object({
   endAtLogic: Joi.string().lowercase().valid('and', 'or').optional()
 });
 
+const suggestSchema = Joi.object({
+  q: Joi.string().trim().min(1).max(120).required(),
+  limit: Joi.number().integer().min(1).max(20).default(8)
+});
+
 export const search = async (req, res, next) => {
   try {
     const { value, error } = searchSchema.validate(req.query, {
@@ -60,6 +70,10 @@ export const search = async (req, res, next) => {
         offset,
         categoryId: value.categoryId,
         sort: value.sort,
+        cursor: value.cursor,
+        includeTotal: value.includeTotal,
+        countMode: value.countMode,
+        facets: value.facets,
         priceMin: value.priceMin,
         priceMax: value.priceMax,
         priceLogic: value.priceLogic,
@@ -78,16 +92,40 @@ export const search = async (req, res, next) => {
       searchCategoriesByName({ term: value.q, limit: 10 })
     ]);
 
-    const { items, total } = productResult;
+    const { items, total, countMode, hasMore, nextCursor, facets } = productResult;
 
     const meta = {
       total,
-      page,
+      countMode,
+      page: value.cursor ? null : page,
       limit,
-      hasMore: offset + items.length < total
+      hasMore,
+      nextCursor
     };
 
-    return sendSuccess(res, { items, categories: categoryResult, meta });
+    const data = { items, categories: categoryResult, meta };
+    if (value.facets) {
+      data.facets = facets;
+    }
+
+    return sendSuccess(res, data);
+  } catch (err) {
+    next(err);
+  }
+};
+
+export const suggest = async (req, res, next) => {
+  try {
+    const { value, error } = suggestSchema.validate(req.query, {
+      abortEarly: false,
+      convert: true
+    });
+    if (error) {
+      throw new ApiError(422, 'SEARCH.INVALID_SUGGEST_QUERY', 'Invalid suggestion query', error.details);
+    }
+
+    const suggestions = await suggestCompletions(value.q, { limit: value.limit });
+    return sendSuccess(res, { suggestions });
   } catch (err) {
     next(err);
   }
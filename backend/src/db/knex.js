@@ -1,8 +1,16 @@
 // backend/src/db/knex.js
 import knex from 'knex';
 import config from '../../knexfile.js';
+import { installQueryMetrics } from './queryMetrics.js';
+import { installSlowQueryLog } from './slowQueryLog.js';
 
 const env = process.env.NODE_ENV || 'development';
 const db = knex(config[env]);
 
+installQueryMetrics(db);
+
+if (process.env.SLOW_QUERY_LOG === 'true') {
+  installSlowQueryLog(db);
+}
+
 export default db;
@@ -0,0 +1,62 @@
+// Per-query latency for /api/metrics: every knex query is timed into the
+// db_query_duration_seconds histogram, labelled with a low-cardinality tag
+// ("select products", "update mail_outbox", "begin") derived from the SQL,
+// so raw queries are tagged the same way as builders.
+import { createHistogram } from '../utils/metrics.js';
+
+const queryDuration = createHistogram({
+  name: 'db_query_duration_seconds',
+  help: 'Knex query latency by statement and main table',
+  labelNames: ['tag', 'outcome']
+});
+
+const CTE_STATEMENT = /\)\s*(select|insert|update|delete)\b/i;
+const TABLE_PATTERNS = {
+  select: /\bfrom\s+"?(\w+)"?/i,
+  insert: /\binto\s+"?(\w+)"?/i,
+  update: /\bupdate\s+"?(\w+)"?/i,
+  delete: /\bfrom\s+"?(\w+)"?/i
+};
+
+export const queryTag = (sql = '') => {
+  const text = sql.trimStart();
+  let verb = (text.match(/^\w+/)?.[0] || 'unknown').toLowerCase();
+  if (verb === 'with') {
+    verb = (text.match(CTE_STATEMENT)?.[1] || 'select').toLowerCase();
+  }
+  const pattern = TABLE_PATTERNS[verb];
+  if (!pattern) return verb;
+  const table = text.match(pattern)?.[1];
+  return table ? `${verb} ${table.toLowerCase()}` : verb;
+};
+
+/**
+ * Hooks knex query events on `db`. Returns a function that detaches them.
+ */
+export const installQueryMetrics = (db) => {
+  const pending = new Map();
+
+  const onQuery = (query) => {
+    if (query.__knexQueryUid) pending.set(query.__knexQueryUid, process.hrtime.bigint());
+  };
+
+  const finish = (query, outcome) => {
+    const uid = query?.__knexQueryUid;
+    const started = pending.get(uid);
+    if (started === undefined) return;
+    pending.delete(uid);
+    queryDuration.observe({ tag: queryTag(query.sql), outcome }, Number(process.hrtime.bigint() - started) / 1e9);
+  };
+
+  const onResponse = (_response, query) => finish(query, 'ok');
+  const onError = (_err, query) => finish(query, 'error');
+  db.on('query', onQuery);
+  db.on('query-response', onResponse);
+  db.on('query-error', onError);
+
+  return () => {
+    db.removeListener('query', onQuery);
+    db.removeListener('query-response', onResponse);
+    db.removeListener('query-error', onError);
+  };
+};
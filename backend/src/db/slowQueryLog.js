@@ -0,0 +1,191 @@
+// Opt-in slow-query log (SLOW_QUERY_LOG=true). Queries slower than
+// SLOW_QUERY_MS are appended to a size-rotated JSONL file with their SQL
+// fingerprint, the shape of their bindings (never the values), the
+// repository/service function that issued them and the duration. A sampled
+// share also gets an EXPLAIN, run read-only with a statement timeout.
+// Aggregate the file with testing/w8/slow_query_report.py.
+import crypto from 'node:crypto';
+import fs from 'node:fs';
+import path from 'node:path';
+
+const THRESHOLD_MS = Number(process.env.SLOW_QUERY_MS || 200);
+const EXPLAIN_SAMPLE = Number(process.env.SLOW_QUERY_EXPLAIN_SAMPLE || 0);
+// a fingerprint is explained at most once per interval
+const EXPLAIN_INTERVAL_MS = Number(process.env.SLOW_QUERY_EXPLAIN_INTERVAL_MS || 10 * 60 * 1000);
+const EXPLAIN_TIMEOUT_MS = Number(process.env.SLOW_QUERY_EXPLAIN_TIMEOUT_MS || 5000);
+const LOG_FILE = path.resolve(process.env.SLOW_QUERY_LOG_FILE || 'logs/slow-queries.jsonl');
+const MAX_FILE_BYTES = Number(process.env.SLOW_QUERY_LOG_MAX_MB || 20) * 1024 * 1024;
+const MAX_FILES = Number(process.env.SLOW_QUERY_LOG_FILES || 5);
+const STACK_DEPTH = 40;
+
+/**
+ * Collapses literals, placeholders and IN/VALUES lists so the same query
+ * shape always yields the same text.
+ */
+export const fingerprintSql = (sql = '') =>
+  sql
+    .replace(/'(?:[^']|'')*'/g, '?')
+    .replace(/\$\d+/g, '?')
+    .replace(/\b\d+(?:\.\d+)?\b/g, '?')
+    .replace(/\(\s*\?(?:\s*,\s*\?)+\s*\)/g, '(?+)')
+    .replace(/(?:\(\?\+\)|\(\?\))(?:\s*,\s*(?:\(\?\+\)|\(\?\)))+/g, '(?+)+')
+    .replace(/\s+/g, ' ')
+    .trim();
+
+const bindingShape = (value) => {
+  if (value === null || value === undefined) return 'null';
+  if (Array.isArray(value)) return `array(${value.length})`;
+  if (value instanceof Date) return 'date';
+  if (Buffer.isBuffer(value)) return 'bytes';
+  if (typeof value === 'string') return value.length > 256 ? 'text' : 'string';
+  if (typeof value === 'object') return 'json';
+  return typeof value;
+};
+
+const CALLER_FRAME = /at (?:async )?([\w$.<>]+) \(?(?:file:\/\/)?[^()\s]*\/src\/((?:repositories|services|jobs)\/[\w.-]+)\.js:(\d+)/;
+
+// First repository/service/job frame of the stack. V8 keeps awaiting
+// async callers in the trace, so this usually names the function that
+// built the query; a repository that returns the builder without awaiting
+// shows up as the service that awaited it.
+const findCaller = (stack = '') => {
+  for (const line of stack.split('\n')) {
+    const match = line.match(CALLER_FRAME);
+    if (match) return `${match[2]}:${match[1]}`;
+  }
+  return 'unknown';
+};
+
+const isReadOnlySelect = (sql) =>
+  /^\s*(select|with)\b/i.test(sql) &&
+  !/\b(insert|update|delete)\b|\bfor\s+(update|share|no key update)\b|nextval\s*\(/i.test(sql);
+
+const createRotatingWriter = () => {
+  let size = null;
+  let chain = Promise.resolve();
+
+  const rotate = async () => {
+    for (let index = MAX_FILES - 1; index >= 1; index -= 1) {
+      const from = index === 1 ? LOG_FILE : `${LOG_FILE}.${index - 1}`;
+      await fs.promises.rename(from, `${LOG_FILE}.${index}`).catch(() => {});
+    }
+    size = 0;
+  };
+
+  const append = async (line) => {
+    if (size === null) {
+      await fs.promises.mkdir(path.dirname(LOG_FILE), { recursive: true });
+      size = await fs.promises.stat(LOG_FILE).then((stat) => stat.size, () => 0);
+    }
+    if (size > 0 && size + Buffer.byteLength(line) > MAX_FILE_BYTES) {
+      await rotate();
+    }
+    await fs.promises.appendFile(LOG_FILE, line);
+    size += Buffer.byteLength(line);
+  };
+
+  // writes are serialized so rotation never interleaves with an append
+  return (entry) => {
+    const line = `${JSON.stringify(entry)}\n`;
+    chain = chain.then(() => append(line)).catch((err) => {
+      console.warn('[slow-query] write failed', err.message);
+    });
+  };
+};
+
+/**
+ * Hooks knex query events on `db`. Returns a function that detaches them.
+ */
+export const installSlowQueryLog = (db) => {
+  const write = createRotatingWriter();
+  const inflight = new Map();
+  const explainedAt = new Map();
+  let explaining = false;
+
+  // Query events carry the driver SQL ($1, $2, ...), so the plan is taken on
+  // a dedicated connection outside the pool rather than through knex.raw.
+  const explain = async (sql, bindings) => {
+    const analyze = isReadOnlySelect(sql);
+    const options = analyze ? 'ANALYZE, BUFFERS, FORMAT JSON' : 'FORMAT JSON';
+    const connection = await db.client.acquireRawConnection();
+    try {
+      await connection.query('BEGIN READ ONLY');
+      await connection.query("SELECT set_config('statement_timeout', $1, true)", [String(EXPLAIN_TIMEOUT_MS)]);
+      const result = await connection.query(`EXPLAIN (${options}) ${sql}`, bindings);
+      return { analyzed: analyze, plan: result.rows[0]?.['QUERY PLAN'] };
+    } finally {
+      await connection.query('ROLLBACK').catch(() => {});
+      await db.client.destroyRawConnection(connection).catch(() => {});
+    }
+  };
+
+  const shouldExplain = (fingerprintId) => {
+    if (explaining || !(EXPLAIN_SAMPLE > 0) || Math.random() >= EXPLAIN_SAMPLE) return false;
+    const last = explainedAt.get(fingerprintId) || 0;
+    return Date.now() - last >= EXPLAIN_INTERVAL_MS;
+  };
+
+  const onQuery = (query) => {
+    const uid = query.__knexQueryUid;
+    if (!uid) return;
+    // structured frames are captured now; the text is only built for slow queries
+    const previousLimit = Error.stackTraceLimit;
+    Error.stackTraceLimit = STACK_DEPTH;
+    const trace = new Error();
+    Error.stackTraceLimit = previousLimit;
+    inflight.set(uid, { started: process.hrtime.bigint(), trace });
+  };
+
+  const onDone = (error) => (_result, query) => {
+    const uid = query?.__knexQueryUid;
+    const pending = inflight.get(uid);
+    if (!pending) return;
+    inflight.delete(uid);
+    const durationMs = Number(process.hrtime.bigint() - pending.started) / 1e6;
+    if (durationMs < THRESHOLD_MS) return;
+
+    const fingerprint = fingerprintSql(query.sql);
+    const fingerprintId = crypto.createHash('sha1').update(fingerprint).digest('hex').slice(0, 16);
+    const entry = {
+      at: new Date().toISOString(),
+      fingerprintId,
+      fingerprint,
+      durationMs: Math.round(durationMs * 100) / 100,
+      caller: findCaller(pending.trace.stack),
+      bindings: (query.bindings || []).map(bindingShape),
+      inTransaction: Boolean(query.__knexTxId),
+      ...(error ? { error: true } : {})
+    };
+
+    if (error || !shouldExplain(fingerprintId)) {
+      write(entry);
+      return;
+    }
+    explaining = true;
+    explainedAt.set(fingerprintId, Date.now());
+    explain(query.sql, query.bindings || [])
+      .then(
+        (result) => write({ ...entry, explain: result }),
+        (err) => write({ ...entry, explainError: err.message })
+      )
+      .finally(() => {
+        explaining = false;
+      });
+  };
+
+  const onResponse = onDone(false);
+  const onError = onDone(true);
+  db.on('query', onQuery);
+  db.on('query-response', onResponse);
+  db.on('query-error', onError);
+  console.info(
+    `[slow-query] logging queries over ${THRESHOLD_MS}ms to ${LOG_FILE}` +
+      (EXPLAIN_SAMPLE > 0 ? ` (EXPLAIN sample ${EXPLAIN_SAMPLE})` : '')
+  );
+
+  return () => {
+    db.removeListener('query', onQuery);
+    db.removeListener('query-response', onResponse);
+    db.removeListener('query-error', onError);
+  };
+};
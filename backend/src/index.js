@@ -2,17 +2,32 @@ import 'dotenv/config';
 import app from './app/index.js';
 import { startAuctionFinalizer } from './jobs/auctionFinalizer.js';
 import { startSellerExpiryJob } from './jobs/sellerExpiry.js';
+import { startSuggestIndexJob } from './jobs/suggestIndex.js';
+import { startRefreshTokenCompactionJob } from './jobs/refreshTokenCompaction.js';
+import { startMailDispatcherJob } from './jobs/mailDispatcher.js';
+import { closeProductStreams } from './services/productStream.service.js';
+import { startEventBus } from './services/eventBus.service.js';
 
 const PORT = process.env.PORT || 8080;
 const server = app.listen(PORT, () => console.log(`API running on port ${PORT}`));
 
-// Start periodic auction finalizer (enabled by default; set ENABLE_AUCTION_FINALIZER=false to disable)
+// Share auction events with other API nodes (set ENABLE_EVENT_BUS=false to disable)
+const stopEventBus = startEventBus();
+// Start auction end scheduler (enabled by default; set ENABLE_AUCTION_FINALIZER=false to disable)
 const stopFinalizer = startAuctionFinalizer();
 const stopSellerExpiry = startSellerExpiryJob();
+const stopSuggestIndex = startSuggestIndexJob();
+const stopRefreshCompaction = startRefreshTokenCompactionJob();
+const stopMailDispatcher = startMailDispatcherJob();
 
 const shutdown = () => {
+  stopEventBus?.();
   stopFinalizer?.();
   stopSellerExpiry?.();
+  stopSuggestIndex?.();
+  stopRefreshCompaction?.();
+  stopMailDispatcher?.();
+  closeProductStreams();
   server.close(() => process.exit(0));
 };
 
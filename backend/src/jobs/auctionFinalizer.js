@@ -1,47 +1,230 @@
 import { finalizeEndedAuctions } from '../services/product.service.js';
+import { findUpcomingAuctionEnds } from '../repositories/product.repository.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+
+const MAX_TIMER_MS = 2 ** 31 - 1;
+const RETRY_DELAY_MS = 1000;
+const MAX_RETRIES = 5;
 
 const toMs = (value, fallback) => {
   const parsed = Number(value);
   return Number.isFinite(parsed) && parsed > 0 ? parsed : fallback;
 };
 
+// Min-heap of { id, endAt } ordered by endAt. Entries are never removed in
+// place: `latest` holds the current end time per product and stale entries
+// are skipped when they reach the top.
+const createEndHeap = () => {
+  const items = [];
+  const latest = new Map();
+
+  const swap = (a, b) => {
+    [items[a], items[b]] = [items[b], items[a]];
+  };
+
+  const siftUp = (index) => {
+    let child = index;
+    while (child > 0) {
+      const parent = (child - 1) >> 1;
+      if (items[parent].endAt <= items[child].endAt) return;
+      swap(parent, child);
+      child = parent;
+    }
+  };
+
+  const siftDown = (index) => {
+    let parent = index;
+    for (;;) {
+      const left = parent * 2 + 1;
+      const right = left + 1;
+      let smallest = parent;
+      if (left < items.length && items[left].endAt < items[smallest].endAt) smallest = left;
+      if (right < items.length && items[right].endAt < items[smallest].endAt) smallest = right;
+      if (smallest === parent) return;
+      swap(parent, smallest);
+      parent = smallest;
+    }
+  };
+
+  const isStale = (entry) => latest.get(entry.id) !== entry.endAt;
+
+  const pop = () => {
+    const top = items[0];
+    const last = items.pop();
+    if (items.length) {
+      items[0] = last;
+      siftDown(0);
+    }
+    return top;
+  };
+
+  const dropStale = () => {
+    while (items.length && isStale(items[0])) pop();
+  };
+
+  return {
+    set(id, endAt) {
+      const key = String(id);
+      if (latest.get(key) === endAt) return;
+      latest.set(key, endAt);
+      items.push({ id: key, endAt });
+      siftUp(items.length - 1);
+    },
+    peek() {
+      dropStale();
+      return items[0] || null;
+    },
+    popDue(now) {
+      const due = [];
+      dropStale();
+      while (items.length && items[0].endAt <= now) {
+        const entry = pop();
+        latest.delete(entry.id);
+        due.push(entry);
+        dropStale();
+      }
+      return due;
+    },
+    clear() {
+      items.length = 0;
+      latest.clear();
+    }
+  };
+};
+
 /**
- * Starts a simple interval to finalize ended auctions.
- * Returns a cleanup function to clear the interval.
+ * Finalizes auctions at their end time. Upcoming end times inside
+ * SCHEDULER_HORIZON_MS are kept in a min-heap with a single timer armed for
+ * the earliest one; auto-extensions and new auctions update it through
+ * auction events. Every FINALIZE_INTERVAL_MS the heap is reloaded from the
+ * DB and a finalize pass runs, catching anything the timer missed.
+ * Returns a cleanup function.
  */
 export const startAuctionFinalizer = ({
   intervalMs = process.env.FINALIZE_INTERVAL_MS,
+  horizonMs = process.env.SCHEDULER_HORIZON_MS,
+  maxTracked = process.env.SCHEDULER_MAX_TRACKED,
   enabled = process.env.ENABLE_AUCTION_FINALIZER !== 'false'
 } = {}) => {
   if (!enabled) return () => {};
 
-  const frequency = toMs(intervalMs, 300000); // default 5 minutes
-  if (frequency < 60000) {
-    console.warn('[finalizer] interval too low, using minimum 60s');
+  const frequency = toMs(intervalMs, 60000); // reconcile every minute by default
+  if (frequency < 10000) {
+    console.warn('[finalizer] interval too low, using minimum 10s');
   }
-  const effectiveInterval = Math.max(frequency, 60000);
+  const reconcileInterval = Math.max(frequency, 10000);
+  const horizon = Math.max(toMs(horizonMs, 15 * 60 * 1000), reconcileInterval * 2);
+  const trackLimit = toMs(maxTracked, 10000);
 
+  const heap = createEndHeap();
+  const retries = new Map();
+  let changedDuringReload = null;
+  let timer = null;
   let running = false;
-  const runOnce = async () => {
-    if (running) return;
+  let rerun = false;
+  let stopped = false;
+
+  const runFinalize = async (reason) => {
+    if (running) {
+      rerun = true;
+      return;
+    }
     running = true;
     try {
-      const result = await finalizeEndedAuctions();
-      if (result?.processed) {
-        console.log(
-          `[finalizer] processed=${result.processed} withoutWinner=${result.withoutWinner}`
-        );
-      }
+      const closed = new Set();
+      do {
+        rerun = false;
+        const result = await finalizeEndedAuctions();
+        result?.productIds?.forEach((id) => closed.add(String(id)));
+        if (result?.processed) {
+          console.log(
+            `[finalizer] ${reason} processed=${result.processed} withoutWinner=${result.withoutWinner}`
+          );
+        }
+      } while (rerun && !stopped);
+      return closed;
     } catch (err) {
       console.error('[finalizer] failed to finalize auctions', err.message);
+      return null;
     } finally {
       running = false;
     }
   };
 
-  const timer = setInterval(runOnce, effectiveInterval);
-  runOnce();
-  return () => clearInterval(timer);
+  const arm = () => {
+    if (stopped) return;
+    clearTimeout(timer);
+    const next = heap.peek();
+    if (!next) return;
+    const delay = Math.min(Math.max(next.endAt - Date.now(), 0), MAX_TIMER_MS);
+    timer = setTimeout(onTimer, delay);
+  };
+
+  const onTimer = async () => {
+    const due = heap.popDue(Date.now());
+    arm();
+    if (!due.length) return;
+
+    const closed = await runFinalize('scheduled');
+    // rows skipped because a bid held the lock (or the DB clock lags ours)
+    // get a few quick retries before falling back to reconciliation
+    due.forEach(({ id }) => {
+      if (closed?.has(id)) {
+        retries.delete(id);
+        return;
+      }
+      const attempt = (retries.get(id) || 0) + 1;
+      if (attempt > MAX_RETRIES) {
+        retries.delete(id);
+        return;
+      }
+      retries.set(id, attempt);
+      heap.set(id, Date.now() + RETRY_DELAY_MS);
+    });
+    arm();
+  };
+
+  const track = (productId, endAt) => {
+    const endMs = new Date(endAt).getTime();
+    if (!Number.isFinite(endMs) || endMs - Date.now() > horizon) return;
+    changedDuringReload?.push([productId, endMs]);
+    retries.delete(String(productId));
+    heap.set(productId, endMs);
+    arm();
+  };
+
+  const reconcile = async () => {
+    changedDuringReload = [];
+    try {
+      const rows = await findUpcomingAuctionEnds(new Date(Date.now() + horizon), trackLimit);
+      heap.clear();
+      retries.clear();
+      rows.forEach((row) => heap.set(row.id, new Date(row.end_at).getTime()));
+      // extensions committed while the query ran may not be in `rows`
+      changedDuringReload.forEach(([productId, endMs]) => heap.set(productId, endMs));
+      arm();
+    } catch (err) {
+      console.error('[finalizer] failed to load upcoming auctions', err.message);
+    } finally {
+      changedDuringReload = null;
+    }
+    await runFinalize('reconcile');
+  };
+
+  const onEndChanged = ({ productId, endAt }) => track(productId, endAt);
+  auctionEvents.on(AuctionEvents.END_CHANGED, onEndChanged);
+  auctionEvents.on(AuctionEvents.RESYNC, reconcile);
+
+  const reconcileTimer = setInterval(reconcile, reconcileInterval);
+  reconcile();
+
+  return () => {
+    stopped = true;
+    clearTimeout(timer);
+    clearInterval(reconcileTimer);
+    auctionEvents.off(AuctionEvents.END_CHANGED, onEndChanged);
+    auctionEvents.off(AuctionEvents.RESYNC, reconcile);
+  };
 };
 
 export default startAuctionFinalizer;
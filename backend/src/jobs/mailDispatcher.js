@@ -0,0 +1,81 @@
+import { deleteFinishedMails, releaseStaleMails } from '../repositories/mailOutbox.repository.js';
+import { dispatchDueMails } from '../services/mailOutbox.service.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+
+const DEFAULT_INTERVAL_MS = 2000;
+const BATCH_SIZE = Number(process.env.MAIL_DISPATCH_BATCH || 50);
+const CONCURRENCY = Number(process.env.MAIL_DISPATCH_CONCURRENCY || 4);
+// Claimed mails not marked sent/failed after this are handed out again.
+const SENDING_TIMEOUT_MS = 5 * 60 * 1000;
+const MAINTENANCE_INTERVAL_MS = 10 * 60 * 1000;
+const RETENTION_DAYS = Number(process.env.MAIL_OUTBOX_RETENTION_DAYS || 7);
+
+export const startMailDispatcherJob = ({
+  intervalMs = Number(process.env.MAIL_DISPATCH_INTERVAL_MS || DEFAULT_INTERVAL_MS),
+  enabled = process.env.ENABLE_MAIL_DISPATCHER !== 'false'
+} = {}) => {
+  if (!enabled) return () => {};
+
+  const safeInterval = Number.isFinite(intervalMs) && intervalMs >= 500 ? intervalMs : DEFAULT_INTERVAL_MS;
+  let running = false;
+  let rerun = false;
+  let lastMaintenance = 0;
+
+  const maintain = async () => {
+    lastMaintenance = Date.now();
+    // each step runs even if the other one fails
+    const released = await releaseStaleMails(SENDING_TIMEOUT_MS).catch((err) => {
+      console.error('[mail-dispatcher] releasing stale mails failed', err.message);
+      return 0;
+    });
+    const deleted = await deleteFinishedMails(RETENTION_DAYS, 5000).catch((err) => {
+      console.error('[mail-dispatcher] retention cleanup failed', err.message);
+      return 0;
+    });
+    if (released || deleted) {
+      console.info(`[mail-dispatcher] released=${released} deleted=${deleted}`);
+    }
+  };
+
+  const run = async () => {
+    if (running) {
+      rerun = true;
+      return;
+    }
+    running = true;
+    try {
+      do {
+        rerun = false;
+        if (Date.now() - lastMaintenance > MAINTENANCE_INTERVAL_MS) {
+          await maintain();
+        }
+        // drain full batches before waiting for the next tick
+        let result;
+        do {
+          result = await dispatchDueMails({ batchSize: BATCH_SIZE, concurrency: CONCURRENCY });
+          if (result.retried || result.failed) {
+            console.warn(
+              `[mail-dispatcher] sent=${result.sent} retried=${result.retried} failed=${result.failed}`
+            );
+          }
+        } while (result.claimed === BATCH_SIZE);
+      } while (rerun);
+    } catch (err) {
+      console.error('[mail-dispatcher] failed', err.message);
+    } finally {
+      running = false;
+    }
+  };
+
+  // mails queued on this node go out right after their commit
+  auctionEvents.on(AuctionEvents.MAIL_QUEUED, run);
+  const timer = setInterval(run, safeInterval);
+  run();
+
+  return () => {
+    clearInterval(timer);
+    auctionEvents.off(AuctionEvents.MAIL_QUEUED, run);
+  };
+};
+
+export default startMailDispatcherJob;
@@ -0,0 +1,50 @@
+import { deleteStaleRefreshTokens } from '../repositories/refreshToken.repository.js';
+
+const DEFAULT_INTERVAL_MS = 15 * 60 * 1000;
+const BATCH_SIZE = Number(process.env.REFRESH_TOKEN_COMPACTION_BATCH || 1000);
+// Caps one run so a large backlog is worked off over several intervals.
+const MAX_BATCHES = Number(process.env.REFRESH_TOKEN_COMPACTION_MAX_BATCHES || 50);
+// Revoked/expired rows are kept this long for auditing before deletion.
+const RETENTION_HOURS = Number(process.env.REFRESH_TOKEN_RETENTION_HOURS || 24);
+
+export const compactRefreshTokens = async () => {
+  const before = new Date(Date.now() - RETENTION_HOURS * 60 * 60 * 1000);
+  let deleted = 0;
+  for (let batch = 0; batch < MAX_BATCHES; batch += 1) {
+    const count = await deleteStaleRefreshTokens({ before, limit: BATCH_SIZE });
+    deleted += count;
+    if (count < BATCH_SIZE) break;
+  }
+  return { deleted };
+};
+
+export const startRefreshTokenCompactionJob = ({
+  intervalMs = Number(process.env.REFRESH_TOKEN_COMPACTION_INTERVAL_MS || DEFAULT_INTERVAL_MS),
+  enabled = process.env.ENABLE_REFRESH_TOKEN_COMPACTION !== 'false'
+} = {}) => {
+  if (!enabled) return () => {};
+
+  const safeInterval = Number.isFinite(intervalMs) && intervalMs >= 60_000
+    ? intervalMs
+    : DEFAULT_INTERVAL_MS;
+
+  let running = false;
+  const timer = setInterval(async () => {
+    if (running) return;
+    running = true;
+    try {
+      const result = await compactRefreshTokens();
+      if (result.deleted) {
+        console.info(`[refresh-compaction] deleted=${result.deleted}`);
+      }
+    } catch (err) {
+      console.error('[refresh-compaction] failed', err.message);
+    } finally {
+      running = false;
+    }
+  }, safeInterval);
+
+  return () => clearInterval(timer);
+};
+
+export default startRefreshTokenCompactionJob;
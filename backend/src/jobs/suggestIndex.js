@@ -0,0 +1,35 @@
+import { rebuildSuggestIndex } from '../services/suggest.service.js';
+
+const DEFAULT_INTERVAL_MS = 10 * 60 * 1000;
+
+// Builds the search suggestion trie at startup and rebuilds it periodically,
+// which drops ended products, picks up category edits and refreshes ranking.
+export const startSuggestIndexJob = ({
+  intervalMs = Number(process.env.SUGGEST_REBUILD_INTERVAL_MS || DEFAULT_INTERVAL_MS),
+  enabled = process.env.ENABLE_SUGGEST_INDEX !== 'false'
+} = {}) => {
+  if (!enabled) return () => {};
+
+  const safeInterval = Number.isFinite(intervalMs) && intervalMs >= 60_000
+    ? intervalMs
+    : DEFAULT_INTERVAL_MS;
+
+  const rebuild = async () => {
+    try {
+      const started = Date.now();
+      const index = await rebuildSuggestIndex();
+      console.info(
+        `[suggest] indexed products=${index.productEntries.size} categories=${index.categoryEntries.size} in ${Date.now() - started}ms`
+      );
+    } catch (err) {
+      console.error('[suggest] failed to build index', err.message);
+    }
+  };
+
+  rebuild();
+  const timer = setInterval(rebuild, safeInterval);
+
+  return () => clearInterval(timer);
+};
+
+export default startSuggestIndexJob;
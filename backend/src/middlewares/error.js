@@ -16,6 +16,7 @@ export const errorHandler = (err, _req, res, _next) => {
   };
 
   if (err.details) body.error.details = err.details;
+  if (err.retryAfter) res.set('Retry-After', String(err.retryAfter));
 
   if (process.env.NODE_ENV !== 'production' && !(err instanceof ApiError)) {
     body.error.stack = err.stack;
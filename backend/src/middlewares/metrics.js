@@ -0,0 +1,26 @@
+import { createHistogram } from '../utils/metrics.js';
+
+const requestDuration = createHistogram({
+  name: 'http_request_duration_seconds',
+  help: 'API request latency by route template',
+  labelNames: ['method', 'route', 'status']
+});
+
+// Routers are mounted one level below /api (routes/index.js), so the mount
+// segment plus the matched route template names the endpoint without ids.
+const routeLabel = (req) => {
+  if (!req.route) return 'unmatched';
+  const mount = req.originalUrl.split('?')[0].split('/')[2];
+  const path = req.route.path === '/' ? '' : req.route.path;
+  return `/api/${mount}${path}`;
+};
+
+export const recordRequestMetrics = (req, res, next) => {
+  const stopTimer = requestDuration.startTimer({ method: req.method });
+  res.on('finish', () => {
+    // live streams stay open for minutes and would swamp the buckets
+    if (String(res.getHeader('Content-Type') || '').startsWith('text/event-stream')) return;
+    stopTimer({ route: routeLabel(req), status: res.statusCode });
+  });
+  next();
+};
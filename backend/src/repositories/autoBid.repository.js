@@ -25,8 +25,18 @@ export const findAutoBidsWithUsers = (productId) =>
     .orderBy('ab.max_bid_amount', 'desc')
     .orderBy('ab.created_at', 'asc');
 
-export const upsertAutoBid = ({ productId, userId, maxBidAmount }, trx = db) =>
-  trx('auto_bids')
+// Every auto_bids write goes through one of the functions below, which bump
+// products.auto_bid_version in the same transaction and return the new value.
+const bumpAutoBidVersion = async (productId, trx) => {
+  const [row] = await trx('products')
+    .where({ id: productId })
+    .increment('auto_bid_version', 1)
+    .returning(['auto_bid_version']);
+  return row ? Number(row.auto_bid_version) : null;
+};
+
+export const upsertAutoBid = async ({ productId, userId, maxBidAmount }, trx = db) => {
+  const [autoBid] = await trx('auto_bids')
     .insert({
       product_id: productId,
       user_id: userId,
@@ -38,9 +48,26 @@ export const upsertAutoBid = ({ productId, userId, maxBidAmount }, trx = db) =>
       updated_at: trx.fn.now()
     })
     .returning(['id', 'product_id', 'user_id', 'max_bid_amount', 'created_at', 'updated_at']);
+  const version = await bumpAutoBidVersion(productId, trx);
+  return { autoBid, version };
+};
+
+export const deleteAutoBidsByProductId = async (productId, trx = db) => {
+  await trx('auto_bids').where({ product_id: productId }).del();
+  return bumpAutoBidVersion(productId, trx);
+};
 
-export const deleteAutoBidsByProductId = (productId, trx = db) =>
-  trx('auto_bids').where({ product_id: productId }).del();
+export const deleteAutoBidByUser = async (productId, userId, trx = db) => {
+  await trx('auto_bids').where({ product_id: productId, user_id: userId }).del();
+  return bumpAutoBidVersion(productId, trx);
+};
 
-export const deleteAutoBidByUser = (productId, userId, trx = db) =>
-  trx('auto_bids').where({ product_id: productId, user_id: userId }).del();
+// Returns the ids of the products that lost an auto-bid.
+export const deleteAutoBidsByUser = async (userId, trx = db) => {
+  const rows = await trx('auto_bids').where({ user_id: userId }).del(['product_id']);
+  const productIds = [...new Set(rows.map((row) => row.product_id))];
+  if (productIds.length) {
+    await trx('products').whereIn('id', productIds).increment('auto_bid_version', 1);
+  }
+  return productIds;
+};
@@ -0,0 +1,15 @@
+import db from '../db/knex.js';
+
+export const countRows = async (query) => {
+  const row = await query.clone().clearSelect().clearOrder().count({ count: '*' }).first();
+  return Number(row?.count || 0);
+};
+
+// Planner row estimate for the filtered set. Cheap (no rows are read) but
+// only as good as the table statistics; fine for "about N results".
+export const estimateRows = async (query) => {
+  const { sql, bindings } = query.clone().clearSelect().clearOrder().select(db.raw('1')).toSQL();
+  const result = await db.raw(`EXPLAIN (FORMAT JSON) ${sql}`, bindings);
+  const plan = result.rows?.[0]?.['QUERY PLAN']?.[0]?.Plan;
+  return Math.max(Math.round(Number(plan?.['Plan Rows']) || 0), 0);
+};
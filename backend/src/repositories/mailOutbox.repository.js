@@ -0,0 +1,182 @@
+import db from '../db/knex.js';
+
+/**
+ * Queues mails in the caller's transaction. Rows sharing a coalesce_key
+ * with a still-pending mail update that mail's payload instead, and a new
+ * keyed mail is not due before `windowSeconds` after the last one was sent
+ * (nor before its own `delay_seconds`). Digest mails merge their `items`,
+ * adding up the per-item counts.
+ */
+export const insertOutboxMails = async (mails, windowSeconds, trx = db) => {
+  if (!mails.length) return 0;
+  const result = await (trx || db).raw(
+    `
+    INSERT INTO mail_outbox (kind, user_id, email, payload, coalesce_key, available_at)
+    SELECT
+      m.kind,
+      m.user_id,
+      m.email,
+      coalesce(m.payload, '{}'::jsonb),
+      m.coalesce_key,
+      GREATEST(
+        now() + make_interval(secs => coalesce(m.delay_seconds, 0)),
+        coalesce(
+          (
+            SELECT max(o.locked_at) FROM mail_outbox o
+            WHERE o.coalesce_key = m.coalesce_key AND o.status IN ('SENDING', 'SENT')
+          ),
+          '-infinity'
+        ) + make_interval(secs => ?)
+      )
+    FROM jsonb_to_recordset(?::jsonb)
+      AS m(kind text, user_id bigint, email text, payload jsonb, coalesce_key text, delay_seconds integer)
+    ON CONFLICT (coalesce_key) WHERE status = 'PENDING' AND coalesce_key IS NOT NULL
+    DO UPDATE SET
+      payload = CASE
+        WHEN mail_outbox.kind = 'digest' THEN jsonb_build_object(
+          'items',
+          coalesce(mail_outbox.payload -> 'items', '{}'::jsonb) || (
+            SELECT coalesce(jsonb_object_agg(
+              item.key,
+              item.value || jsonb_build_object(
+                'count',
+                coalesce((mail_outbox.payload -> 'items' -> item.key ->> 'count')::int, 0)
+                  + coalesce((item.value ->> 'count')::int, 1)
+              )
+            ), '{}'::jsonb)
+            FROM jsonb_each(EXCLUDED.payload -> 'items') AS item
+          )
+        )
+        ELSE EXCLUDED.payload
+      END,
+      coalesced_count = mail_outbox.coalesced_count + 1
+  `,
+    [windowSeconds, JSON.stringify(mails)]
+  );
+  return result.rowCount;
+};
+
+// Marks up to `limit` due mails as SENDING; SKIP LOCKED lets several
+// dispatchers (one per node) share the queue.
+export const claimDueMails = async (limit) => {
+  const result = await db.raw(
+    `
+    UPDATE mail_outbox
+    SET status = 'SENDING', locked_at = now(), attempts = attempts + 1
+    WHERE id IN (
+      SELECT id FROM mail_outbox
+      WHERE status = 'PENDING' AND available_at <= now()
+      ORDER BY available_at
+      LIMIT ?
+      FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, user_id, email, payload, attempts, coalesced_count
+  `,
+    [limit]
+  );
+  return result.rows;
+};
+
+export const markMailsSent = (ids) =>
+  db('mail_outbox').whereIn('id', ids).update({ status: 'SENT', sent_at: db.fn.now(), last_error: null });
+
+/**
+ * Puts a claimed mail back in the queue, due after `delayMs`. If a newer
+ * mail with the same coalesce_key was queued meanwhile, the unique index
+ * allows only one of them to be PENDING: the claimed mail is folded into
+ * that one (digest items are added up, otherwise the newer payload wins)
+ * and closed as FAILED with a pointer to it. Resolves to the new status.
+ */
+export const rescheduleMail = async (id, error, delayMs) => {
+  const result = await db.raw(
+    `
+    WITH claimed AS (
+      SELECT id, payload, coalesce_key, coalesced_count FROM mail_outbox
+      WHERE id = ? AND status = 'SENDING'
+      FOR UPDATE
+    ),
+    merged AS (
+      UPDATE mail_outbox pending
+      SET
+        payload = CASE
+          WHEN pending.kind = 'digest' THEN jsonb_build_object(
+            'items',
+            coalesce(claimed.payload -> 'items', '{}'::jsonb) || (
+              SELECT coalesce(jsonb_object_agg(
+                item.key,
+                item.value || jsonb_build_object(
+                  'count',
+                  coalesce((claimed.payload -> 'items' -> item.key ->> 'count')::int, 0)
+                    + coalesce((item.value ->> 'count')::int, 1)
+                )
+              ), '{}'::jsonb)
+              FROM jsonb_each(pending.payload -> 'items') AS item
+            )
+          )
+          ELSE pending.payload
+        END,
+        coalesced_count = pending.coalesced_count + claimed.coalesced_count + 1
+      FROM claimed
+      WHERE pending.coalesce_key = claimed.coalesce_key AND pending.status = 'PENDING'
+      RETURNING pending.id
+    )
+    UPDATE mail_outbox o
+    SET
+      status = CASE WHEN EXISTS (SELECT 1 FROM merged) THEN 'FAILED' ELSE 'PENDING' END,
+      last_error = coalesce('superseded by mail ' || (SELECT id FROM merged), ?, o.last_error),
+      available_at = now() + make_interval(secs => ?)
+    FROM claimed
+    WHERE o.id = claimed.id
+    RETURNING o.status
+  `,
+    [id, error ?? null, delayMs / 1000]
+  );
+  return result.rows[0]?.status || null;
+};
+
+export const markMailFailed = (id, error) =>
+  db('mail_outbox').where({ id }).update({ status: 'FAILED', last_error: error });
+
+// Queue depth and how long the oldest due mail has been waiting.
+export const countQueuedMails = async () => {
+  const result = await db.raw(`
+    SELECT
+      count(*)::int AS pending,
+      coalesce(extract(epoch FROM now() - min(available_at) FILTER (WHERE available_at <= now())), 0)::float8
+        AS oldest_due_seconds
+    FROM mail_outbox
+    WHERE status = 'PENDING'
+  `);
+  const [row] = result.rows;
+  return { pending: row.pending, oldestDueSeconds: row.oldest_due_seconds };
+};
+
+// Mails claimed by a dispatcher that died mid-send go back to the queue,
+// one at a time so two stale mails with the same key end up merged.
+export const releaseStaleMails = async (olderThanMs) => {
+  const stale = await db('mail_outbox')
+    .where({ status: 'SENDING' })
+    .andWhere('locked_at', '<', db.raw("now() - make_interval(secs => ?)", [olderThanMs / 1000]))
+    .orderBy('locked_at')
+    .pluck('id');
+  let released = 0;
+  for (const id of stale) {
+    if (await rescheduleMail(id, null, 0)) released += 1;
+  }
+  return released;
+};
+
+export const deleteFinishedMails = async (retentionDays, limit) => {
+  const result = await db.raw(
+    `
+    DELETE FROM mail_outbox
+    WHERE id IN (
+      SELECT id FROM mail_outbox
+      WHERE status IN ('SENT', 'FAILED') AND created_at < now() - make_interval(days => ?)
+      LIMIT ?
+    )
+  `,
+    [retentionDays, limit]
+  );
+  return result.rowCount;
+};
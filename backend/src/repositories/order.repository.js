@@ -1,4 +1,5 @@
 import db from '../db/knex.js';
+import { applyRatingCounterDelta } from './rating.repository.js';
 
 export const createOrder = (payload, trx = db) =>
   (trx || db)('orders')
@@ -20,6 +21,22 @@ export const createOrder = (payload, trx = db) =>
       'updated_at'
     ]);
 
+export const createOrdersForEndedProducts = async (productIds = [], trx = db) => {
+  if (!productIds.length) return [];
+  const result = await (trx || db).raw(
+    `
+    INSERT INTO orders (product_id, seller_id, winner_id, final_price, status)
+    SELECT id, seller_id, current_bidder_id, current_price, 'WAITING_BUYER_DETAILS'
+    FROM products
+    WHERE id = ANY(?) AND status = 'ENDED' AND current_bidder_id IS NOT NULL
+    ON CONFLICT (product_id) DO NOTHING
+    RETURNING id, product_id, seller_id, winner_id, final_price
+    `,
+    [productIds]
+  );
+  return result.rows;
+};
+
 export const findOrderById = (id) =>
   db('orders')
     .select('*')
@@ -95,8 +112,24 @@ export const listOrderMessages = (orderId) =>
     .where('om.order_id', orderId)
     .orderBy('om.created_at', 'asc');
 
+const scoreDelta = (score, sign) => ({
+  positive: Number(score) === 1 ? sign : 0,
+  negative: Number(score) === -1 ? sign : 0
+});
+
+// users.positive_score / negative_score are maintained here, in the same
+// transaction as the rating row, so readers never need to aggregate ratings.
 export const upsertRating = async ({ orderId, raterId, ratedUserId, score, comment }, trx = db) => {
-  const existing = await trx('ratings').where({ order_id: orderId, rater_id: raterId }).first();
+  if (!trx?.isTransaction) {
+    return db.transaction((innerTrx) =>
+      upsertRating({ orderId, raterId, ratedUserId, score, comment }, innerTrx)
+    );
+  }
+
+  const existing = await trx('ratings')
+    .where({ order_id: orderId, rater_id: raterId })
+    .forUpdate()
+    .first();
   if (existing) {
     const [updated] = await trx('ratings')
       .where({ id: existing.id })
@@ -108,6 +141,18 @@ export const upsertRating = async ({ orderId, raterId, ratedUserId, score, comme
         },
         ['id', 'score', 'comment', 'created_at']
       );
+    if (Number(existing.score) !== Number(score)) {
+      const removed = scoreDelta(existing.score, -1);
+      const added = scoreDelta(score, 1);
+      await applyRatingCounterDelta(
+        existing.rated_user_id,
+        {
+          positive: removed.positive + added.positive,
+          negative: removed.negative + added.negative
+        },
+        trx
+      );
+    }
     return updated;
   }
   const [created] = await trx('ratings').insert(
@@ -120,6 +165,7 @@ export const upsertRating = async ({ orderId, raterId, ratedUserId, score, comme
     },
     ['id', 'score', 'comment', 'created_at']
   );
+  await applyRatingCounterDelta(ratedUserId, scoreDelta(score, 1), trx);
   return created;
 };
 
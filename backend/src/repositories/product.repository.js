@@ -1,4 +1,5 @@
 import db from '../db/knex.js';
+import { applyKeyset } from '../utils/cursor.js';
 
 const BASE_COLUMNS = [
   'id',
@@ -24,7 +25,15 @@ const BASE_COLUMNS = [
   'updated_at'
 ];
 
-const withAlias = (alias) => BASE_COLUMNS.map((column) => `${alias}.${column}`);
+export const withAlias = (alias) => BASE_COLUMNS.map((column) => `${alias}.${column}`);
+
+// Columns nested in json_agg/json_build_object become JSON, where BIGINT ids
+// would turn into numbers; cast them so they stay strings like top-level rows.
+const BIGINT_ID_COLUMNS = new Set(['id', 'category_id', 'seller_id', 'current_bidder_id']);
+const withAliasForJson = (alias) =>
+  BASE_COLUMNS.map((column) =>
+    BIGINT_ID_COLUMNS.has(column) ? `${alias}.${column}::text AS ${column}` : `${alias}.${column}`
+  );
 
 const buildBaseQuery = (filters = {}) => {
   const query = db('products as p')
@@ -43,30 +52,38 @@ const buildBaseQuery = (filters = {}) => {
   return query;
 };
 
-export const countActiveProducts = async (filters = {}) => {
-  const [{ count }] = await db('products')
-    .where({ status: 'ACTIVE' })
-    .modify((qb) => {
-      if (filters.categoryId) {
-        const subCategories = db('categories')
-          .select('id')
-          .where('id', filters.categoryId)
-          .orWhere('parent_id', filters.categoryId);
-        qb.whereIn('category_id', subCategories);
-      }
-    })
-    .count({ count: '*' });
-
-  return Number(count) || 0;
+// Filtered set behind the product listing, without columns or ordering;
+// callers count or estimate it.
+export const activeProductsQuery = (filters = {}) => {
+  const query = db('products').where({ status: 'ACTIVE' });
+  if (filters.categoryId) {
+    const subCategories = db('categories')
+      .select('id')
+      .where('id', filters.categoryId)
+      .orWhere('parent_id', filters.categoryId);
+    query.whereIn('category_id', subCategories);
+  }
+  return query;
 };
 
+// Ordered by (sortField, id). With `after` (a decoded cursor) the page starts
+// right after that row and `offset` is ignored.
 export const findActiveProducts = (filters = {}, options = {}) => {
-  const { limit = 20, offset = 0, sortField = 'end_at', sortDirection = 'asc' } = options;
+  const { limit = 20, offset = 0, sortField = 'end_at', sortDirection = 'asc', after = null } = options;
 
-  return buildBaseQuery(filters)
-    .orderBy(sortField, sortDirection)
-    .limit(limit)
-    .offset(offset);
+  const query = applyKeyset(buildBaseQuery(filters), {
+    column: `p.${sortField}`,
+    idColumn: 'p.id',
+    direction: sortDirection,
+    after
+  }).limit(limit);
+
+  return after ? query : query.offset(offset);
+};
+
+export const findProductsByIds = (ids = []) => {
+  if (!ids.length) return [];
+  return db('products').select(BASE_COLUMNS).whereIn('id', ids);
 };
 
 export const findProductStatusById = (id) =>
@@ -88,6 +105,39 @@ export const insertProductImages = (images, trx = db) => {
 export const findProductByIdForUpdate = (id, trx = db) =>
   trx('products').where({ id }).forUpdate().first();
 
+// Claims up to `limit` expired auctions and closes them in one statement.
+// SKIP LOCKED leaves rows held by in-flight bids (or another node) for a later run.
+export const claimExpiredAuctions = (limit, trx = db) =>
+  trx('products')
+    .whereIn(
+      'id',
+      trx('products')
+        .select('id')
+        .where('status', 'ACTIVE')
+        .andWhere('end_at', '<=', trx.fn.now())
+        .orderBy('end_at', 'asc')
+        .limit(limit)
+        .forUpdate()
+        .skipLocked()
+    )
+    .update(
+      {
+        status: 'ENDED',
+        enable_auto_bid: false,
+        end_at: trx.fn.now(),
+        updated_at: trx.fn.now()
+      },
+      ['id', 'seller_id', 'current_bidder_id', 'current_price', 'name']
+    );
+
+export const findUpcomingAuctionEnds = (until, limit = 10000) =>
+  db('products')
+    .select('id', 'end_at')
+    .where('status', 'ACTIVE')
+    .andWhere('end_at', '<=', until)
+    .orderBy('end_at', 'asc')
+    .limit(limit);
+
 export const findProductByIdWithSeller = (id) =>
   db('products as p')
     .select([
@@ -98,6 +148,8 @@ export const findProductByIdWithSeller = (id) =>
       'seller.negative_score as seller_negative_score',
       'p.current_bidder_id',
       'bidder.full_name as current_bidder_full_name',
+      'bidder.positive_score as current_bidder_positive_score',
+      'bidder.negative_score as current_bidder_negative_score',
       'bidder.email as current_bidder_email'
     ])
     .leftJoin('users as seller', 'seller.id', 'p.seller_id')
@@ -105,56 +157,132 @@ export const findProductByIdWithSeller = (id) =>
     .where('p.id', id)
     .first();
 
-export const findProductImages = (productId) =>
-  db('product_images')
-    .select('id', 'product_id', 'image_url', 'display_order')
-    .where({ product_id: productId })
-    .orderBy('display_order', 'asc');
-
-export const findRecentQuestions = (productId, limit = 10) =>
-  db('questions as q')
-    .leftJoin('users as asker', 'asker.id', 'q.user_id')
-    .select(
-      'q.id',
-      'q.product_id',
-      'q.question_text',
-      'q.created_at',
-      'asker.id as asker_id',
-      'asker.full_name as asker_name',
-      'asker.email as asker_email'
-    )
-    .where('q.product_id', productId)
-    .orderBy('q.created_at', 'desc')
-    .limit(limit);
-
-export const findAnswersByQuestionIds = (questionIds = []) => {
-  if (!Array.isArray(questionIds) || !questionIds.length) {
-    return [];
-  }
+const DETAIL_SQL = `
+  SELECT
+    ${withAlias('p').join(', ')},
+    seller.full_name AS seller_full_name,
+    seller.email AS seller_email,
+    seller.positive_score AS seller_positive_score,
+    seller.negative_score AS seller_negative_score,
+    bidder.full_name AS current_bidder_full_name,
+    bidder.email AS current_bidder_email,
+    bidder.positive_score AS current_bidder_positive_score,
+    bidder.negative_score AS current_bidder_negative_score,
+    (
+      SELECT COALESCE(json_agg(img ORDER BY img.display_order), '[]'::json)
+      FROM (
+        SELECT i.id::text AS id, i.image_url, i.display_order
+        FROM product_images i
+        WHERE i.product_id = p.id
+      ) img
+    ) AS images,
+    (
+      SELECT COALESCE(json_agg(qa ORDER BY qa.created_at DESC), '[]'::json)
+      FROM (
+        SELECT
+          q.id::text AS id,
+          q.question_text,
+          q.created_at,
+          asker.id::text AS asker_id,
+          asker.full_name AS asker_name,
+          asker.email AS asker_email,
+          a.id::text AS answer_id,
+          a.answer_text,
+          a.created_at AS answer_created_at,
+          a.responder_id,
+          a.responder_name,
+          a.responder_email
+        FROM questions q
+        LEFT JOIN users asker ON asker.id = q.user_id
+        LEFT JOIN LATERAL (
+          SELECT
+            ans.id,
+            ans.answer_text,
+            ans.created_at,
+            responder.id::text AS responder_id,
+            responder.full_name AS responder_name,
+            responder.email AS responder_email
+          FROM answers ans
+          LEFT JOIN users responder ON responder.id = ans.user_id
+          WHERE ans.question_id = q.id
+          ORDER BY ans.created_at DESC
+          LIMIT 1
+        ) a ON TRUE
+        WHERE q.product_id = p.id
+        ORDER BY q.created_at DESC
+        LIMIT ?
+      ) qa
+    ) AS questions,
+    (
+      SELECT COALESCE(json_agg(rel ORDER BY rel.end_at), '[]'::json)
+      FROM (
+        SELECT
+          ${withAliasForJson('rp').join(', ')},
+          (
+            SELECT ri.image_url
+            FROM product_images ri
+            WHERE ri.product_id = rp.id
+            ORDER BY ri.display_order
+            LIMIT 1
+          ) AS primary_image_url
+        FROM products rp
+        WHERE rp.status = 'ACTIVE'
+          AND rp.category_id = p.category_id
+          AND rp.id <> p.id
+        ORDER BY rp.end_at ASC
+        LIMIT ?
+      ) rel
+    ) AS related,
+    (
+      SELECT COALESCE(json_agg(h ORDER BY h.created_at), '[]'::json)
+      FROM (
+        SELECT dh.id::text AS id, dh.content_added, dh.created_at
+        FROM product_description_history dh
+        WHERE dh.product_id = p.id
+      ) h
+    ) AS description_history,
+    (SELECT COUNT(*) FROM watchlist w WHERE w.product_id = p.id) AS watchlist_count,
+    (
+      SELECT json_build_object('id', o.id::text, 'status', o.status, 'winner_id', o.winner_id::text)
+      FROM orders o
+      WHERE o.product_id = p.id
+    ) AS order_summary,
+    EXISTS (
+      SELECT 1 FROM watchlist vw WHERE vw.product_id = p.id AND vw.user_id = ?
+    ) AS viewer_watchlisted
+  FROM products p
+  LEFT JOIN users seller ON seller.id = p.seller_id
+  LEFT JOIN users bidder ON bidder.id = p.current_bidder_id
+  WHERE p.id = ?
+`;
 
-  return db('answers as a')
-    .leftJoin('users as responder', 'responder.id', 'a.user_id')
-    .select(
-      'a.id',
-      'a.question_id',
-      'a.answer_text',
-      'a.created_at',
-      'responder.id as responder_id',
-      'responder.full_name as responder_name',
-      'responder.email as responder_email'
-    )
-    .whereIn('a.question_id', questionIds)
-    .orderBy('a.created_at', 'desc');
+// Everything the product page needs in one round trip: the product with its
+// seller/bidder, images, latest questions with their latest answer, related
+// listings with a primary image, description history, watchlist count, the
+// order summary and whether `viewerId` watches the product.
+export const findProductDetailBundle = async (
+  id,
+  { viewerId = null, questionsLimit = 10, relatedLimit = 5 } = {}
+) => {
+  const result = await db.raw(DETAIL_SQL, [questionsLimit, relatedLimit, viewerId, id]);
+  return result.rows[0] || null;
 };
 
-export const findRelatedProducts = (categoryId, excludeProductId, limit = 5) =>
-  db('products as p')
-    .select(withAlias('p'))
-    .where('p.status', 'ACTIVE')
-    .andWhere('p.category_id', categoryId)
-    .andWhereNot('p.id', excludeProductId)
-    .orderBy('p.end_at', 'asc')
-    .limit(limit);
+// Cheap probe used to validate a cached detail bundle.
+export const findProductDetailStamp = async (id, viewerId = null) => {
+  const result = await db.raw(
+    `
+    SELECT p.updated_at,
+           EXISTS (
+             SELECT 1 FROM watchlist w WHERE w.product_id = p.id AND w.user_id = ?
+           ) AS viewer_watchlisted
+    FROM products p
+    WHERE p.id = ?
+    `,
+    [viewerId, id]
+  );
+  return result.rows[0] || null;
+};
 
 export const findPrimaryImagesForProducts = async (productIds = []) => {
   if (!Array.isArray(productIds) || !productIds.length) {
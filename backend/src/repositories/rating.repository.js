@@ -15,3 +15,66 @@ export const findRatingsReceivedByUser = (userId, limit = 20) =>
     .where('r.rated_user_id', userId)
     .orderBy('r.created_at', 'desc')
     .limit(limit);
+
+const expectedCountersQuery = (knex) =>
+  knex('users as u')
+    .leftJoin(
+      knex('ratings')
+        .select('rated_user_id')
+        .select(knex.raw('COUNT(*) FILTER (WHERE score = 1) AS positive'))
+        .select(knex.raw('COUNT(*) FILTER (WHERE score = -1) AS negative'))
+        .groupBy('rated_user_id')
+        .as('r'),
+      'r.rated_user_id',
+      'u.id'
+    )
+    .select(
+      'u.id',
+      'u.positive_score',
+      'u.negative_score',
+      knex.raw('COALESCE(r.positive, 0)::int AS expected_positive'),
+      knex.raw('COALESCE(r.negative, 0)::int AS expected_negative')
+    );
+
+const whereDrifted = (qb) =>
+  qb.whereRaw('u.positive_score IS DISTINCT FROM COALESCE(r.positive, 0)')
+    .orWhereRaw('u.negative_score IS DISTINCT FROM COALESCE(r.negative, 0)');
+
+export const findRatingCounterDrift = (limit = 100, trx = db) =>
+  expectedCountersQuery(trx)
+    .where(whereDrifted)
+    .orderBy('u.id', 'asc')
+    .limit(limit);
+
+export const countRatingCounterDrift = async (trx = db) => {
+  const row = await trx
+    .from(expectedCountersQuery(trx).where(whereDrifted).as('drift'))
+    .count({ count: '*' })
+    .first();
+  return Number(row?.count || 0);
+};
+
+// Rewrites users.positive_score / negative_score from the ratings table.
+// Only rows that drifted are touched. Returns the number of users fixed.
+export const backfillRatingCounters = async (trx = db) => {
+  const result = await trx.raw(
+    `
+    UPDATE users AS u
+    SET positive_score = c.expected_positive,
+        negative_score = c.expected_negative
+    FROM (?) AS c
+    WHERE c.id = u.id
+      AND (u.positive_score IS DISTINCT FROM c.expected_positive
+        OR u.negative_score IS DISTINCT FROM c.expected_negative)
+    `,
+    [expectedCountersQuery(trx)]
+  );
+  return result.rowCount;
+};
+
+export const applyRatingCounterDelta = (userId, { positive = 0, negative = 0 }, trx = db) => {
+  if (!positive && !negative) return Promise.resolve(0);
+  return trx('users')
+    .where({ id: userId })
+    .increment({ positive_score: positive, negative_score: negative });
+};
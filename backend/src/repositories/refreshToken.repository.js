@@ -3,7 +3,17 @@ import db from '../db/knex.js';
 export const insertRefreshToken = (payload, trx = db) =>
   (trx || db)('refresh_tokens')
     .insert(payload)
-    .returning(['id', 'user_id', 'token_hash', 'expires_at', 'revoked_at', 'rotated_from', 'created_at', 'updated_at']);
+    .returning([
+      'id',
+      'user_id',
+      'token_hash',
+      'expires_at',
+      'revoked_at',
+      'rotated_from',
+      'family_id',
+      'created_at',
+      'updated_at'
+    ]);
 
 export const findRefreshTokenByHash = (tokenHash) =>
   db('refresh_tokens')
@@ -15,13 +25,35 @@ export const revokeRefreshToken = (id, trx = db) =>
     .where({ id })
     .update({ revoked_at: (trx || db).fn.now() }, ['id', 'revoked_at']);
 
-export const revokeTokenChain = async (id, trx = db) => {
+// Revokes every live token of the login session `token` belongs to. Rows
+// written before family ids existed fall back to the token itself.
+export const revokeTokenFamily = (token, trx = db) => {
   const knex = trx || db;
-  const token = await knex('refresh_tokens').where({ id }).first();
-  if (!token) return;
-  await knex('refresh_tokens')
-    .where(function () {
-      this.where({ id }).orWhere({ rotated_from: id });
-    })
-    .update({ revoked_at: knex.fn.now() });
+  const query = knex('refresh_tokens').whereNull('revoked_at');
+  if (token.family_id) {
+    query.where({ family_id: token.family_id });
+  } else {
+    query.where({ id: token.id });
+  }
+  return query.update({ revoked_at: knex.fn.now(), updated_at: knex.fn.now() });
+};
+
+/**
+ * Deletes up to `limit` tokens that expired or were revoked before `before`.
+ * Rows are claimed with SKIP LOCKED so a rotation in flight is never waited on.
+ */
+export const deleteStaleRefreshTokens = async ({ before, limit }) => {
+  const result = await db.raw(
+    `
+    DELETE FROM refresh_tokens
+    WHERE id IN (
+      SELECT id FROM refresh_tokens
+      WHERE expires_at < :before OR revoked_at < :before
+      LIMIT :limit
+      FOR UPDATE SKIP LOCKED
+    )
+  `,
+    { before, limit }
+  );
+  return result.rowCount;
 };
@@ -1,16 +1,35 @@
 import db from '../db/knex.js';
+import { applyKeyset } from '../utils/cursor.js';
+import { withAlias } from './product.repository.js';
 
 const DEFAULT_LIMIT = 20;
 const SEARCH_SANITIZE_REGEX = /[^\p{L}\p{N}\s]/gu;
+// unaccent + simple: matches with or without Vietnamese diacritics
+// (see migration 20261018110000_vietnamese_search_config).
+const SEARCH_CONFIG = 'vn_unaccent';
+// ts_rank_cd normalization 32: rank / (rank + 1), so values stay in [0, 1)
+const RANK_NORMALIZATION = 32;
 
+// Sort columns refer to the ranked subquery `s` built in searchProducts.
 const SORT_FIELDS = {
-  'end_at': 'p.end_at',
-  'price': 'p.current_price',
-  'bid_count': 'p.bid_count',
-  'created_at': 'p.created_at'
+  'relevance': 's.rank',
+  'end_at': 's.end_at',
+  'price': 's.current_price',
+  'bid_count': 's.bid_count',
+  'created_at': 's.created_at'
 };
 
-const sanitizeTerm = (value = '') =>
+const DEFAULT_SORT = { column: 's.rank', direction: 'desc', key: 'relevance,desc' };
+
+export const normalizeSearchSort = (sort) => {
+  if (!sort) return DEFAULT_SORT;
+  const [fieldRaw, dirRaw] = sort.split(',');
+  const field = SORT_FIELDS[fieldRaw] ? fieldRaw : 'end_at';
+  const direction = dirRaw?.toLowerCase() === 'desc' ? 'desc' : 'asc';
+  return { column: SORT_FIELDS[field], direction, key: `${field},${direction}` };
+};
+
+export const sanitizeTerm = (value = '') =>
   value
     .toString()
     .replace(SEARCH_SANITIZE_REGEX, ' ')
@@ -78,12 +97,11 @@ export const searchCategories = async ({ term, limit = 10 }) => {
     .limit(safeLimit);
 };
 
-export const searchProducts = async ({
+// Filtered set behind a search, without columns or ordering. Returns null
+// when the term has nothing searchable left after sanitizing.
+export const searchProductsQuery = ({
   term,
-  limit = DEFAULT_LIMIT,
-  offset = 0,
   categoryId = null,
-  sort = null,
   priceMin,
   priceMax,
   priceLogic = 'and',
@@ -101,15 +119,12 @@ export const searchProducts = async ({
 }) => {
   const sanitized = sanitizeTerm(term);
   if (!sanitized) {
-    return { rows: [], total: 0 };
+    return null;
   }
 
-  const safeLimit = Math.min(Math.max(Number(limit) || DEFAULT_LIMIT, 1), 60);
-  const safeOffset = Math.max(Number(offset) || 0, 0);
-
   const baseQuery = db('products as p')
     .where('p.status', 'ACTIVE')
-    .andWhereRaw("p.search_vector @@ websearch_to_tsquery('simple', ?)", [sanitized]);
+    .andWhereRaw('p.search_vector @@ websearch_to_tsquery(?::regconfig, ?)', [SEARCH_CONFIG, sanitized]);
 
   applyCategoryFilter(baseQuery, categoryId);
   const groups = buildGroupFilter({
@@ -145,25 +160,117 @@ export const searchProducts = async ({
     });
   }
 
-  const totalRow = await baseQuery.clone().count({ count: '*' }).first();
-
-  const rowsQuery = baseQuery
-    .clone()
-    .select('p.*');
+  return baseQuery;
+};
 
-  if (sort) {
-    const [fieldRaw, dirRaw] = sort.split(',');
-    const field = SORT_FIELDS[fieldRaw] || 'p.end_at';
-    const direction = dirRaw?.toLowerCase() === 'desc' ? 'desc' : 'asc';
-    rowsQuery.orderBy(field, direction);
-  } else {
-    rowsQuery.orderBy('p.created_at', 'desc');
+export const searchProducts = async ({
+  limit = DEFAULT_LIMIT,
+  offset = 0,
+  sort = null,
+  after = null,
+  ...filters
+}) => {
+  const baseQuery = searchProductsQuery(filters);
+  if (!baseQuery) {
+    return { rows: [], hasMore: false };
   }
 
-  const rows = await rowsQuery.limit(safeLimit).offset(safeOffset);
+  const safeLimit = Math.min(Math.max(Number(limit) || DEFAULT_LIMIT, 1), 60);
+  const safeOffset = Math.max(Number(offset) || 0, 0);
+
+  const order = normalizeSearchSort(sort);
+  // Wrapped so keyset and ordering can use the computed rank like any other
+  // column; the planner flattens the subquery.
+  const ranked = baseQuery.select(
+    withAlias('p'),
+    db.raw('ts_rank_cd(p.search_vector, websearch_to_tsquery(?::regconfig, ?), ?)::float8 as rank', [
+      SEARCH_CONFIG,
+      sanitizeTerm(filters.term),
+      RANK_NORMALIZATION
+    ])
+  );
+  const rowsQuery = applyKeyset(db.from(ranked.as('s')).select('s.*'), {
+    column: order.column,
+    idColumn: 's.id',
+    direction: order.direction,
+    after
+  }).limit(safeLimit + 1);
+
+  // keyset pages ignore the offset; one extra row tells whether more exist
+  const fetched = await (after ? rowsQuery : rowsQuery.offset(safeOffset));
 
   return {
-    rows,
-    total: Number(totalRow?.count || 0)
+    rows: fetched.slice(0, safeLimit),
+    hasMore: fetched.length > safeLimit
   };
 };
+
+// Upper bounds (VND) of the price histogram; the last bucket is open-ended.
+export const PRICE_FACET_BOUNDS = [100000, 500000, 1000000, 5000000, 10000000, 50000000];
+export const ENDING_FACET_WINDOWS = ['1h', '24h', '7d', 'later'];
+
+/**
+ * Facet counts for the matched set in one grouped query: per category (with
+ * its parent, for rolling up), per price bucket and per ending window.
+ * Each row carries exactly one non-null grouping column.
+ */
+export const searchFacets = (filters) => {
+  const baseQuery = searchProductsQuery(filters);
+  if (!baseQuery) return [];
+
+  const matched = baseQuery.select(
+    'p.category_id',
+    db.raw('width_bucket(p.current_price, ?::bigint[]) as price_bucket', [PRICE_FACET_BOUNDS]),
+    db.raw(`CASE
+      WHEN p.end_at <= now() + interval '1 hour' THEN '1h'
+      WHEN p.end_at <= now() + interval '24 hours' THEN '24h'
+      WHEN p.end_at <= now() + interval '7 days' THEN '7d'
+      ELSE 'later'
+    END as ending_window`)
+  );
+
+  return db
+    .with('matched', matched)
+    .from('matched as m')
+    .leftJoin('categories as c', 'c.id', 'm.category_id')
+    .leftJoin('categories as pc', 'pc.id', 'c.parent_id')
+    .select(
+      'c.id as category_id',
+      'c.name as category_name',
+      'pc.id as parent_id',
+      'pc.name as parent_name',
+      'm.price_bucket',
+      'm.ending_window',
+      db.raw('count(*)::int as count')
+    )
+    .groupByRaw('GROUPING SETS ((c.id, c.name, pc.id, pc.name), (m.price_bucket), (m.ending_window))');
+};
+
+// Names fed to the suggestion trie, most-bid first so a capped build keeps
+// the listings people are most likely to look for.
+export const findSuggestionProducts = (limit) =>
+  db('products')
+    .select('id', 'name', 'slug', 'bid_count')
+    .where('status', 'ACTIVE')
+    .orderBy([{ column: 'bid_count', order: 'desc' }, { column: 'id', order: 'desc' }])
+    .limit(limit);
+
+export const findSuggestionProductsByIds = (ids = []) => {
+  if (!ids.length) return [];
+  return db('products').select('id', 'name', 'slug', 'bid_count', 'status').whereIn('id', ids);
+};
+
+export const findSuggestionCategories = () => db('categories').select('id', 'name', 'parent_id');
+
+// Trigram fallback for names the trie does not hold; uses the
+// gin_trgm_ops index on active product names.
+export const findSimilarProductNames = async (term, limit = 8) => {
+  const sanitized = sanitizeTerm(term);
+  if (!sanitized) return [];
+  return db('products')
+    .select('id', 'name', 'slug', 'bid_count', db.raw('similarity(name, ?) as similarity', [sanitized]))
+    .where('status', 'ACTIVE')
+    .andWhereRaw('name % ?', [sanitized])
+    .orderBy('similarity', 'desc')
+    .limit(limit);
+};
@@ -1,8 +1,24 @@
 import db from '../db/knex.js';
+import { emitUserChanged } from '../utils/auctionEvents.js';
 
 export const findUserById = async (id) =>
   db('users').where({ id }).first();
 
+// Columns the auth layer attaches to req.user.
+export const findPrincipalById = async (id) =>
+  db('users').select('id', 'email', 'role', 'status').where({ id }).first();
+
+export const findUsersByIds = async (ids = []) => {
+  if (!ids.length) return [];
+  return db('users').select('id', 'email', 'full_name').whereIn('id', ids);
+};
+
+// Mail preferences of the given users, read inside the caller's transaction.
+export const findNotificationModes = async (ids = [], trx = db) => {
+  if (!ids.length) return [];
+  return trx('users').select('id', 'notification_mode').whereIn('id', ids);
+};
+
 export const findUserByEmail = async (email) =>
   db('users').where({ email }).first();
 
@@ -11,10 +27,13 @@ export const createUser = async (userData, trx = db) =>
     .insert(userData)
     .returning(['id', 'email', 'full_name', 'role', 'status']);
 
-export const updateUser = async (id, updateData, trx = db) =>
-  trx('users')
+export const updateUser = async (id, updateData, trx = db) => {
+  const rows = await trx('users')
     .where({ id })
-    .update(updateData, ['id', 'email', 'full_name', 'role', 'status']);
+    .update(updateData, ['id', 'email', 'full_name', 'role', 'status', 'notification_mode']);
+  emitUserChanged(trx, id);
+  return rows;
+};
 
 export const listUsers = ({ limit = 50, offset = 0 } = {}) =>
   db('users')
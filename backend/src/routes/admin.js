@@ -13,13 +13,15 @@ import {
   deleteUserAdmin,
   resetUserPasswordAdmin,
   finalizeAuctionsAdmin,
-  updateExtendSettingsAdmin
+  updateExtendSettingsAdmin,
+  getSearchCacheStatsAdmin
 } from '../controllers/admin.controller.js';
 
 const router = Router();
 router.use(checkAuth, checkRole('ADMIN'));
 
 router.get('/dashboard', getDashboard);
+router.get('/search/cache-stats', getSearchCacheStatsAdmin);
 
 router.post('/categories', createCategoryAdmin);
 router.put('/categories/:id', updateCategoryAdmin);
@@ -4,6 +4,7 @@ import {
   getProductBids,
   getProductById,
   getProducts,
+  streamProduct,
   submitProductBid,
   submitAutoBid,
   buyNow,
@@ -24,6 +25,7 @@ router.post(
   createProduct
 );
 router.get('/:id/bids', optionalAuth, getProductBids);
+router.get('/:id/stream', streamProduct);
 router.post('/:id/bid', checkAuth, checkRole('BIDDER', 'SELLER'), submitProductBid);
 router.post('/:id/auto-bid', checkAuth, checkRole('BIDDER', 'SELLER'), submitAutoBid);
 router.post('/:id/buy-now', checkAuth, checkRole('BIDDER', 'SELLER'), buyNow);
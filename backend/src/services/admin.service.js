@@ -1,7 +1,7 @@
-import bcrypt from 'bcrypt';
 import crypto from 'node:crypto';
 import db from '../db/knex.js';
 import { ApiError } from '../utils/response.js';
+import { emitProductChanged, emitUserChanged } from '../utils/auctionEvents.js';
 import {
   createCategory,
   deleteCategory,
@@ -13,12 +13,13 @@ import {
   listSellerRequests,
   updateSellerRequestStatus
 } from '../repositories/sellerRequest.repository.js';
-import { findAutoBidsWithUsers } from '../repositories/autoBid.repository.js';
+import { deleteAutoBidsByUser, findAutoBidsWithUsers } from '../repositories/autoBid.repository.js';
 import { finalizeEndedAuctions } from './product.service.js';
+import { dropAutoBidLadder } from './autoBid.service.js';
 import { getExtendSettings, updateExtendSettings } from './setting.service.js';
 import { sendAdminPasswordResetEmail } from './mail.service.js';
+import { hashPassword } from './password.service.js';
 
-const SALT_ROUNDS = Number(process.env.BCRYPT_SALT_ROUNDS || 10);
 const SELLER_APPROVAL_TTL_DAYS = Number(process.env.SELLER_REQUEST_TTL_DAYS || 7);
 
 const generatePassword = () => crypto.randomBytes(8).toString('hex');
@@ -108,8 +109,10 @@ export const adminDeleteUser = async (id) => {
     if (!user) {
       throw new ApiError(404, 'USERS.NOT_FOUND', 'User not found');
     }
+    emitUserChanged(trx, id);
     await trx('refresh_tokens').where({ user_id: id }).del();
-    await trx('auto_bids').where({ user_id: id }).del();
+    const productIds = await deleteAutoBidsByUser(id, trx);
+    productIds.forEach((productId) => dropAutoBidLadder(productId, trx));
     await trx.commit();
     return user;
   } catch (err) {
@@ -125,7 +128,7 @@ export const adminResetUserPassword = async (id) => {
   }
 
   const newPassword = generatePassword();
-  const passwordHash = await bcrypt.hash(newPassword, SALT_ROUNDS);
+  const passwordHash = await hashPassword(newPassword);
 
   await db.transaction(async (trx) => {
     await updateUser(id, { password_hash: passwordHash }, trx);
@@ -160,6 +163,7 @@ export const adminSoftDeleteProduct = async (productId) => {
   if (!updated) {
     throw new ApiError(404, 'PRODUCTS.NOT_FOUND', 'Product not found');
   }
+  emitProductChanged(null, updated);
 
   return updated;
 };
@@ -1,4 +1,3 @@
-import bcrypt from 'bcrypt';
 import crypto from 'node:crypto';
 import https from 'node:https';
 import jwt from 'jsonwebtoken';
@@ -18,14 +17,14 @@ import {
   sendRegistrationEmail,
   sendRegistrationConfirmedEmail
 } from './mail.service.js';
+import { comparePassword, hashPassword } from './password.service.js';
 import {
   findRefreshTokenByHash,
   insertRefreshToken,
   revokeRefreshToken,
-  revokeTokenChain
+  revokeTokenFamily
 } from '../repositories/refreshToken.repository.js';
 
-const SALT_ROUNDS = Number(process.env.BCRYPT_SALT_ROUNDS || 10);
 const RECAPTCHA_ENDPOINT = {
   hostname: 'www.google.com',
   path: '/recaptcha/api/siteverify'
@@ -55,7 +54,8 @@ const generateRefreshToken = async ({ userId, userAgent, ip }) => {
     expires_at: expiresAt,
     user_agent: userAgent || null,
     ip_address: ip || null,
-    rotated_from: null
+    rotated_from: null,
+    family_id: crypto.randomUUID()
   });
   return { rawToken, record: created };
 };
@@ -78,7 +78,8 @@ const rotateRefreshToken = async ({ currentTokenHash, userAgent, ip }) => {
     expires_at: expiresAt,
     user_agent: userAgent || existing.user_agent,
     ip_address: ip || existing.ip_address,
-    rotated_from: existing.id
+    rotated_from: existing.id,
+    family_id: existing.family_id || crypto.randomUUID()
   });
   return { rawToken, record: created, userId: existing.user_id };
 };
@@ -253,7 +254,7 @@ export const registerUser = async ({
     throw new ApiError(409, 'AUTH.EMAIL_EXISTS', 'Email is already registered');
   }
 
-  const passwordHash = await bcrypt.hash(password, SALT_ROUNDS);
+  const passwordHash = await hashPassword(password);
   const [createdUser] = await createUser({
     email,
     password_hash: passwordHash,
@@ -325,7 +326,7 @@ export const authenticateUser = async ({ email, password, userAgent, ip }) => {
     throw new ApiError(403, 'AUTH.UNCONFIRMED', 'Account is not confirmed');
   }
 
-  const passwordValid = await bcrypt.compare(password, user.password_hash);
+  const passwordValid = await comparePassword(password, user.password_hash);
   if (!passwordValid) {
     throw new ApiError(401, 'AUTH.INVALID_CREDENTIALS', 'Invalid email or password');
   }
@@ -387,7 +388,7 @@ export const resetPassword = async ({ token, newPassword }) => {
     throw new ApiError(400, 'AUTH.INVALID_TOKEN', 'Reset token is invalid or expired');
   }
 
-  const passwordHash = await bcrypt.hash(newPassword, SALT_ROUNDS);
+  const passwordHash = await hashPassword(newPassword);
   const [updated] = await updateUser(otp.user_id, { password_hash: passwordHash });
   if (!updated) {
     throw new ApiError(404, 'AUTH.USER_NOT_FOUND', 'User not found for this token');
@@ -420,7 +421,7 @@ export const revokeRefreshSession = async (refreshToken) => {
   const hashed = hashToken(refreshToken);
   const tokenRow = await findRefreshTokenByHash(hashed);
   if (!tokenRow) return;
-  await revokeTokenChain(tokenRow.id);
+  await revokeTokenFamily(tokenRow);
 };
 
 export const changePassword = async ({ userId, currentPassword, newPassword }) => {
@@ -433,7 +434,7 @@ export const changePassword = async ({ userId, currentPassword, newPassword }) =
     throw new ApiError(404, 'AUTH.USER_NOT_FOUND', 'User not found');
   }
 
-  const passwordValid = await bcrypt.compare(currentPassword, user.password_hash);
+  const passwordValid = await comparePassword(currentPassword, user.password_hash);
   if (!passwordValid) {
     throw new ApiError(401, 'AUTH.INVALID_CREDENTIALS', 'Current password is incorrect');
   }
@@ -442,7 +443,7 @@ export const changePassword = async ({ userId, currentPassword, newPassword }) =
     throw new ApiError(422, 'AUTH.PASSWORD_UNCHANGED', 'New password must be different');
   }
 
-  const passwordHash = await bcrypt.hash(newPassword, SALT_ROUNDS);
+  const passwordHash = await hashPassword(newPassword);
   await updateUser(userId, { password_hash: passwordHash });
 
   return { updated: true };
@@ -2,6 +2,7 @@ import db from '../db/knex.js';
 import { insertBid } from '../repositories/bid.repository.js';
 import { findAutoBidsByProduct } from '../repositories/autoBid.repository.js';
 import { getExtendSettings } from './setting.service.js';
+import { AuctionEvents, auctionEvents, emitAfterCommit, emitProductChanged } from '../utils/auctionEvents.js';
 
 const pick = (row = {}) => ({
   id: row.id,
@@ -12,6 +13,148 @@ const pick = (row = {}) => ({
   status: row.status
 });
 
+// Per-product proxy-bid ladder: the two highest ceilings in findAutoBidsByProduct
+// order. Fewer than two entries means the ladder holds every auto-bid for the
+// product. Every entry is tagged with the products.auto_bid_version it was
+// built for, and is only used when that matches the row read under the
+// product lock, so an auto-bid committed on another node (or a missed bus
+// event) costs a reload, never a stale ladder. Changes made inside a
+// transaction are staged on it and published after commit; the TTL only
+// bounds how long idle entries stay in memory.
+const LADDER_SIZE = 2;
+const LADDER_TTL_MS = Number(process.env.AUTO_BID_LADDER_TTL_MS || 5 * 60 * 1000);
+const LADDER_MAX_PRODUCTS = Number(process.env.AUTO_BID_LADDER_MAX_PRODUCTS || 5000);
+const ladders = new Map();
+const pendingLadders = new WeakMap();
+const DROPPED = null;
+
+const toRung = (row) => ({
+  user_id: row.user_id,
+  max_bid_amount: Number(row.max_bid_amount),
+  created_at: row.created_at
+});
+
+const compareRungs = (a, b) =>
+  b.max_bid_amount - a.max_bid_amount || new Date(a.created_at) - new Date(b.created_at);
+
+const toVersion = (value) => (value === undefined || value === null ? null : Number(value));
+
+const readCachedLadder = (productId) => {
+  const entry = ladders.get(String(productId));
+  if (!entry) return undefined;
+  if (entry.expiresAt < Date.now()) {
+    ladders.delete(String(productId));
+    return undefined;
+  }
+  return entry;
+};
+
+const publishLadder = (productId, entry) => {
+  const key = String(productId);
+  ladders.delete(key);
+  if (entry === DROPPED || entry.version === null) return;
+  if (ladders.size >= LADDER_MAX_PRODUCTS) {
+    ladders.delete(ladders.keys().next().value);
+  }
+  ladders.set(key, { ...entry, expiresAt: Date.now() + LADDER_TTL_MS });
+};
+
+// `entry` is `{ rungs, version }` or DROPPED.
+const stageLadder = (productId, entry, trx) => {
+  if (!trx?.isTransaction) {
+    publishLadder(productId, entry);
+    return;
+  }
+
+  // other transactions waiting on the product lock must rebuild from the DB
+  ladders.delete(String(productId));
+
+  let staged = pendingLadders.get(trx);
+  if (!staged) {
+    staged = new Map();
+    pendingLadders.set(trx, staged);
+    trx.executionPromise.then(
+      () => staged.forEach((value, key) => publishLadder(key, value)),
+      () => staged.forEach((value, key) => ladders.delete(key))
+    );
+  }
+  staged.set(String(productId), entry);
+};
+
+auctionEvents.on(AuctionEvents.AUTO_BIDS_CHANGED, ({ productId, remote }) => {
+  if (remote) ladders.delete(String(productId));
+});
+auctionEvents.on(AuctionEvents.RESYNC, () => ladders.clear());
+
+const announceAutoBidChange = (productId, trx) =>
+  emitAfterCommit(trx, AuctionEvents.AUTO_BIDS_CHANGED, { productId: Number(productId) });
+
+// Rungs for `version`, or undefined when nothing (or nothing current) is held.
+const readLadder = (productId, trx, version) => {
+  if (version === null) return undefined;
+  const staged = trx?.isTransaction ? pendingLadders.get(trx) : undefined;
+  const entry = staged?.has(String(productId)) ? staged.get(String(productId)) : readCachedLadder(productId);
+  return entry && entry.version === version ? entry.rungs : undefined;
+};
+
+// `version` is products.auto_bid_version as read under the product lock.
+const loadLadder = async (productId, knex, version) => {
+  const cached = readLadder(productId, knex, version);
+  if (cached) return cached;
+
+  const rows = await findAutoBidsByProduct(productId, knex).limit(LADDER_SIZE);
+  const rungs = rows.map(toRung);
+  stageLadder(productId, { rungs, version }, knex);
+  return rungs;
+};
+
+// Call after upsertAutoBid with the returned row and version, before the
+// previous version's ladder can be read again.
+export const trackAutoBidUpsert = (productId, row, version, trx = null) => {
+  announceAutoBidChange(productId, trx);
+  const nextVersion = toVersion(version);
+  const rungs = readLadder(productId, trx, nextVersion === null ? null : nextVersion - 1);
+  if (!rungs) {
+    stageLadder(productId, DROPPED, trx);
+    return;
+  }
+
+  const rung = toRung(row);
+  const existing = rungs.find((item) => String(item.user_id) === String(rung.user_id));
+  if (existing && rung.max_bid_amount < existing.max_bid_amount && rungs.length >= LADDER_SIZE) {
+    // a lowered ceiling may fall below an auto-bid the ladder does not hold
+    stageLadder(productId, DROPPED, trx);
+    return;
+  }
+
+  const next = rungs
+    .filter((item) => String(item.user_id) !== String(rung.user_id))
+    .concat(rung)
+    .sort(compareRungs)
+    .slice(0, LADDER_SIZE);
+  stageLadder(productId, { rungs: next, version: nextVersion }, trx);
+};
+
+// Call after deleteAutoBidByUser with the version it returned.
+export const trackAutoBidRemoval = (productId, userId, version, trx = null) => {
+  announceAutoBidChange(productId, trx);
+  const nextVersion = toVersion(version);
+  const rungs = readLadder(productId, trx, nextVersion === null ? null : nextVersion - 1);
+  const held = rungs?.some((item) => String(item.user_id) === String(userId));
+  if (!rungs || (held && rungs.length >= LADDER_SIZE)) {
+    stageLadder(productId, DROPPED, trx);
+    return;
+  }
+  stageLadder(
+    productId,
+    { rungs: rungs.filter((item) => String(item.user_id) !== String(userId)), version: nextVersion },
+    trx
+  );
+};
+
+// Call after deleteAutoBidsByProductId or when the auction closes.
+export const dropAutoBidLadder = (productId, trx = null) => stageLadder(productId, DROPPED, trx);
+
 const computeExtendedEndTime = (product, windowMinutes, extendMinutes) => {
   if (!product.auto_extend) return null;
   const endTime = new Date(product.end_at).getTime();
@@ -33,10 +176,11 @@ export const recalcAutoBid = async (productId, trx = null, options = {}) => {
       .first());
 
   if (!product || product.status !== 'ACTIVE' || !product.enable_auto_bid) {
+    if (product) dropAutoBidLadder(productId, trx);
     return { triggered: false };
   }
 
-  const autoBids = await findAutoBidsByProduct(productId, knex);
+  const autoBids = await loadLadder(productId, knex, toVersion(product.auto_bid_version));
   if (!autoBids.length) {
     return { triggered: false };
   }
@@ -45,9 +189,9 @@ export const recalcAutoBid = async (productId, trx = null, options = {}) => {
   const currentPrice = Number(product.current_price);
   const startPrice = Number(product.start_price);
   const priceStep = Number(product.price_step);
-  const extendSettings = await getExtendSettings();
+  const extendSettings = options.extendSettings || (await getExtendSettings());
 
-  const secondAutoAmount = autoBids[1] ? Number(autoBids[1].max_bid_amount) : null;
+  const secondAutoAmount = autoBids[1] ? autoBids[1].max_bid_amount : null;
   const manualAmount =
     product.current_bidder_id && product.current_bidder_id !== topBidder.user_id
       ? Math.max(currentPrice, startPrice)
@@ -99,6 +243,11 @@ export const recalcAutoBid = async (productId, trx = null, options = {}) => {
       ['id', 'current_price', 'current_bidder_id', 'bid_count', 'end_at', 'status']
     );
 
+  if (extendedEndAt) {
+    emitAfterCommit(trx, AuctionEvents.END_CHANGED, { productId, endAt: updatedProduct.end_at });
+  }
+  emitProductChanged(trx, updatedProduct);
+
   const [autoBidRecord] = await insertBid(
     {
       product_id: productId,
@@ -0,0 +1,128 @@
+import crypto from 'node:crypto';
+import { countRows, estimateRows } from '../repositories/count.repository.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+
+export const CountModes = {
+  AUTO: 'auto',
+  EXACT: 'exact',
+  ESTIMATE: 'estimate',
+  NONE: 'none'
+};
+
+const COUNT_CACHE_TTL_MS = Number(process.env.COUNT_CACHE_TTL_MS || 15000);
+const COUNT_CACHE_MAX_ENTRIES = Number(process.env.COUNT_CACHE_MAX_ENTRIES || 2000);
+// In auto mode, planner estimates at or above this are reported as-is;
+// smaller sets are cheap enough to count exactly.
+const COUNT_ESTIMATE_THRESHOLD = Number(process.env.COUNT_ESTIMATE_THRESHOLD || 5000);
+
+const cache = new Map();
+const inflight = new Map();
+// Bumped on invalidation so counts that started before it are not cached.
+const generations = { all: 0, volatile: 0 };
+
+// Listing membership only changes when a product is created or leaves
+// ACTIVE. Bids move price, bid count and (auto-extend) end_at, so they only
+// invalidate counts whose filters look at those columns.
+const invalidate = (change) => {
+  const membershipChanged = change.created || change.status !== 'ACTIVE';
+  generations.volatile += 1;
+  if (membershipChanged) {
+    generations.all += 1;
+    cache.clear();
+    return;
+  }
+  [...cache.entries()]
+    .filter(([, entry]) => entry.volatile)
+    .forEach(([key]) => cache.delete(key));
+};
+
+auctionEvents.on(AuctionEvents.PRODUCT_CHANGED, invalidate);
+auctionEvents.on(AuctionEvents.RESYNC, () => {
+  generations.all += 1;
+  generations.volatile += 1;
+  cache.clear();
+});
+
+const cacheKey = (scope, params) =>
+  `${scope}:${crypto.createHash('sha1').update(JSON.stringify(params)).digest('base64url')}`;
+
+const readCache = (key, mode) => {
+  const entry = cache.get(key);
+  if (!entry) return null;
+  if (entry.expiresAt <= Date.now()) {
+    cache.delete(key);
+    return null;
+  }
+  // exact requests cannot be answered from an estimate
+  if (mode === CountModes.EXACT && entry.mode !== CountModes.EXACT) return null;
+  return entry;
+};
+
+const writeCache = (key, entry, generation) => {
+  if (!(COUNT_CACHE_TTL_MS > 0)) return;
+  if (generation.all !== generations.all) return;
+  if (entry.volatile && generation.volatile !== generations.volatile) return;
+  cache.delete(key);
+  if (cache.size >= COUNT_CACHE_MAX_ENTRIES) {
+    cache.delete(cache.keys().next().value);
+  }
+  cache.set(key, { ...entry, expiresAt: Date.now() + COUNT_CACHE_TTL_MS });
+};
+
+const computeCount = async (buildQuery, mode) => {
+  const query = buildQuery();
+  if (mode === CountModes.EXACT) {
+    return { total: await countRows(query), mode: CountModes.EXACT };
+  }
+  const estimate = await estimateRows(query);
+  if (mode === CountModes.ESTIMATE || estimate >= COUNT_ESTIMATE_THRESHOLD) {
+    return { total: estimate, mode: CountModes.ESTIMATE };
+  }
+  return { total: await countRows(query), mode: CountModes.EXACT };
+};
+
+/**
+ * Picks the count mode for a listing request. Cursor pages skip the count
+ * unless the caller asks for one; `includeTotal=false` always skips it.
+ */
+export const resolveCountMode = ({ countMode, includeTotal, cursor }) => {
+  if (includeTotal === false) return CountModes.NONE;
+  if (countMode) return countMode;
+  if (cursor && includeTotal !== true) return CountModes.NONE;
+  return CountModes.AUTO;
+};
+
+/**
+ * Counts the rows of `buildQuery()` in the requested mode, sharing results
+ * for identical (scope, params) for COUNT_CACHE_TTL_MS. Set `volatile` when
+ * the filters depend on columns that bids change (price, bid count, end time).
+ * Resolves to { total, mode, cached } where mode is the one actually used.
+ */
+export const countResults = async ({ scope, params, buildQuery, mode = CountModes.AUTO, volatile = false }) => {
+  if (mode === CountModes.NONE) {
+    return { total: null, mode: CountModes.NONE, cached: false };
+  }
+
+  const key = cacheKey(scope, params);
+  const hit = readCache(key, mode);
+  if (hit) {
+    return { total: hit.total, mode: hit.mode, cached: true };
+  }
+
+  const flightKey = `${key}:${mode}`;
+  if (!inflight.has(flightKey)) {
+    const generation = { ...generations };
+    inflight.set(
+      flightKey,
+      computeCount(buildQuery, mode)
+        .then((result) => {
+          writeCache(key, { ...result, volatile }, generation);
+          return result;
+        })
+        .finally(() => inflight.delete(flightKey))
+    );
+  }
+
+  const result = await inflight.get(flightKey);
+  return { ...result, cached: false };
+};
@@ -0,0 +1,260 @@
+import crypto from 'node:crypto';
+import db from '../db/knex.js';
+import { AuctionEvents, auctionEvents, emitEvent } from '../utils/auctionEvents.js';
+
+const CHANNEL = process.env.EVENT_BUS_CHANNEL || 'auction_events';
+// Events for the same product within this window go out as one.
+const COALESCE_MS = Number(process.env.EVENT_BUS_COALESCE_MS || 50);
+const PING_INTERVAL_MS = 30000;
+const RECONNECT_MIN_MS = 1000;
+const RECONNECT_MAX_MS = 30000;
+// NOTIFY payloads are capped at 8000 bytes
+const MAX_PAYLOAD_BYTES = 7500;
+
+// Short wire names; payloads are the local event payloads.
+const FORWARDED = {
+  p: AuctionEvents.PRODUCT_CHANGED,
+  e: AuctionEvents.END_CHANGED,
+  u: AuctionEvents.USER_CHANGED,
+  a: AuctionEvents.AUTO_BIDS_CHANGED
+};
+const WIRE_NAMES = Object.fromEntries(Object.entries(FORWARDED).map(([wire, event]) => [event, wire]));
+
+const nodeId = crypto.randomBytes(6).toString('base64url');
+const stats = {
+  connected: false,
+  published: 0,
+  coalesced: 0,
+  notifies: 0,
+  received: 0,
+  reconnects: 0,
+  resyncs: 0,
+  publishFailures: 0
+};
+
+const subjectOf = (payload) => payload.productId ?? payload.userId;
+
+// Fields where null is a real value (currentBidderId: null = no bidder);
+// only undefined means unknown for them.
+const NULLABLE_FIELDS = new Set(['currentBidderId']);
+
+// Later values win; unknown values keep the earlier one.
+const mergePayloads = (previous, next) => {
+  const merged = { ...previous };
+  Object.entries(next).forEach(([key, value]) => {
+    if (value === undefined) return;
+    if (value === null && !NULLABLE_FIELDS.has(key)) return;
+    merged[key] = value;
+  });
+  if (previous.created || next.created) merged.created = true;
+  return merged;
+};
+
+const chunkFrames = (frames) => {
+  const chunks = [];
+  let current = [];
+  let size = 0;
+  frames.forEach((frame) => {
+    const frameSize = Buffer.byteLength(JSON.stringify(frame));
+    if (current.length && size + frameSize > MAX_PAYLOAD_BYTES) {
+      chunks.push(current);
+      current = [];
+      size = 0;
+    }
+    current.push(frame);
+    size += frameSize + 1;
+  });
+  if (current.length) chunks.push(current);
+  return chunks;
+};
+
+/**
+ * Shares auction events between API nodes over Postgres LISTEN/NOTIFY.
+ * Local events (already emitted after commit) are coalesced per subject
+ * and published on the pool; one dedicated connection listens and
+ * re-emits other nodes' events locally with `remote: true`. After the
+ * listener reconnects it emits RESYNC so caches drop what they may have
+ * missed. Returns a stop function.
+ */
+export const startEventBus = ({
+  enabled = process.env.ENABLE_EVENT_BUS !== 'false',
+  channel = CHANNEL,
+  coalesceMs = COALESCE_MS
+} = {}) => {
+  if (!enabled) {
+    return null;
+  }
+  if (!/^[a-z_][a-z0-9_]*$/.test(channel)) {
+    throw new Error(`Invalid EVENT_BUS_CHANNEL "${channel}"`);
+  }
+
+  const pending = new Map();
+  let flushTimer = null;
+  let connection = null;
+  let pingTimer = null;
+  let reconnectTimer = null;
+  let reconnectDelay = RECONNECT_MIN_MS;
+  let hasConnected = false;
+  let stopped = false;
+  let resyncOwed = false;
+
+  const notify = async (body) => {
+    await db.raw('select pg_notify(?, ?)', [channel, JSON.stringify({ n: nodeId, ...body })]);
+    stats.notifies += 1;
+  };
+
+  const scheduleFlush = (delayMs) => {
+    if (!flushTimer && !stopped) flushTimer = setTimeout(flush, delayMs);
+  };
+
+  // Once a publish fails other nodes have missed events, so the next
+  // successful publish is a resync request that makes them drop derived
+  // state. It is retried on its own until it gets through.
+  const flush = async () => {
+    flushTimer = null;
+    if (resyncOwed) {
+      try {
+        await notify({ r: 1 });
+        resyncOwed = false;
+      } catch (err) {
+        console.error('[event-bus] resync request failed', err.message);
+        pending.clear();
+        scheduleFlush(RECONNECT_MIN_MS);
+        return;
+      }
+    }
+    const frames = [...pending.values()];
+    pending.clear();
+    for (const chunk of chunkFrames(frames)) {
+      try {
+        await notify({ v: chunk });
+      } catch (err) {
+        console.error('[event-bus] publish failed', err.message);
+        stats.publishFailures += 1;
+        resyncOwed = true;
+        pending.clear();
+        scheduleFlush(RECONNECT_MIN_MS);
+        return;
+      }
+    }
+  };
+
+  const forward = (event) => (payload) => {
+    if (payload?.remote) return;
+    const wire = WIRE_NAMES[event];
+    const key = `${wire}:${subjectOf(payload)}`;
+    const previous = pending.get(key);
+    stats.published += 1;
+    if (previous) {
+      stats.coalesced += 1;
+      pending.set(key, [wire, mergePayloads(previous[1], payload)]);
+    } else {
+      pending.set(key, [wire, payload]);
+    }
+    scheduleFlush(coalesceMs);
+  };
+
+  const forwarders = Object.values(FORWARDED).map((event) => [event, forward(event)]);
+  forwarders.forEach(([event, handler]) => auctionEvents.on(event, handler));
+
+  const onNotification = (message) => {
+    if (message.channel !== channel) return;
+    let body;
+    try {
+      body = JSON.parse(message.payload);
+    } catch {
+      return;
+    }
+    if (!body || body.n === nodeId) return;
+    if (body.r) {
+      stats.resyncs += 1;
+      emitEvent(AuctionEvents.RESYNC, { reason: 'event-bus-publish-failed', node: body.n });
+      return;
+    }
+    if (!Array.isArray(body.v)) return;
+    body.v.forEach(([wire, payload]) => {
+      const event = FORWARDED[wire];
+      if (!event || !payload) return;
+      stats.received += 1;
+      emitEvent(event, { ...payload, remote: true });
+    });
+  };
+
+  const scheduleReconnect = () => {
+    if (stopped || reconnectTimer) return;
+    reconnectTimer = setTimeout(() => {
+      reconnectTimer = null;
+      connect();
+    }, reconnectDelay);
+    reconnectDelay = Math.min(reconnectDelay * 2, RECONNECT_MAX_MS);
+  };
+
+  const release = (raw) => {
+    raw.removeAllListeners('notification');
+    db.client.destroyRawConnection(raw).catch(() => {});
+  };
+
+  const dropConnection = (raw, reason) => {
+    if (connection !== raw) return;
+    console.warn(`[event-bus] listener lost: ${reason}`);
+    connection = null;
+    stats.connected = false;
+    clearInterval(pingTimer);
+    release(raw);
+    scheduleReconnect();
+  };
+
+  const connect = async () => {
+    let raw;
+    try {
+      raw = await db.client.acquireRawConnection();
+      raw.on('notification', onNotification);
+      raw.on('error', (err) => dropConnection(raw, err.message));
+      raw.on('end', () => dropConnection(raw, 'connection ended'));
+      await raw.query(`LISTEN ${channel}`);
+    } catch (err) {
+      console.error('[event-bus] listen failed', err.message);
+      if (raw) release(raw);
+      scheduleReconnect();
+      return;
+    }
+    if (stopped) {
+      release(raw);
+      return;
+    }
+
+    connection = raw;
+    stats.connected = true;
+    reconnectDelay = RECONNECT_MIN_MS;
+    // a half-open TCP connection never errors by itself
+    pingTimer = setInterval(() => {
+      raw.query('select 1').catch((err) => dropConnection(raw, err.message));
+    }, PING_INTERVAL_MS);
+    pingTimer.unref();
+
+    if (hasConnected) {
+      stats.reconnects += 1;
+      stats.resyncs += 1;
+      emitEvent(AuctionEvents.RESYNC, { reason: 'event-bus-reconnect' });
+    }
+    hasConnected = true;
+  };
+
+  connect();
+
+  return () => {
+    stopped = true;
+    clearTimeout(flushTimer);
+    clearTimeout(reconnectTimer);
+    clearInterval(pingTimer);
+    forwarders.forEach(([event, handler]) => auctionEvents.off(event, handler));
+    if (connection) {
+      const current = connection;
+      connection = null;
+      stats.connected = false;
+      release(current);
+    }
+  };
+};
+
+export const getEventBusStats = () => ({ nodeId, ...stats });
@@ -1,3 +1,4 @@
+import crypto from 'node:crypto';
 import {
   findEndingSoonProducts,
   findMostBiddedProducts,
@@ -6,36 +7,139 @@ import {
 } from '../repositories/product.repository.js';
 import { getHighlightNewMinutes } from './setting.service.js';
 import { mapProduct } from './product.service.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
 
 const SECTION_LIMIT = 5;
+// safety net for changes that do not publish events (and for isNew flags)
+const SNAPSHOT_MAX_AGE_MS = Number(process.env.HOMEPAGE_SNAPSHOT_MAX_AGE_MS || 60 * 1000);
 
-export const buildHomepagePayload = async () => {
-  const highlightWindowMinutes = await getHighlightNewMinutes();
-  const [topPriceRows, endingSoonRows, mostBiddedRows] = await Promise.all([
-    findTopPriceProducts(SECTION_LIMIT),
-    findEndingSoonProducts(SECTION_LIMIT),
-    findMostBiddedProducts(SECTION_LIMIT)
-  ]);
-
-  const uniqueProductIds = Array.from(
-    new Set([
-      ...topPriceRows.map((row) => row.id),
-      ...endingSoonRows.map((row) => row.id),
-      ...mostBiddedRows.map((row) => row.id)
-    ])
-  );
-
-  const imageMap = await findPrimaryImagesForProducts(uniqueProductIds);
-
-  const mapRow = (row) =>
-    mapProduct(row, {
-      highlightWindowMinutes,
-      primaryImageUrl: imageMap.get(row.id) || null
+const SECTIONS = {
+  topPrice: {
+    load: findTopPriceProducts,
+    couldEnter: (change, last) =>
+      change.currentPrice === null || change.currentPrice >= Number(last.current_price)
+  },
+  endingSoon: {
+    load: findEndingSoonProducts,
+    couldEnter: (change, last) =>
+      change.endAt === null || new Date(change.endAt) <= new Date(last.end_at)
+  },
+  mostBidded: {
+    load: findMostBiddedProducts,
+    couldEnter: (change, last) =>
+      change.bidCount === null || change.bidCount >= Number(last.bid_count)
+  }
+};
+
+const SECTION_NAMES = Object.keys(SECTIONS);
+
+const snapshot = {
+  rows: {},
+  images: new Map(),
+  payload: null,
+  etag: null,
+  version: 0,
+  builtAt: 0
+};
+const dirtySections = new Set(SECTION_NAMES);
+let rebuilding = null;
+
+const isMember = (section, productId) =>
+  (snapshot.rows[section] || []).some((row) => String(row.id) === String(productId));
+
+// A change matters to a section when it touches a listed product, or when an
+// ACTIVE product now ranks at least as high as the section's last entry.
+const markAffectedSections = (change) => {
+  SECTION_NAMES.forEach((section) => {
+    if (dirtySections.has(section)) return;
+    const rows = snapshot.rows[section];
+    if (!rows || isMember(section, change.productId)) {
+      dirtySections.add(section);
+      return;
+    }
+    if (change.status !== null && change.status !== 'ACTIVE') return;
+    if (rows.length < SECTION_LIMIT || SECTIONS[section].couldEnter(change, rows[rows.length - 1])) {
+      dirtySections.add(section);
+    }
+  });
+};
+
+auctionEvents.on(AuctionEvents.PRODUCT_CHANGED, markAffectedSections);
+auctionEvents.on(AuctionEvents.RESYNC, () => SECTION_NAMES.forEach((section) => dirtySections.add(section)));
+
+const rebuildSnapshot = async () => {
+  const sections = [...dirtySections];
+  dirtySections.clear();
+
+  try {
+    const highlightWindowMinutes = await getHighlightNewMinutes();
+    const loaded = await Promise.all(sections.map((section) => SECTIONS[section].load(SECTION_LIMIT)));
+    sections.forEach((section, index) => {
+      snapshot.rows[section] = loaded[index];
     });
 
+    const productIds = Array.from(
+      new Set(SECTION_NAMES.flatMap((section) => snapshot.rows[section].map((row) => row.id)))
+    );
+    const missingImageIds = productIds.filter((id) => !snapshot.images.has(id));
+    if (missingImageIds.length) {
+      const imageMap = await findPrimaryImagesForProducts(missingImageIds);
+      missingImageIds.forEach((id) => snapshot.images.set(id, imageMap.get(id) || null));
+    }
+    [...snapshot.images.keys()]
+      .filter((id) => !productIds.includes(id))
+      .forEach((id) => snapshot.images.delete(id));
+
+    const mapRow = (row) =>
+      mapProduct(row, {
+        highlightWindowMinutes,
+        primaryImageUrl: snapshot.images.get(row.id) || null
+      });
+
+    const payload = {
+      topPrice: snapshot.rows.topPrice.map(mapRow),
+      endingSoon: snapshot.rows.endingSoon.map(mapRow),
+      mostBidded: snapshot.rows.mostBidded.map(mapRow)
+    };
+    const body = JSON.stringify(payload);
+    const etag = `W/"home-${crypto.createHash('sha1').update(body).digest('base64url')}"`;
+
+    if (etag !== snapshot.etag) {
+      snapshot.version += 1;
+    }
+    snapshot.payload = payload;
+    snapshot.etag = etag;
+    snapshot.builtAt = Date.now();
+  } catch (err) {
+    sections.forEach((section) => dirtySections.add(section));
+    throw err;
+  }
+};
+
+/**
+ * Returns the cached homepage sections, rebuilding only the sections that
+ * product changes have marked dirty since the last build.
+ */
+export const getHomepageSnapshot = async () => {
+  if (Date.now() - snapshot.builtAt > SNAPSHOT_MAX_AGE_MS) {
+    SECTION_NAMES.forEach((section) => dirtySections.add(section));
+  }
+
+  if (dirtySections.size || !snapshot.payload) {
+    if (!rebuilding) {
+      rebuilding = rebuildSnapshot().finally(() => {
+        rebuilding = null;
+      });
+    }
+    await rebuilding;
+  }
+
   return {
-    topPrice: topPriceRows.map(mapRow),
-    endingSoon: endingSoonRows.map(mapRow),
-    mostBidded: mostBiddedRows.map(mapRow)
+    payload: snapshot.payload,
+    etag: snapshot.etag,
+    version: snapshot.version,
+    generatedAt: new Date(snapshot.builtAt).toISOString()
   };
 };
+
+export const buildHomepagePayload = async () => (await getHomepageSnapshot()).payload;
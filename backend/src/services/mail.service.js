@@ -9,7 +9,11 @@ const transportOptions = {
         user: process.env.MAIL_USER,
         pass: process.env.MAIL_PASS
       }
-    : undefined
+    : undefined,
+  // reuse SMTP connections instead of one handshake per message
+  pool: true,
+  maxConnections: Number(process.env.MAIL_POOL_MAX_CONNECTIONS || 3),
+  maxMessages: Number(process.env.MAIL_POOL_MAX_MESSAGES || 100)
 };
 
 let transporter = null;
@@ -22,19 +26,27 @@ const getTransporter = () => {
   return transporter;
 };
 
-const sendMail = async ({ to, subject, text }) => {
+/**
+ * Sends one message and lets delivery errors propagate, so the outbox
+ * dispatcher can retry. Without MAIL_HOST the message is only logged.
+ */
+export const deliverMail = async ({ to, subject, text }) => {
   const mailer = getTransporter();
   if (!mailer) {
     console.info('[mail] skipped email', { to, subject, text });
     return;
   }
+  await mailer.sendMail({
+    from: process.env.MAIL_FROM || process.env.MAIL_USER,
+    to,
+    subject,
+    text
+  });
+};
+
+const sendMail = async (message) => {
   try {
-    await mailer.sendMail({
-      from: process.env.MAIL_FROM || process.env.MAIL_USER,
-      to,
-      subject,
-      text
-    });
+    await deliverMail(message);
   } catch (err) {
     console.warn('[mail] delivery failed, continuing without email', err.message);
   }
@@ -61,20 +73,6 @@ export const sendPasswordResetEmail = async ({ email, token }) =>
     text: `To reset your password, use this token: ${token}`
   });
 
-export const sendBidNotification = async ({ email, productName, amount }) =>
-  sendMail({
-    to: email,
-    subject: 'New bid received',
-    text: `New bid on ${productName}: ${amount}`
-  });
-
-export const sendBidderReceipt = async ({ email, productName, amount }) =>
-  sendMail({
-    to: email,
-    subject: 'You placed a bid',
-    text: `Your bid of ${amount} on ${productName} is now the leading offer.`
-  });
-
 const getFrontendBase = () => process.env.FRONTEND_URL?.split(',')[0]?.trim();
 
 const buildProductUrl = (productId) => {
@@ -84,26 +82,72 @@ const buildProductUrl = (productId) => {
   return `${normalized}/products/${productId}`;
 };
 
-export const sendOutbidNotification = async ({ email, productName, amount, productId }) => {
+const productLinkLine = (productId) => {
   const productUrl = buildProductUrl(productId);
-  const linkLine = productUrl ? `\n\nView auction: ${productUrl}` : '';
-  return sendMail({
-    to: email,
-    subject: 'You have been outbid',
-    text: `Another bidder has surpassed your offer on ${productName}. Latest price: ${amount}.${linkLine}`
-  });
+  return productUrl ? `\n\nView auction: ${productUrl}` : '';
 };
 
-export const sendDescriptionUpdateNotification = async ({ email, productName, productId }) => {
-  const productUrl = buildProductUrl(productId);
-  const linkLine = productUrl ? `\n\nView auction: ${productUrl}` : '';
-  return sendMail({
-    to: email,
+// Subject/text builders for the auction mails, keyed by the `kind` the
+// mail outbox stores.
+export const MailTemplates = {
+  bidReceived: ({ productName, amount }) => ({
+    subject: 'New bid received',
+    text: `New bid on ${productName}: ${amount}`
+  }),
+  bidReceipt: ({ productName, amount }) => ({
+    subject: 'You placed a bid',
+    text: `Your bid of ${amount} on ${productName} is now the leading offer.`
+  }),
+  outbid: ({ productName, amount, productId }) => ({
+    subject: 'You have been outbid',
+    text: `Another bidder has surpassed your offer on ${productName}. Latest price: ${amount}.${productLinkLine(productId)}`
+  }),
+  descriptionUpdated: ({ productName, productId }) => ({
     subject: 'Product description updated',
-    text: `The seller updated the description for ${productName}.${linkLine}`
-  });
+    text: `The seller updated the description for ${productName}.${productLinkLine(productId)}`
+  }),
+  bidRejected: ({ productName, reason }) => ({
+    subject: 'Bid access revoked',
+    text: `The seller rejected your participation for ${productName}. Reason: ${reason || 'No reason provided.'}`
+  }),
+  auctionResult: ({ productName, outcome }) => ({
+    subject: 'Auction update',
+    text: `Auction "${productName}" has ${outcome}.`
+  }),
+  // `items` maps `<kind>:<productId>` to the latest data of that kind plus
+  // how many events it stands for.
+  digest: ({ items = {} }) => {
+    const entries = Object.values(items);
+    return {
+      subject: entries.length === 1 ? 'Auction activity update' : `Activity on ${entries.length} auctions`,
+      text: `Here is what happened since your last update:\n\n${entries.map(digestLine).join('\n\n')}`
+    };
+  }
+};
+
+// A single event reads like the immediate mail; repeats are summarized.
+const digestLine = ({ kind, count = 1, ...data }) => {
+  if (count <= 1 && MailTemplates[kind]) return MailTemplates[kind](data).text;
+  const { productName, amount, productId } = data;
+  const link = productLinkLine(productId);
+  if (kind === 'outbid') {
+    return `You were outbid ${count} times on ${productName}. Current price: ${amount}.${link}`;
+  }
+  return `${productName} received ${count} new bids. Current price: ${amount}.${link}`;
 };
 
+export const sendBidNotification = async ({ email, ...data }) =>
+  sendMail({ to: email, ...MailTemplates.bidReceived(data) });
+
+export const sendBidderReceipt = async ({ email, ...data }) =>
+  sendMail({ to: email, ...MailTemplates.bidReceipt(data) });
+
+export const sendOutbidNotification = async ({ email, ...data }) =>
+  sendMail({ to: email, ...MailTemplates.outbid(data) });
+
+export const sendDescriptionUpdateNotification = async ({ email, ...data }) =>
+  sendMail({ to: email, ...MailTemplates.descriptionUpdated(data) });
+
 export const sendAdminPasswordResetEmail = async ({ email, password }) => {
   const base = getFrontendBase();
   const loginUrl = base ? `${base.replace(/\/$/, '')}/login` : null;
@@ -115,12 +159,8 @@ export const sendAdminPasswordResetEmail = async ({ email, password }) => {
   });
 };
 
-export const sendBidRejectedNotification = async ({ email, productName, reason }) =>
-  sendMail({
-    to: email,
-    subject: 'Bid access revoked',
-    text: `The seller rejected your participation for ${productName}. Reason: ${reason || 'No reason provided.'}`
-  });
+export const sendBidRejectedNotification = async ({ email, ...data }) =>
+  sendMail({ to: email, ...MailTemplates.bidRejected(data) });
 
 export const sendOrderNotification = async ({ email, productName, status }) =>
   sendMail({
@@ -143,9 +183,5 @@ export const sendAnswerNotification = async ({ email, productName, answerText })
     text: `Answer on ${productName}: ${answerText}`
   });
 
-export const sendAuctionResultNotification = async ({ email, productName, outcome }) =>
-  sendMail({
-    to: email,
-    subject: 'Auction update',
-    text: `Auction "${productName}" has ${outcome}.`
-  });
+export const sendAuctionResultNotification = async ({ email, ...data }) =>
+  sendMail({ to: email, ...MailTemplates.auctionResult(data) });
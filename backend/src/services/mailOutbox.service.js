@@ -0,0 +1,167 @@
+import {
+  claimDueMails,
+  countQueuedMails,
+  insertOutboxMails,
+  markMailFailed,
+  markMailsSent,
+  rescheduleMail
+} from '../repositories/mailOutbox.repository.js';
+import { findNotificationModes, findUsersByIds } from '../repositories/user.repository.js';
+import { AuctionEvents, emitAfterCommit } from '../utils/auctionEvents.js';
+import { MailTemplates, deliverMail } from './mail.service.js';
+
+// At most one mail per coalesce key (e.g. outbid per user and product) is
+// sent within this window; later ones update the queued mail.
+const COALESCE_WINDOW_SECONDS = Number(process.env.MAIL_COALESCE_WINDOW_SECONDS || 60);
+const MAX_ATTEMPTS = Number(process.env.MAIL_MAX_ATTEMPTS || 5);
+const RETRY_BASE_MS = 30 * 1000;
+const RETRY_MAX_MS = 60 * 60 * 1000;
+// Users in DIGEST mode get these kinds as one summary per window.
+const DIGEST_WINDOW_SECONDS = Number(process.env.MAIL_DIGEST_WINDOW_SECONDS || 900);
+const DIGEST_KINDS = new Set(['outbid', 'bidReceived']);
+
+// Turns a digestible mail into an item of the recipient's pending digest.
+const toDigest = (mail) => ({
+  kind: 'digest',
+  userId: mail.userId,
+  data: {
+    items: { [`${mail.kind}:${mail.data?.productId}`]: { kind: mail.kind, ...mail.data, count: 1 } }
+  },
+  coalesceKey: `digest:${mail.userId}`,
+  delaySeconds: DIGEST_WINDOW_SECONDS
+});
+
+const mergeDigestItems = (current, next) => {
+  const items = { ...current };
+  Object.entries(next).forEach(([key, item]) => {
+    items[key] = { ...item, count: (current[key]?.count || 0) + item.count };
+  });
+  return items;
+};
+
+const applyDigestPreferences = async (trx, mails) => {
+  const userIds = [
+    ...new Set(mails.filter((mail) => DIGEST_KINDS.has(mail.kind) && mail.userId).map((mail) => String(mail.userId)))
+  ];
+  if (!userIds.length) return mails;
+  const modes = await findNotificationModes(userIds, trx);
+  const digestUsers = new Set(
+    modes.filter((row) => row.notification_mode === 'DIGEST').map((row) => String(row.id))
+  );
+  if (!digestUsers.size) return mails;
+  return mails.map((mail) =>
+    DIGEST_KINDS.has(mail.kind) && digestUsers.has(String(mail.userId)) ? toDigest(mail) : mail
+  );
+};
+
+/**
+ * Queues auction mails in `trx`, so they exist only if the change commits
+ * and the transaction never waits on SMTP. Each mail is
+ * `{ kind, userId | email, data, coalesceKey?, delaySeconds? }` where kind
+ * is a MailTemplates key. Outbid and bid-received mails for users who chose
+ * DIGEST are folded into one summary per MAIL_DIGEST_WINDOW_SECONDS.
+ */
+export const enqueueMails = async (trx, mails) => {
+  const queued = await applyDigestPreferences(
+    trx,
+    mails.filter((mail) => mail && (mail.userId || mail.email))
+  );
+  const rows = new Map();
+  queued.forEach((mail, index) => {
+    // one row per key per statement; the last one carries the newest data
+    const key = mail.coalesceKey || `#${index}`;
+    const payload =
+      mail.kind === 'digest' && rows.has(key)
+        ? { items: mergeDigestItems(rows.get(key).payload.items, mail.data.items) }
+        : mail.data || {};
+    rows.set(key, {
+      kind: mail.kind,
+      user_id: mail.userId ? Number(mail.userId) : null,
+      email: mail.email || null,
+      payload,
+      coalesce_key: mail.coalesceKey || null,
+      delay_seconds: mail.delaySeconds || 0
+    });
+  });
+  if (!rows.size) return 0;
+  const count = await insertOutboxMails([...rows.values()], COALESCE_WINDOW_SECONDS, trx);
+  emitAfterCommit(trx, AuctionEvents.MAIL_QUEUED, { count });
+  return count;
+};
+
+// dispatches by this process, for /api/metrics
+const totals = { sent: 0, retried: 0, failed: 0 };
+
+const retryDelay = (attempts) => Math.min(RETRY_BASE_MS * 2 ** (attempts - 1), RETRY_MAX_MS);
+
+const runWithConcurrency = async (items, limit, worker) => {
+  let next = 0;
+  const lanes = Array.from({ length: Math.min(limit, items.length) }, async () => {
+    while (next < items.length) {
+      const item = items[next];
+      next += 1;
+      await worker(item);
+    }
+  });
+  await Promise.all(lanes);
+};
+
+/**
+ * Claims up to `batchSize` due mails and delivers them with at most
+ * `concurrency` SMTP sends in flight. Failures are retried with
+ * exponential backoff until MAIL_MAX_ATTEMPTS.
+ */
+export const dispatchDueMails = async ({ batchSize, concurrency }) => {
+  const mails = await claimDueMails(batchSize);
+  const result = { claimed: mails.length, sent: 0, retried: 0, failed: 0 };
+  if (!mails.length) return result;
+
+  const userIds = [...new Set(mails.filter((mail) => !mail.email && mail.user_id).map((mail) => mail.user_id))];
+  const users = await findUsersByIds(userIds);
+  const emailById = new Map(users.map((user) => [String(user.id), user.email]));
+  const sentIds = [];
+
+  const dispatchMail = async (mail) => {
+    const to = mail.email || emailById.get(String(mail.user_id));
+    const template = MailTemplates[mail.kind];
+    if (!to || !template) {
+      result.failed += 1;
+      await markMailFailed(mail.id, template ? 'recipient has no email' : `unknown mail kind ${mail.kind}`);
+      return;
+    }
+    try {
+      await deliverMail({ to, ...template(mail.payload || {}) });
+      sentIds.push(mail.id);
+      result.sent += 1;
+    } catch (err) {
+      if (mail.attempts >= MAX_ATTEMPTS) {
+        result.failed += 1;
+        await markMailFailed(mail.id, err.message);
+      } else {
+        result.retried += 1;
+        await rescheduleMail(mail.id, err.message, retryDelay(mail.attempts));
+      }
+    }
+  };
+
+  try {
+    await runWithConcurrency(mails, concurrency, (mail) =>
+      // the mail stays SENDING and is released again by the dispatcher job
+      dispatchMail(mail).catch((err) => {
+        console.error(`[mail-outbox] could not settle mail ${mail.id}`, err.message);
+      })
+    );
+  } finally {
+    // delivered mails must not be sent twice, whatever happened to the others
+    if (sentIds.length) await markMailsSent(sentIds);
+    totals.sent += result.sent;
+    totals.retried += result.retried;
+    totals.failed += result.failed;
+  }
+  return result;
+};
+
+export const getMailOutboxStats = async () => ({
+  ...totals,
+  ...(await countQueuedMails())
+});
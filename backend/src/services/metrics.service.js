@@ -0,0 +1,51 @@
+import { monitorEventLoopDelay } from 'node:perf_hooks';
+import db from '../db/knex.js';
+import { registerCollector, renderMetrics, statsToGauges } from '../utils/metrics.js';
+import { getPasswordPoolStats } from './password.service.js';
+import { getPrincipalCacheStats } from './principal.service.js';
+import { getProductStreamStats } from './productStream.service.js';
+import { getEventBusStats } from './eventBus.service.js';
+import { getSearchCacheStats } from './search.service.js';
+import { getSuggestIndexStats } from './suggest.service.js';
+import { getMailOutboxStats } from './mailOutbox.service.js';
+
+registerCollector(() => {
+  const { pool } = db.client;
+  if (!pool) return [];
+  const help = 'Knex connection pool state';
+  return [
+    { name: 'db_pool_connections', help, value: pool.numUsed(), labels: { state: 'used' } },
+    { name: 'db_pool_connections', help, value: pool.numFree(), labels: { state: 'free' } },
+    { name: 'db_pool_pending_acquires', help: 'Queries waiting for a pooled connection', value: pool.numPendingAcquires() },
+    { name: 'db_pool_pending_creates', help: 'Connections being opened', value: pool.numPendingCreates() },
+    { name: 'db_pool_max', help: 'Configured pool size', value: pool.max }
+  ];
+});
+
+// Percentiles cover the time since the previous scrape.
+const loopDelay = monitorEventLoopDelay({ resolution: 20 });
+loopDelay.enable();
+
+registerCollector(() => {
+  const help = 'Event-loop delay since the previous scrape';
+  const samples = [
+    { name: 'nodejs_eventloop_lag_seconds', help, value: loopDelay.percentile(50) / 1e9, labels: { quantile: '0.5' } },
+    { name: 'nodejs_eventloop_lag_seconds', help, value: loopDelay.percentile(99) / 1e9, labels: { quantile: '0.99' } },
+    { name: 'nodejs_eventloop_lag_max_seconds', help, value: loopDelay.max / 1e9 }
+  ];
+  loopDelay.reset();
+  return samples;
+});
+
+registerCollector(() => [
+  ...statsToGauges('auth_password_pool', getPasswordPoolStats(), 'bcrypt worker pool'),
+  ...statsToGauges('auth_principal_cache', getPrincipalCacheStats(), 'JWT principal cache'),
+  ...statsToGauges('product_stream', getProductStreamStats(), 'Live product SSE streams'),
+  ...statsToGauges('event_bus', getEventBusStats(), 'Cross-node event bus'),
+  ...statsToGauges('search_cache', getSearchCacheStats(), 'Search result and card caches'),
+  ...statsToGauges('search_suggest', getSuggestIndexStats(), 'Suggestion prefix index')
+]);
+
+registerCollector(async () => statsToGauges('mail_outbox', await getMailOutboxStats(), 'Mail outbox'));
+
+export const getMetricsText = () => renderMetrics();
@@ -12,7 +12,8 @@ import {
   upsertRating
 } from '../repositories/order.repository.js';
 import { findProductByIdWithSeller } from '../repositories/product.repository.js';
-import { sendOrderNotification, sendAuctionResultNotification } from './mail.service.js';
+import { sendOrderNotification } from './mail.service.js';
+import { enqueueMails } from './mailOutbox.service.js';
 import { findUserById } from '../repositories/user.repository.js';
 
 const ensureParticipant = (order, userId) => {
@@ -74,29 +75,19 @@ export const ensureOrderForProduct = async (
     },
     trx
   );
-  try {
-    const [seller, winner] = await Promise.all([
-      findUserById(sellerId),
-      findUserById(winnerId)
-    ]);
-    const productLabel = productName || `Product #${productId}`;
-    if (seller?.email) {
-      await sendAuctionResultNotification({
-        email: seller.email,
-        productName: productLabel,
-        outcome: 'ended with a winning bidder'
-      });
-    }
-    if (winner?.email) {
-      await sendAuctionResultNotification({
-        email: winner.email,
-        productName: productLabel,
-        outcome: 'has been awarded to you. Please complete payment promptly.'
-      });
+  const productLabel = productName || `Product #${productId}`;
+  await enqueueMails(trx, [
+    {
+      kind: 'auctionResult',
+      userId: sellerId,
+      data: { productName: productLabel, outcome: 'ended with a winning bidder' }
+    },
+    {
+      kind: 'auctionResult',
+      userId: winnerId,
+      data: { productName: productLabel, outcome: 'has been awarded to you. Please complete payment promptly.' }
     }
-  } catch (err) {
-    console.warn('[mail] auction result notification skipped', err.message);
-  }
+  ]);
 
   return created;
 };
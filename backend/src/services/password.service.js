@@ -0,0 +1,123 @@
+import { Worker } from 'node:worker_threads';
+import { performance } from 'node:perf_hooks';
+import bcrypt from 'bcrypt';
+import { ApiError } from '../utils/response.js';
+
+const SALT_ROUNDS = Number(process.env.BCRYPT_SALT_ROUNDS || 10);
+// Dedicated hashing threads; 0 falls back to bcrypt's async API on the
+// libuv threadpool.
+const POOL_SIZE = Number(process.env.BCRYPT_POOL_SIZE || 2);
+// Jobs waiting beyond either limit are answered with 429 instead of piling up.
+const MAX_QUEUE = Number(process.env.BCRYPT_POOL_MAX_QUEUE || 64);
+const QUEUE_TIMEOUT_MS = Number(process.env.BCRYPT_POOL_QUEUE_TIMEOUT_MS || 5000);
+
+const WORKER_URL = new URL('../workers/bcrypt.worker.js', import.meta.url);
+
+const slots = [];
+const queue = [];
+const metrics = {
+  completed: 0,
+  failed: 0,
+  rejected: 0,
+  waitMsTotal: 0,
+  waitMsMax: 0,
+  runMsTotal: 0,
+  runMsMax: 0
+};
+let nextJobId = 1;
+
+const busyError = () => {
+  metrics.rejected += 1;
+  const error = new ApiError(429, 'AUTH.BUSY', 'Too many sign-in requests right now, please retry shortly');
+  error.retryAfter = 1;
+  return error;
+};
+
+const record = (waitMs, runMs) => {
+  metrics.waitMsTotal += waitMs;
+  metrics.waitMsMax = Math.max(metrics.waitMsMax, waitMs);
+  metrics.runMsTotal += runMs;
+  metrics.runMsMax = Math.max(metrics.runMsMax, runMs);
+};
+
+let dispatch;
+
+const spawn = () => {
+  const slot = { worker: new Worker(WORKER_URL), job: null };
+  slot.worker.on('message', ({ id, result, error, runMs }) => {
+    const { job } = slot;
+    if (!job || job.id !== id) return;
+    slot.job = null;
+    record(job.waitMs, runMs);
+    if (error) {
+      metrics.failed += 1;
+      job.reject(new Error(error));
+    } else {
+      metrics.completed += 1;
+      job.resolve(result);
+    }
+    dispatch();
+  });
+  slot.worker.on('error', (err) => console.error('[bcrypt-pool] worker failed', err.message));
+  slot.worker.on('exit', () => {
+    slots.splice(slots.indexOf(slot), 1);
+    if (slot.job) {
+      metrics.failed += 1;
+      slot.job.reject(new Error('Password hashing worker exited'));
+      slot.job = null;
+    }
+    dispatch();
+  });
+  // hashing threads must not keep the process alive on shutdown
+  slot.worker.unref();
+  slots.push(slot);
+  return slot;
+};
+
+dispatch = () => {
+  while (queue.length) {
+    const slot = slots.find((item) => !item.job) ?? (slots.length < POOL_SIZE ? spawn() : null);
+    if (!slot) return;
+    const job = queue.shift();
+    job.waitMs = performance.now() - job.enqueuedAt;
+    if (job.waitMs > QUEUE_TIMEOUT_MS) {
+      job.reject(busyError());
+      continue;
+    }
+    slot.job = job;
+    slot.worker.postMessage({ id: job.id, ...job.payload });
+  }
+};
+
+const runJob = (payload) => {
+  if (queue.length >= MAX_QUEUE) {
+    return Promise.reject(busyError());
+  }
+  return new Promise((resolve, reject) => {
+    queue.push({ id: nextJobId++, payload, enqueuedAt: performance.now(), resolve, reject });
+    dispatch();
+  });
+};
+
+export const hashPassword = (password) =>
+  POOL_SIZE > 0
+    ? runJob({ op: 'hash', password, rounds: SALT_ROUNDS })
+    : bcrypt.hash(password, SALT_ROUNDS);
+
+export const comparePassword = (password, hash) =>
+  POOL_SIZE > 0
+    ? runJob({ op: 'compare', password, hash })
+    : bcrypt.compare(password, hash);
+
+/**
+ * Pool occupancy plus cumulative queue-wait and hash-time totals (ms), so
+ * averages can be derived per scrape: wait/run total divided by jobs.
+ */
+export const getPasswordPoolStats = () => ({
+  size: POOL_SIZE,
+  workers: slots.length,
+  busy: slots.filter((slot) => slot.job).length,
+  queued: queue.length,
+  maxQueue: MAX_QUEUE,
+  ...metrics
+});
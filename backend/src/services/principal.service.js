@@ -0,0 +1,64 @@
+import { findPrincipalById } from '../repositories/user.repository.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+import { createLruCache } from '../utils/lruCache.js';
+
+const MB = 1024 * 1024;
+// Upper bound on how long another node may keep a stale role/status; this
+// process drops entries as soon as it writes the user.
+const PRINCIPAL_CACHE_TTL_MS = Number(process.env.AUTH_PRINCIPAL_CACHE_TTL_MS || 60000);
+const PRINCIPAL_CACHE_MAX_MB = Number(process.env.AUTH_PRINCIPAL_CACHE_MAX_MB || 4);
+
+const cache = createLruCache({ maxBytes: PRINCIPAL_CACHE_MAX_MB * MB, ttlMs: PRINCIPAL_CACHE_TTL_MS });
+const inflight = new Map();
+// Bumped on every user change so a lookup that raced an update is not cached.
+let generation = 0;
+
+auctionEvents.on(AuctionEvents.USER_CHANGED, ({ userId }) => {
+  generation += 1;
+  cache.delete(String(userId));
+  inflight.delete(String(userId));
+});
+
+auctionEvents.on(AuctionEvents.RESYNC, () => {
+  generation += 1;
+  cache.clear();
+  inflight.clear();
+});
+
+/**
+ * The `{ id, email, role, status }` row behind a token subject, or null when
+ * the user does not exist. Served from memory for AUTH_PRINCIPAL_CACHE_TTL_MS;
+ * concurrent misses for the same user share one query.
+ */
+export const loadPrincipal = async (userId) => {
+  const key = String(userId);
+  if (!(PRINCIPAL_CACHE_TTL_MS > 0)) {
+    return (await findPrincipalById(userId)) ?? null;
+  }
+
+  const cached = cache.get(key);
+  if (cached !== undefined) {
+    return cached.user ? { ...cached.user } : null;
+  }
+
+  if (!inflight.has(key)) {
+    const startedAt = generation;
+    const flight = findPrincipalById(userId)
+      .then((row) => {
+        const user = row ?? null;
+        if (startedAt === generation) {
+          cache.set(key, { user });
+        }
+        return user;
+      })
+      .finally(() => {
+        if (inflight.get(key) === flight) inflight.delete(key);
+      });
+    inflight.set(key, flight);
+  }
+
+  const user = await inflight.get(key);
+  return user ? { ...user } : null;
+};
+
+export const getPrincipalCacheStats = () => cache.stats();
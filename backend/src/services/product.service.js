@@ -1,19 +1,17 @@
 import db from '../db/knex.js';
 import {
-  countActiveProducts,
+  activeProductsQuery,
   findActiveProducts,
-  findProductByIdWithSeller,
-  findProductImages,
-  findRecentQuestions,
-  findAnswersByQuestionIds,
-  findRelatedProducts,
+  findProductDetailBundle,
+  findProductDetailStamp,
   findPrimaryImagesForProducts,
   findProductBidsWithUsers,
   findProductStatusById,
   insertProduct,
   insertProductImages,
   findProductBySlug,
-  findProductByIdForUpdate
+  findProductByIdForUpdate,
+  claimExpiredAuctions
 } from '../repositories/product.repository.js';
 import { findCategoryById } from '../repositories/category.repository.js';
 import { insertBid, deleteBidsByUser, findTopBids, countBidsByProduct } from '../repositories/bid.repository.js';
@@ -25,22 +23,43 @@ import {
 import { findUserById } from '../repositories/user.repository.js';
 import { ApiError } from '../utils/response.js';
 import { getExtendSettings, getHighlightNewMinutes } from './setting.service.js';
-import { aggregateRating } from '../utils/rating.js';
+import { ratingFromUser } from '../utils/rating.js';
 import { maskBidderName } from '../utils/bid.js';
-import { recalcAutoBid } from './autoBid.service.js';
+import {
+  recalcAutoBid,
+  trackAutoBidUpsert,
+  trackAutoBidRemoval,
+  dropAutoBidLadder
+} from './autoBid.service.js';
 import { addToBidBlacklist } from '../repositories/bidBlacklist.repository.js';
-import { isProductWatchlisted } from './watchlist.service.js';
 import { ensureOrderForProduct } from './order.service.js';
-import {
-  sendBidNotification,
-  sendBidderReceipt,
-  sendOutbidNotification,
-  sendBidRejectedNotification,
-  sendDescriptionUpdateNotification
-} from './mail.service.js';
+import { enqueueMails } from './mailOutbox.service.js';
+import { AuctionEvents, emitAfterCommit, emitProductChanged } from '../utils/auctionEvents.js';
+import { decodeCursor, encodeCursor } from '../utils/cursor.js';
+import { countResults, resolveCountMode } from './count.service.js';
 import { findWatchlistedProductIds } from '../repositories/watchlist.repository.js';
-import { findOrderByProduct } from '../repositories/order.repository.js';
-import { sendAuctionResultNotification } from './mail.service.js';
+import { createOrdersForEndedProducts } from '../repositories/order.repository.js';
+import { createCounter } from '../utils/metrics.js';
+
+const bidCounter = createCounter({
+  name: 'auction_bids_total',
+  help: 'Manual and auto-bid placements by outcome (reason = error code)',
+  labelNames: ['kind', 'outcome', 'reason']
+});
+const autoBidTriggerCounter = createCounter({
+  name: 'auction_auto_bid_triggers_total',
+  help: 'Committed auto-bid rounds by what caused them',
+  labelNames: ['source']
+});
+const finalizerBatchCounter = createCounter({
+  name: 'auction_finalizer_batches_total',
+  help: 'Finalizer batches that closed at least one auction'
+});
+const finalizedAuctionCounter = createCounter({
+  name: 'auction_finalized_total',
+  help: 'Auctions closed by the finalizer',
+  labelNames: ['winner']
+});
 
 const SORT_FIELDS = {
   'end_at': 'end_at',
@@ -58,6 +77,8 @@ const RELATED_LIMIT = 5;
 const BID_HISTORY_DEFAULT_LIMIT = 20;
 const BID_HISTORY_MAX_LIMIT = 50;
 const PRODUCT_SLUG_MAX_ATTEMPTS = 5;
+const FINALIZE_BATCH_SIZE = Number(process.env.FINALIZE_BATCH_SIZE || 200);
+const FINALIZE_MAX_BATCHES = Number(process.env.FINALIZE_MAX_BATCHES || 50);
 const MIN_BIDDER_RATING_PERCENT = Number(process.env.MIN_BIDDER_RATING_PERCENT || 80);
 
 const normalizeSort = (sortRaw) => {
@@ -212,7 +233,7 @@ const ensureBidderEligibility = async (userId, sellerId, options = {}) => {
     throw new ApiError(403, 'BIDDER.SELF_BID', 'Sellers cannot bid on their own products');
   }
 
-  const rating = await aggregateRating(userId);
+  const rating = ratingFromUser(user);
   const totalRatings = Number(rating?.positive || 0) + Number(rating?.negative || 0);
   if (totalRatings === 0 && !allowUnrated) {
     throw new ApiError(
@@ -277,9 +298,31 @@ const collectOutbidIds = (candidateIds = [], finalBidderId = null) => {
   return Array.from(unique.values());
 };
 
-export const listProducts = async ({ page, limit, sort, categoryId }, viewerId = null) => {
+// One outbid mail per user and product is sent per coalesce window; a later
+// outbid before it goes out just updates the amount.
+const outbidMails = (userIds, product, amount) =>
+  userIds.map((id) => ({
+    kind: 'outbid',
+    userId: id,
+    data: { productName: product.name, amount, productId: product.id },
+    coalesceKey: `outbid:${id}:${product.id}`
+  }));
+
+/**
+ * Lists active products. Without `cursor` this is the classic page/offset
+ * listing with a total; with `cursor` (the `nextCursor` of a previous page)
+ * rows are read by keyset, so deep pages cost the same as the first one.
+ * The total comes from the count service; meta.countMode reports whether it
+ * is exact, a planner estimate, or skipped ("none").
+ */
+export const listProducts = async (
+  { page, limit, sort, categoryId, cursor, includeTotal, countMode },
+  viewerId = null
+) => {
   const { field, direction } = normalizeSort(sort);
+  const sortKey = `${field},${direction}`;
   const pagination = normalizePagination({ page, limit });
+  const after = decodeCursor(cursor, sortKey);
   const filters = {};
 
   if (categoryId) {
@@ -288,19 +331,26 @@ export const listProducts = async ({ page, limit, sort, categoryId }, viewerId =
 
   const highlightWindowMinutes = await getHighlightNewMinutes();
 
-  const [total, rows] = await Promise.all([
-    countActiveProducts(filters),
+  const [count, fetched] = await Promise.all([
+    countResults({
+      scope: 'products',
+      params: filters,
+      buildQuery: () => activeProductsQuery(filters),
+      mode: resolveCountMode({ countMode, includeTotal, cursor })
+    }),
     findActiveProducts(filters, {
-      limit: pagination.limit,
+      limit: pagination.limit + 1,
       offset: pagination.offset,
       sortField: field,
-      sortDirection: direction
+      sortDirection: direction,
+      after
     })
   ]);
 
+  const hasMore = fetched.length > pagination.limit;
+  const rows = hasMore ? fetched.slice(0, pagination.limit) : fetched;
   const imageMap = await findPrimaryImagesForProducts(rows.map((row) => row.id));
 
-  const totalPages = total === 0 ? 0 : Math.ceil(total / pagination.limit);
   const items = rows.map((row) =>
     mapProduct(row, {
       highlightWindowMinutes,
@@ -319,49 +369,94 @@ export const listProducts = async ({ page, limit, sort, categoryId }, viewerId =
   return {
     items,
     meta: {
-      page: pagination.page,
+      page: after ? null : pagination.page,
       limit: pagination.limit,
-      total,
-      totalPages,
+      total: count.total,
+      totalPages: count.total === null ? null : Math.ceil(count.total / pagination.limit),
+      countMode: count.mode,
+      hasMore,
+      nextCursor: hasMore ? encodeCursor(sortKey, rows[rows.length - 1]) : null,
       sort: { field, direction }
     }
   };
 };
 
+const DETAIL_CACHE_TTL_MS = Number(process.env.PRODUCT_DETAIL_CACHE_TTL_MS || 0);
+const DETAIL_CACHE_MAX_ENTRIES = Number(process.env.PRODUCT_DETAIL_CACHE_MAX_ENTRIES || 1000);
+const detailCache = new Map();
+
+// Optional cache of the viewer-independent bundle, keyed by product id and
+// validated against products.updated_at (bids, buy-now and edits bump it).
+// Questions and watchlist counts can lag by up to the TTL.
+const loadDetailBundle = async (productId, viewerId) => {
+  const options = { viewerId, questionsLimit: QUESTIONS_LIMIT, relatedLimit: RELATED_LIMIT };
+  if (!(DETAIL_CACHE_TTL_MS > 0)) {
+    return findProductDetailBundle(productId, options);
+  }
+
+  const key = String(productId);
+  const cached = detailCache.get(key);
+  if (cached && cached.expiresAt > Date.now()) {
+    const stamp = await findProductDetailStamp(productId, viewerId);
+    if (stamp && new Date(stamp.updated_at).getTime() === cached.updatedAt) {
+      return { ...cached.bundle, viewer_watchlisted: stamp.viewer_watchlisted };
+    }
+  }
+
+  const bundle = await findProductDetailBundle(productId, options);
+  detailCache.delete(key);
+  if (bundle) {
+    if (detailCache.size >= DETAIL_CACHE_MAX_ENTRIES) {
+      detailCache.delete(detailCache.keys().next().value);
+    }
+    detailCache.set(key, {
+      bundle,
+      updatedAt: new Date(bundle.updated_at).getTime(),
+      expiresAt: Date.now() + DETAIL_CACHE_TTL_MS
+    });
+  }
+  return bundle;
+};
+
+const toDate = (value) => (value ? new Date(value) : value);
+
+// json_agg returns timestamps as strings; keep the Date shape the pg driver gives.
+const reviveProductDates = (row) => ({
+  ...row,
+  start_at: toDate(row.start_at),
+  end_at: toDate(row.end_at),
+  created_at: toDate(row.created_at),
+  updated_at: toDate(row.updated_at),
+  highlight_until: toDate(row.highlight_until)
+});
+
 export const getProductDetail = async (productId, viewer = null) => {
-  const productRow = await findProductByIdWithSeller(productId);
+  const viewerId = viewer?.id ?? null;
+  const [productRow, highlightWindowMinutes] = await Promise.all([
+    loadDetailBundle(productId, viewerId),
+    getHighlightNewMinutes()
+  ]);
   if (!productRow || productRow.status === 'REMOVED') {
     throw new ApiError(404, 'PRODUCTS.NOT_FOUND', 'Product not found');
   }
-  const viewerId = viewer?.id ?? null;
   const sellerId = productRow.seller_id;
 
-  const highlightWindowMinutes = await getHighlightNewMinutes();
-
-  const [imagesRows, questionsRows, relatedRows, descriptionHistoryRows] = await Promise.all([
-    findProductImages(productRow.id),
-    findRecentQuestions(productRow.id, QUESTIONS_LIMIT),
-    findRelatedProducts(productRow.category_id, productRow.id, RELATED_LIMIT),
-    db('product_description_history').where({ product_id: productRow.id }).orderBy('created_at', 'asc')
-  ]);
+  const imagesRows = productRow.images;
+  const questionsRows = productRow.questions;
+  const relatedRows = productRow.related.map(reviveProductDates);
+  const descriptionHistoryRows = productRow.description_history;
+  const orderRow = productRow.order_summary;
 
-  const answersRows = await findAnswersByQuestionIds(questionsRows.map((question) => question.id));
-  const answersByQuestion = new Map();
-  answersRows.forEach((answer) => {
-    if (!answersByQuestion.has(answer.question_id)) {
-      answersByQuestion.set(answer.question_id, answer);
-    }
+  const sellerRating = ratingFromUser({
+    positive_score: productRow.seller_positive_score,
+    negative_score: productRow.seller_negative_score
   });
-
-  const relatedImageMap = await findPrimaryImagesForProducts(relatedRows.map((row) => row.id));
-
-  const [sellerRating, keeperRating, watchlisted, watchlistCount, orderRow] = await Promise.all([
-    aggregateRating(productRow.seller_id),
-    productRow.current_bidder_id ? aggregateRating(productRow.current_bidder_id) : Promise.resolve(null),
-    isProductWatchlisted(viewerId, productRow.id),
-    db('watchlist').where({ product_id: productRow.id }).count({ count: '*' }).first(),
-    findOrderByProduct(productRow.id)
-  ]);
+  const keeperRating = productRow.current_bidder_id
+    ? ratingFromUser({
+        positive_score: productRow.current_bidder_positive_score,
+        negative_score: productRow.current_bidder_negative_score
+      })
+    : null;
 
   const firstImageUrl = imagesRows[0]?.image_url ?? null;
   const product = mapProduct(productRow, { highlightWindowMinutes, primaryImageUrl: firstImageUrl });
@@ -372,7 +467,16 @@ export const getProductDetail = async (productId, viewer = null) => {
   }));
 
   const questions = questionsRows.map((question) => {
-    const answer = answersByQuestion.get(question.id);
+    const answer = question.answer_id
+      ? {
+          id: question.answer_id,
+          answer_text: question.answer_text,
+          created_at: toDate(question.answer_created_at),
+          responder_id: question.responder_id,
+          responder_name: question.responder_name,
+          responder_email: question.responder_email
+        }
+      : null;
     const askerIdentity = question.asker_id
       ? {
           id: question.asker_id,
@@ -390,7 +494,7 @@ export const getProductDetail = async (productId, viewer = null) => {
     return {
       id: question.id,
       questionText: question.question_text,
-      createdAt: question.created_at,
+      createdAt: toDate(question.created_at),
       asker: askerIdentity
         ? {
             id: askerIdentity.id,
@@ -417,7 +521,7 @@ export const getProductDetail = async (productId, viewer = null) => {
   const relatedProducts = relatedRows.map((row) =>
     mapProduct(row, {
       highlightWindowMinutes,
-      primaryImageUrl: relatedImageMap.get(row.id) || null
+      primaryImageUrl: row.primary_image_url || null
     })
   );
 
@@ -470,13 +574,13 @@ export const getProductDetail = async (productId, viewer = null) => {
       return {
         id: row.id,
         content: row.content_added,
-        createdAt: row.created_at,
+        createdAt,
         label: formatAppendLabel(createdAt)
       };
     }),
     watchlist: {
-      isWatchlisted: Boolean(watchlisted),
-      count: Number(watchlistCount?.count || 0)
+      isWatchlisted: Boolean(productRow.viewer_watchlisted),
+      count: Number(productRow.watchlist_count || 0)
     },
     permissions: {
       canAppendDescription: Boolean(viewerIsSeller || viewerIsAdmin),
@@ -487,70 +591,68 @@ export const getProductDetail = async (productId, viewer = null) => {
   };
 };
 
-export const finalizeEndedAuctions = async () => {
-  const expired = await db('products as p')
-    .select(
-      'p.id',
-      'p.seller_id',
-      'p.current_bidder_id',
-      'p.current_price',
-      'p.enable_auto_bid',
-      'p.auto_extend',
-      'p.end_at',
-      'p.name'
-    )
-    .where('p.status', 'ACTIVE')
-    .andWhere('p.end_at', '<=', db.fn.now());
+const buildAuctionResultMails = (endedRows, createdOrders) => {
+  const orderedProductIds = new Set(createdOrders.map((order) => String(order.product_id)));
+  const messages = [];
 
+  endedRows.forEach((row) => {
+    const productName = row.name || `Product #${row.id}`;
+    if (!row.current_bidder_id) {
+      messages.push({ userId: row.seller_id, productName, outcome: 'ended without a winner' });
+      return;
+    }
+    // orders that already existed were announced when they were created
+    if (!orderedProductIds.has(String(row.id))) return;
+    messages.push({ userId: row.seller_id, productName, outcome: 'ended with a winning bidder' });
+    messages.push({
+      userId: row.current_bidder_id,
+      productName,
+      outcome: 'has been awarded to you. Please complete payment promptly.'
+    });
+  });
+
+  return messages.map(({ userId, productName, outcome }) => ({
+    kind: 'auctionResult',
+    userId,
+    data: { productName, outcome }
+  }));
+};
+
+export const finalizeEndedAuctions = async ({
+  batchSize = FINALIZE_BATCH_SIZE,
+  maxBatches = FINALIZE_MAX_BATCHES
+} = {}) => {
   let processed = 0;
   let withoutWinner = 0;
+  const productIds = [];
+
+  for (let batch = 0; batch < maxBatches; batch += 1) {
+    const { ended } = await db.transaction(async (trx) => {
+      const endedRows = await claimExpiredAuctions(batchSize, trx);
+      const wonIds = endedRows.filter((row) => row.current_bidder_id).map((row) => row.id);
+      const createdOrders = await createOrdersForEndedProducts(wonIds, trx);
+      await enqueueMails(trx, buildAuctionResultMails(endedRows, createdOrders));
+      return { ended: endedRows };
+    });
 
-  for (const product of expired) {
-    await db.transaction(async (trx) => {
-      const hasWinner = Boolean(product.current_bidder_id);
-      const [updated] = await trx('products')
-        .where({ id: product.id })
-        .update(
-          {
-            status: 'ENDED',
-            enable_auto_bid: false,
-            end_at: trx.fn.now(),
-            updated_at: trx.fn.now()
-          },
-          ['id', 'seller_id', 'current_bidder_id', 'current_price', 'name']
-        );
-
-      if (hasWinner) {
-        await ensureOrderForProduct(
-          {
-            productId: product.id,
-            sellerId: updated.seller_id,
-            winnerId: updated.current_bidder_id,
-            finalPrice: Number(product.current_price),
-            productName: updated.name
-          },
-          trx
-        );
-      } else {
-        try {
-          const seller = await findUserById(product.seller_id);
-          if (seller?.email) {
-            await sendAuctionResultNotification({
-              email: seller.email,
-              productName: product.name,
-              outcome: 'ended without a winner'
-            });
-          }
-        } catch (err) {
-          console.warn('[mail] no-winner notification skipped', err.message);
-        }
-        withoutWinner += 1;
-      }
-      processed += 1;
+    if (!ended.length) break;
+
+    ended.forEach((row) => {
+      dropAutoBidLadder(row.id);
+      emitProductChanged(null, { ...row, status: 'ENDED' });
+      productIds.push(row.id);
     });
+    const batchWithoutWinner = ended.filter((row) => !row.current_bidder_id).length;
+    processed += ended.length;
+    withoutWinner += batchWithoutWinner;
+    finalizerBatchCounter.inc();
+    finalizedAuctionCounter.inc({ winner: 'yes' }, ended.length - batchWithoutWinner);
+    finalizedAuctionCounter.inc({ winner: 'no' }, batchWithoutWinner);
+
+    if (ended.length < batchSize) break;
   }
 
-  return { processed, withoutWinner };
+  return { processed, withoutWinner, productIds };
 };
 
 export const getProductBidHistory = async (
@@ -662,6 +764,11 @@ export const createProductListing = async ({
     }));
 
     await insertProductImages(imageRecords, trx);
+    emitAfterCommit(trx, AuctionEvents.END_CHANGED, {
+      productId: productRow.id,
+      endAt: productRow.end_at
+    });
+    emitProductChanged(trx, productRow, { created: true });
 
     return {
       product: productRow,
@@ -681,7 +788,24 @@ export const createProductListing = async ({
   };
 };
 
-export const placeManualBid = async ({ productId, userId, amount }) => {
+// Counts the bid once its transaction settled; rejections by error code.
+const countBid = async (kind, work) => {
+  try {
+    const result = await work();
+    bidCounter.inc({ kind, outcome: 'accepted', reason: '' });
+    if (result.autoBidTriggered) autoBidTriggerCounter.inc({ source: kind });
+    return result;
+  } catch (err) {
+    bidCounter.inc({ kind, outcome: 'rejected', reason: err instanceof ApiError ? err.code : 'ERROR' });
+    throw err;
+  }
+};
+
+export const placeManualBid = (args) => countBid('manual', () => applyManualBid(args));
+
+export const registerAutoBid = (args) => countBid('auto', () => applyAutoBid(args));
+
+const applyManualBid = async ({ productId, userId, amount }) => {
   const bidAmount = parseBidAmount(
     amount,
     'BIDS.INVALID_AMOUNT',
@@ -743,12 +867,18 @@ export const placeManualBid = async ({ productId, userId, amount }) => {
       .where({ id: productId })
       .update(updatePayload, ['id', 'current_price', 'current_bidder_id', 'bid_count', 'end_at', 'status']);
 
+    if (extendedEndAt) {
+      emitAfterCommit(trx, AuctionEvents.END_CHANGED, { productId, endAt: updatedRow.end_at });
+    }
+    emitProductChanged(trx, updatedRow);
+
     let summary = summarizeProduct(updatedRow, product);
     let autoBidTriggered = false;
 
     if (product.enable_auto_bid) {
       const autoBidResult = await recalcAutoBid(productId, trx, {
-        product: { ...product, ...updatedRow }
+        product: { ...product, ...updatedRow },
+        extendSettings
       });
 
       if (autoBidResult?.triggered) {
@@ -757,46 +887,22 @@ export const placeManualBid = async ({ productId, userId, amount }) => {
       }
     }
 
-    try {
-      const finalBidderId = summary.currentBidderId;
-      const finalPrice = summary.currentPrice;
-      const [seller, bidder] = await Promise.all([
-        findUserById(product.seller_id),
-        findUserById(userId)
-      ]);
-      if (seller?.email) {
-        await sendBidNotification({
-          email: seller.email,
-          productName: product.name,
-          amount: finalPrice
-        });
-      }
-      if (bidder?.email && String(userId) === String(finalBidderId)) {
-        await sendBidderReceipt({
-          email: bidder.email,
-          productName: product.name,
-          amount: bidAmount
-        });
-      }
-      const outbidIds = collectOutbidIds([previousBidderId, userId], finalBidderId);
-      if (outbidIds.length) {
-        const outbidUsers = await Promise.all(outbidIds.map((id) => findUserById(id)));
-        await Promise.all(
-          outbidUsers
-            .filter((user) => user?.email)
-            .map((user) =>
-              sendOutbidNotification({
-                email: user.email,
-                productName: product.name,
-                amount: finalPrice,
-                productId: product.id
-              })
-            )
-        );
-      }
-    } catch (err) {
-      console.warn('[mail] bid notification skipped', err.message);
-    }
+    const finalBidderId = summary.currentBidderId;
+    const finalPrice = summary.currentPrice;
+    await enqueueMails(trx, [
+      {
+        kind: 'bidReceived',
+        userId: product.seller_id,
+        data: { productName: product.name, amount: finalPrice, productId: product.id },
+        coalesceKey: `bid-received:${product.seller_id}:${productId}`
+      },
+      String(userId) === String(finalBidderId) && {
+        kind: 'bidReceipt',
+        userId,
+        data: { productName: product.name, amount: bidAmount }
+      },
+      ...outbidMails(collectOutbidIds([previousBidderId, userId], finalBidderId), product, finalPrice)
+    ]);
 
     return {
       product: summary,
@@ -806,12 +912,13 @@ export const placeManualBid = async ({ productId, userId, amount }) => {
   });
 };
 
-export const registerAutoBid = async ({ productId, userId, maxBidAmount }) => {
+const applyAutoBid = async ({ productId, userId, maxBidAmount }) => {
   const parsedAmount = parseBidAmount(
     maxBidAmount,
     'AUTO_BID.INVALID_AMOUNT',
     'Max auto-bid must be a positive integer'
   );
+  const extendSettings = await getExtendSettings();
 
   return db.transaction(async (trx) => {
     const product = await findProductByIdForUpdate(productId, trx);
@@ -842,39 +949,27 @@ export const registerAutoBid = async ({ productId, userId, maxBidAmount }) => {
 
     ensureStepCompliance(parsedAmount, startPrice, priceStep);
 
-    const [autoBidRow] = await upsertAutoBid(
+    const { autoBid: autoBidRow, version } = await upsertAutoBid(
       { productId, userId, maxBidAmount: parsedAmount },
       trx
     );
+    trackAutoBidUpsert(productId, autoBidRow, version, trx);
 
     let summary = summarizeProduct(product);
-    const autoBidResult = await recalcAutoBid(productId, trx, { product });
+    const autoBidResult = await recalcAutoBid(productId, trx, {
+      product: { ...product, auto_bid_version: version },
+      extendSettings
+    });
     if (autoBidResult?.product) {
       summary = summarizeProduct(autoBidResult.product, product);
     }
 
     if (autoBidResult?.triggered) {
       const finalBidderId = summary.currentBidderId;
-      const outbidIds = collectOutbidIds([product.current_bidder_id], finalBidderId);
-      if (outbidIds.length) {
-        try {
-          const outbidUsers = await Promise.all(outbidIds.map((id) => findUserById(id)));
-          await Promise.all(
-            outbidUsers
-              .filter((user) => user?.email)
-              .map((user) =>
-                sendOutbidNotification({
-                  email: user.email,
-                  productName: product.name,
-                  amount: summary.currentPrice,
-                  productId: product.id
-                })
-              )
-          );
-        } catch (err) {
-          console.warn('[mail] outbid notification skipped', err.message);
-        }
-      }
+      await enqueueMails(
+        trx,
+        outbidMails(collectOutbidIds([product.current_bidder_id], finalBidderId), product, summary.currentPrice)
+      );
     }
 
     return {
@@ -910,6 +1005,7 @@ export const buyNowProduct = async ({ productId, userId }) => {
     );
 
     await deleteAutoBidsByProductId(productId, trx);
+    dropAutoBidLadder(productId, trx);
 
     const [updatedRow] = await trx('products')
       .where({ id: productId })
@@ -925,6 +1021,7 @@ export const buyNowProduct = async ({ productId, userId }) => {
         },
         ['id', 'current_price', 'current_bidder_id', 'bid_count', 'end_at', 'status']
       );
+    emitProductChanged(trx, updatedRow);
 
     await ensureOrderForProduct(
       {
@@ -973,47 +1070,27 @@ export const appendProductDescription = async ({ productId, sellerId, content, v
         updated_at: trx.fn.now()
       });
 
+    const [bidderIds, autoBidderIds] = await Promise.all([
+      trx('bids').where({ product_id: productId }).distinct().pluck('user_id'),
+      trx('auto_bids').where({ product_id: productId }).distinct().pluck('user_id')
+    ]);
+    const recipients = new Set([...bidderIds, ...autoBidderIds].filter(Boolean).map(String));
+    await enqueueMails(
+      trx,
+      [...recipients].map((id) => ({
+        kind: 'descriptionUpdated',
+        userId: id,
+        data: { productName: product.name || 'product', productId: product.id },
+        coalesceKey: `description:${id}:${productId}`
+      }))
+    );
+
     return {
       label: formattedLabel,
-      content: trimmed,
-      productName: product.name,
-      productId: product.id
+      content: trimmed
     };
   });
 
-  Promise.resolve().then(async () => {
-    try {
-      const [bidderEmails, autoBidEmails] = await Promise.all([
-        db('bids as b')
-          .leftJoin('users as u', 'u.id', 'b.user_id')
-          .where('b.product_id', productId)
-          .distinct()
-          .pluck('u.email'),
-        db('auto_bids as ab')
-          .leftJoin('users as u', 'u.id', 'ab.user_id')
-          .where('ab.product_id', productId)
-          .distinct()
-          .pluck('u.email')
-      ]);
-
-      const recipients = new Set();
-      bidderEmails.filter(Boolean).forEach((email) => recipients.add(email));
-      autoBidEmails.filter(Boolean).forEach((email) => recipients.add(email));
-
-      await Promise.all(
-        Array.from(recipients).map((email) =>
-          sendDescriptionUpdateNotification({
-            email,
-            productName: result.productName || 'product',
-            productId: result.productId
-          })
-        )
-      );
-    } catch (err) {
-      console.warn('[mail] description update notification skipped', err.message);
-    }
-  });
-
   return {
     label: result.label,
     content: result.content
@@ -1021,7 +1098,9 @@ export const appendProductDescription = async ({ productId, sellerId, content, v
 };
 
 export const rejectBidder = async ({ productId, sellerId, bidderId, reason, viewerRole }) => {
-  return db.transaction(async (trx) => {
+  const extendSettings = await getExtendSettings();
+
+  const result = await db.transaction(async (trx) => {
     const product = await findProductByIdForUpdate(productId, trx);
     if (!product) {
       throw new ApiError(404, 'PRODUCTS.NOT_FOUND', 'Product not found');
@@ -1032,7 +1111,8 @@ export const rejectBidder = async ({ productId, sellerId, bidderId, reason, view
 
     await addToBidBlacklist(productId, bidderId, reason || null, trx);
     await deleteBidsByUser(productId, bidderId, trx);
-    await deleteAutoBidByUser(productId, bidderId, trx);
+    const autoBidVersion = await deleteAutoBidByUser(productId, bidderId, trx);
+    trackAutoBidRemoval(productId, bidderId, autoBidVersion, trx);
 
     const [topBid] = await findTopBids(productId, 1, trx);
     const bidCountRow = await countBidsByProduct(productId, trx);
@@ -1062,25 +1142,23 @@ export const rejectBidder = async ({ productId, sellerId, bidderId, reason, view
         },
         ['id', 'current_price', 'current_bidder_id', 'bid_count', 'end_at', 'status']
       );
+    emitProductChanged(trx, updated);
 
-    const autoBidResult = await recalcAutoBid(productId, trx, { product: { ...product, ...updated } });
+    const autoBidResult = await recalcAutoBid(productId, trx, {
+      product: { ...product, ...updated, auto_bid_version: autoBidVersion },
+      extendSettings
+    });
 
-    try {
-      const rejectedUser = await findUserById(bidderId);
-      if (rejectedUser?.email) {
-        await sendBidRejectedNotification({
-          email: rejectedUser.email,
-          productName: product.name,
-          reason
-        });
-      }
-    } catch (err) {
-      console.warn('[mail] reject notification skipped', err.message);
-    }
+    await enqueueMails(trx, [
+      { kind: 'bidRejected', userId: bidderId, data: { productName: product.name, reason } }
+    ]);
 
     return {
       product: summarizeProduct(autoBidResult?.product || updated, product),
       autoBidTriggered: Boolean(autoBidResult?.triggered)
     };
   });
+
+  if (result.autoBidTriggered) autoBidTriggerCounter.inc({ source: 'reject' });
+  return result;
 };
@@ -0,0 +1,156 @@
+import { findProductsByIds } from '../repositories/product.repository.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+import { ApiError } from '../utils/response.js';
+
+const MAX_CONNECTIONS = Number(process.env.PRODUCT_STREAM_MAX_CONNECTIONS || 2000);
+// Below common proxy idle timeouts (60s) so idle streams stay open.
+const HEARTBEAT_MS = Number(process.env.PRODUCT_STREAM_HEARTBEAT_MS || 25000);
+const CLIENT_RETRY_MS = 5000;
+
+const subscribers = new Map();
+const counters = { opened: 0, rejected: 0, events: 0, writes: 0 };
+let connections = 0;
+let eventSeq = 0;
+let heartbeat = null;
+
+const write = (res, chunk) => {
+  if (res.writableEnded) return;
+  res.write(chunk);
+  counters.writes += 1;
+};
+
+const formatEvent = (event, data) => {
+  eventSeq += 1;
+  return `id: ${eventSeq}\nevent: ${event}\ndata: ${JSON.stringify(data)}\n\n`;
+};
+
+const toDelta = (change) => {
+  const delta = { productId: Number(change.productId) };
+  if (change.currentPrice !== null) delta.currentPrice = change.currentPrice;
+  if (change.bidCount !== null) delta.bidCount = change.bidCount;
+  if (change.endAt) delta.endAt = change.endAt;
+  if (change.status) delta.status = change.status;
+  if (change.currentBidderId !== undefined) delta.currentBidderId = change.currentBidderId;
+  return delta;
+};
+
+// One timer for every open stream instead of one per connection.
+const startHeartbeat = () => {
+  if (heartbeat || !(HEARTBEAT_MS > 0)) return;
+  heartbeat = setInterval(() => {
+    subscribers.forEach((set) => set.forEach((res) => write(res, ': ping\n\n')));
+  }, HEARTBEAT_MS);
+  heartbeat.unref();
+};
+
+const stopHeartbeatIfIdle = () => {
+  if (connections === 0 && heartbeat) {
+    clearInterval(heartbeat);
+    heartbeat = null;
+  }
+};
+
+const snapshotDelta = (row) =>
+  toDelta({
+    productId: row.id,
+    currentPrice: Number(row.current_price),
+    bidCount: Number(row.bid_count),
+    endAt: row.end_at,
+    status: row.status,
+    currentBidderId: row.current_bidder_id === null ? null : Number(row.current_bidder_id)
+  });
+
+const publish = (change) => {
+  const set = subscribers.get(String(change.productId));
+  if (!set?.size) return;
+  const chunk = formatEvent('product', change);
+  counters.events += 1;
+  set.forEach((res) => write(res, chunk));
+};
+
+auctionEvents.on(AuctionEvents.PRODUCT_CHANGED, (change) => publish(toDelta(change)));
+
+// Deltas may have been missed: send every watched product's current state.
+auctionEvents.on(AuctionEvents.RESYNC, async () => {
+  const ids = [...subscribers.keys()];
+  if (!ids.length) return;
+  try {
+    const rows = await findProductsByIds(ids);
+    rows.forEach((row) => publish(snapshotDelta(row)));
+  } catch (err) {
+    console.error('[product-stream] resync failed', err.message);
+  }
+});
+
+/**
+ * Turns `res` into an SSE stream of bid/price/end-time deltas for one
+ * product, starting with a snapshot so reconnecting clients resync.
+ * Throws 404 for unknown products and 503 once the node holds
+ * PRODUCT_STREAM_MAX_CONNECTIONS streams.
+ */
+export const openProductStream = async (productId, req, res) => {
+  if (connections >= MAX_CONNECTIONS) {
+    counters.rejected += 1;
+    const error = new ApiError(503, 'STREAM.CAPACITY', 'Live updates are at capacity, please retry shortly');
+    error.retryAfter = Math.ceil(CLIENT_RETRY_MS / 1000);
+    throw error;
+  }
+
+  // reserve the slot before the lookup so concurrent opens respect the cap
+  connections += 1;
+  let released = false;
+  const key = String(productId);
+  const release = () => {
+    if (released) return;
+    released = true;
+    const set = subscribers.get(key);
+    if (set?.delete(res) && !set.size) subscribers.delete(key);
+    connections -= 1;
+    stopHeartbeatIfIdle();
+  };
+
+  let row;
+  try {
+    [row] = await findProductsByIds([productId]);
+  } catch (err) {
+    release();
+    throw err;
+  }
+  if (!row) {
+    release();
+    throw new ApiError(404, 'PRODUCTS.NOT_FOUND', 'Product not found');
+  }
+  if (req.destroyed) {
+    release();
+    return;
+  }
+
+  res.status(200).set({
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache, no-transform',
+    Connection: 'keep-alive',
+    'X-Accel-Buffering': 'no'
+  });
+  res.flushHeaders();
+
+  if (!subscribers.has(key)) subscribers.set(key, new Set());
+  subscribers.get(key).add(res);
+  counters.opened += 1;
+  req.on('close', release);
+  startHeartbeat();
+
+  write(res, `retry: ${CLIENT_RETRY_MS}\n\n`);
+  write(res, formatEvent('product', snapshotDelta(row)));
+};
+
+// Ends every open stream so the HTTP server can close during shutdown.
+export const closeProductStreams = () => {
+  subscribers.forEach((set) => set.forEach((res) => res.end()));
+};
+
+export const getProductStreamStats = () => ({
+  connections,
+  products: subscribers.size,
+  maxConnections: MAX_CONNECTIONS,
+  ...counters
+});
@@ -1,7 +1,7 @@
 import db from '../db/knex.js';
 import { findUserByEmail, findUserById, updateUser } from '../repositories/user.repository.js';
 import { ApiError } from '../utils/response.js';
-import { aggregateRating } from '../utils/rating.js';
+import { ratingFromUser } from '../utils/rating.js';
 import { getLatestSellerRequest } from './seller.service.js';
 import { findWatchlistByUser } from '../repositories/watchlist.repository.js';
 import { findRatingsReceivedByUser } from '../repositories/rating.repository.js';
@@ -17,6 +17,7 @@ const mapUserProfile = (row) => ({
   positiveScore: Number(row.positive_score || 0),
   negativeScore: Number(row.negative_score || 0),
   dateOfBirth: row.date_of_birth,
+  notificationMode: row.notification_mode,
   createdAt: row.created_at,
   updatedAt: row.updated_at
 });
@@ -53,8 +54,8 @@ export const getProfile = async (userId) => {
     .where({ user_id: userId })
     .then((rows) => rows.map((row) => row.product_id));
 
-  const [rating, sellerRequest, watchlistRows, activeRows, wonRows, sellerActiveRows, sellerEndedRows, ratingRows] = await Promise.all([
-    aggregateRating(userId),
+  const rating = ratingFromUser(user);
+  const [sellerRequest, watchlistRows, activeRows, wonRows, sellerActiveRows, sellerEndedRows, ratingRows] = await Promise.all([
     getLatestSellerRequest(userId),
     findWatchlistByUser(userId),
     activeBidProductIds.length
@@ -136,7 +137,8 @@ export const updateProfile = async (userId, payload) => {
     phone_number: payload.phoneNumber ?? user.phone_number,
     address: payload.address ?? user.address,
     date_of_birth: payload.dateOfBirth ?? user.date_of_birth,
-    email: payload.email ?? user.email
+    email: payload.email ?? user.email,
+    notification_mode: payload.notificationMode ?? user.notification_mode
   };
 
   const [updated] = await updateUser(userId, updateData);
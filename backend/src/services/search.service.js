@@ -1,67 +1,270 @@
-import { searchProducts, searchCategories } from '../repositories/search.repository.js';
-import { findPrimaryImagesForProducts } from '../repositories/product.repository.js';
+import {
+  searchProducts,
+  searchProductsQuery,
+  searchCategories,
+  normalizeSearchSort,
+  sanitizeTerm,
+  searchFacets,
+  PRICE_FACET_BOUNDS,
+  ENDING_FACET_WINDOWS
+} from '../repositories/search.repository.js';
+import { findPrimaryImagesForProducts, findProductsByIds } from '../repositories/product.repository.js';
 import { getHighlightNewMinutes } from './setting.service.js';
 import { mapProduct } from './product.service.js';
+import { CURSOR_VALUE_COLUMN, decodeCursor, encodeCursor } from '../utils/cursor.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+import { createLruCache } from '../utils/lruCache.js';
+import { CountModes, countResults, resolveCountMode } from './count.service.js';
+
+const MB = 1024 * 1024;
+const RESULT_CACHE_TTL_MS = Number(process.env.SEARCH_RESULT_CACHE_TTL_MS || 30000);
+const RESULT_CACHE_MAX_MB = Number(process.env.SEARCH_RESULT_CACHE_MAX_MB || 8);
+const PRODUCT_CACHE_TTL_MS = Number(process.env.SEARCH_PRODUCT_CACHE_TTL_MS || 60000);
+const PRODUCT_CACHE_MAX_MB = Number(process.env.SEARCH_PRODUCT_CACHE_MAX_MB || 16);
+const MAX_TRACKED_CHANGES = 10000;
+
+// Filters on columns that bids move; their cached counts drop on every bid.
+const BID_SENSITIVE_FILTERS = ['priceMin', 'priceMax', 'bidMin', 'bidMax', 'endAtFrom', 'endAtTo'];
+
+// Result pages hold only ids; cards are hydrated from the per-product cache,
+// so a bid refreshes one product instead of every page that lists it.
+const resultCache = createLruCache({ maxBytes: RESULT_CACHE_MAX_MB * MB, ttlMs: RESULT_CACHE_TTL_MS });
+const productCache = createLruCache({ maxBytes: PRODUCT_CACHE_MAX_MB * MB, ttlMs: PRODUCT_CACHE_TTL_MS });
+
+// Change bookkeeping so rows read before a change are never cached after it.
+let changeSeq = 0;
+let floorSeq = 0;
+const lastChange = new Map();
+const generations = { all: 0, volatile: 0 };
+
+const onProductChanged = (change) => {
+  changeSeq += 1;
+  const productId = String(change.productId);
+  productCache.delete(productId);
+  lastChange.delete(productId);
+  lastChange.set(productId, changeSeq);
+  if (lastChange.size > MAX_TRACKED_CHANGES) {
+    lastChange.clear();
+    floorSeq = changeSeq;
+  }
+
+  // New listings can match any term. Products leaving ACTIVE are dropped at
+  // hydration time, so closing auctions does not flush the page cache.
+  if (change.created) {
+    generations.all += 1;
+    resultCache.clear();
+    return;
+  }
+  generations.volatile += 1;
+  resultCache.deleteWhere((page) => page.volatile);
+};
+
+auctionEvents.on(AuctionEvents.PRODUCT_CHANGED, onProductChanged);
+auctionEvents.on(AuctionEvents.RESYNC, () => {
+  changeSeq += 1;
+  floorSeq = changeSeq;
+  lastChange.clear();
+  generations.all += 1;
+  generations.volatile += 1;
+  resultCache.clear();
+  productCache.clear();
+});
+
+const unchangedSince = (productId, seq) => seq >= floorSeq && !((lastChange.get(String(productId)) ?? 0) > seq);
+
+const filterKey = (filters) => {
+  const { term, categoryId, ...rest } = filters;
+  const filterTuple = Object.keys(rest)
+    .filter((name) => rest[name] !== undefined && rest[name] !== null)
+    .sort()
+    .map((name) => [name, rest[name] instanceof Date ? rest[name].toISOString() : rest[name]]);
+  return [sanitizeTerm(term).toLowerCase(), categoryId ?? null, filterTuple];
+};
+
+const resultKey = ({ filters, sortKey, limit, offset, after }) =>
+  JSON.stringify([
+    ...filterKey(filters),
+    sortKey,
+    limit ?? null,
+    after ? [after.value, after.id] : offset ?? 0
+  ]);
+
+const cacheProductRow = (row, primaryImageUrl, seq) => {
+  if (!unchangedSince(row.id, seq)) return;
+  const { [CURSOR_VALUE_COLUMN]: _cursorValue, ...productRow } = row;
+  productCache.set(String(row.id), { row: productRow, primaryImageUrl });
+};
+
+const hydrateProducts = async (ids) => {
+  const entries = new Map();
+  const missing = [];
+  ids.forEach((id) => {
+    const entry = productCache.get(String(id));
+    if (entry) {
+      entries.set(String(id), entry);
+    } else {
+      missing.push(id);
+    }
+  });
+
+  if (missing.length) {
+    const seq = changeSeq;
+    const [rows, imageMap] = await Promise.all([
+      findProductsByIds(missing),
+      findPrimaryImagesForProducts(missing)
+    ]);
+    rows.forEach((row) => {
+      const primaryImageUrl = imageMap.get(row.id) || null;
+      entries.set(String(row.id), { row, primaryImageUrl });
+      cacheProductRow(row, primaryImageUrl, seq);
+    });
+  }
+
+  return ids.map((id) => entries.get(String(id))).filter((entry) => entry?.row.status === 'ACTIVE');
+};
+
+const loadResultPage = async ({ filters, sort, sortKey, limit, offset, after, volatile }) => {
+  const key = resultKey({ filters, sortKey, limit, offset, after });
+  const cached = resultCache.get(key);
+  if (cached) {
+    return { entries: await hydrateProducts(cached.ids), hasMore: cached.hasMore, nextCursor: cached.nextCursor };
+  }
+
+  const seq = changeSeq;
+  const generation = { ...generations };
+  const { rows, hasMore } = await searchProducts({ limit, offset, sort, after, ...filters });
+  const imageMap = await findPrimaryImagesForProducts(rows.map((row) => row.id));
+  const nextCursor = hasMore ? encodeCursor(sortKey, rows[rows.length - 1]) : null;
+
+  rows.forEach((row) => cacheProductRow(row, imageMap.get(row.id) || null, seq));
+  if (generation.all === generations.all && (!volatile || generation.volatile === generations.volatile)) {
+    resultCache.set(key, { ids: rows.map((row) => row.id), hasMore, nextCursor, volatile });
+  }
+
+  return {
+    entries: rows.map((row) => ({ row, primaryImageUrl: imageMap.get(row.id) || null })),
+    hasMore,
+    nextCursor
+  };
+};
+
+const buildFacets = (rows) => {
+  const categories = new Map();
+  const ensureCategory = (id, name) => {
+    const key = String(id);
+    if (!categories.has(key)) {
+      categories.set(key, { id, name, count: 0, children: [] });
+    }
+    return categories.get(key);
+  };
+  const prices = new Map();
+  const endings = new Map();
+
+  rows.forEach((row) => {
+    if (row.category_id !== null) {
+      if (row.parent_id === null) {
+        ensureCategory(row.category_id, row.category_name).count += row.count;
+        return;
+      }
+      const parent = ensureCategory(row.parent_id, row.parent_name);
+      parent.count += row.count;
+      parent.children.push({ id: row.category_id, name: row.category_name, count: row.count });
+    } else if (row.price_bucket !== null) {
+      prices.set(Number(row.price_bucket), row.count);
+    } else if (row.ending_window !== null) {
+      endings.set(row.ending_window, row.count);
+    }
+  });
+
+  const byCount = (a, b) => b.count - a.count;
+  return {
+    categories: [...categories.values()]
+      .map((category) => ({ ...category, children: category.children.sort(byCount) }))
+      .sort(byCount),
+    price: [0, ...PRICE_FACET_BOUNDS].map((min, index) => ({
+      min,
+      max: PRICE_FACET_BOUNDS[index] ?? null,
+      count: prices.get(index) || 0
+    })),
+    ending: ENDING_FACET_WINDOWS.map((window) => ({ window, count: endings.get(window) || 0 }))
+  };
+};
+
+// Facets share the result cache (and its invalidation) with the pages of
+// the same query; they do not depend on sort or page position.
+const loadFacets = async ({ filters, volatile }) => {
+  const key = JSON.stringify(['facets', ...filterKey(filters)]);
+  const cached = resultCache.get(key);
+  if (cached) return cached.facets;
+
+  const generation = { ...generations };
+  const facets = buildFacets(await searchFacets(filters));
+  if (generation.all === generations.all && (!volatile || generation.volatile === generations.volatile)) {
+    resultCache.set(key, { facets, volatile });
+  }
+  return facets;
+};
 
 export const searchActiveProducts = async ({
-  term,
   limit,
   offset,
-  categoryId,
   sort,
-  priceMin,
-  priceMax,
-  priceLogic,
-  bidMin,
-  bidMax,
-  bidLogic,
-  allowUnrated,
-  allowUnratedLogic,
-  startAtFrom,
-  startAtTo,
-  startAtLogic,
-  endAtFrom,
-  endAtTo,
-  endAtLogic
+  cursor,
+  includeTotal,
+  countMode,
+  facets: withFacets = false,
+  ...filters
 }) => {
-  const { rows, total } = await searchProducts({
-    term,
-    limit,
-    offset,
-    categoryId,
-    sort,
-    priceMin,
-    priceMax,
-    priceLogic,
-    bidMin,
-    bidMax,
-    bidLogic,
-    allowUnrated,
-    allowUnratedLogic,
-    startAtFrom,
-    startAtTo,
-    startAtLogic,
-    endAtFrom,
-    endAtTo,
-    endAtLogic
-  });
-  if (!rows.length) {
-    return { items: [], total };
+  if (!searchProductsQuery(filters)) {
+    return { items: [], total: 0, countMode: CountModes.EXACT, hasMore: false, nextCursor: null, facets: null };
   }
 
-  const highlightWindowMinutes = await getHighlightNewMinutes();
-  const imageMap = await findPrimaryImagesForProducts(rows.map((row) => row.id));
+  const sortKey = normalizeSearchSort(sort).key;
+  const after = decodeCursor(cursor, sortKey);
+  const volatile = BID_SENSITIVE_FILTERS.some((name) => filters[name] !== undefined);
+  const [count, page, facets] = await Promise.all([
+    countResults({
+      scope: 'search',
+      params: filters,
+      buildQuery: () => searchProductsQuery(filters),
+      mode: resolveCountMode({ countMode, includeTotal, cursor }),
+      volatile
+    }),
+    loadResultPage({ filters, sort, sortKey, limit, offset, after, volatile }),
+    withFacets ? loadFacets({ filters, volatile }) : null
+  ]);
+
+  if (!page.entries.length) {
+    return {
+      items: [],
+      total: count.total,
+      countMode: count.mode,
+      hasMore: page.hasMore,
+      nextCursor: page.nextCursor,
+      facets
+    };
+  }
 
-  const items = rows.map((row) =>
-    mapProduct(row, {
-      highlightWindowMinutes,
-      primaryImageUrl: imageMap.get(row.id) || null
-    })
+  const highlightWindowMinutes = await getHighlightNewMinutes();
+  const items = page.entries.map(({ row, primaryImageUrl }) =>
+    mapProduct(row, { highlightWindowMinutes, primaryImageUrl })
   );
 
-  return { items, total };
+  return {
+    items,
+    total: count.total,
+    countMode: count.mode,
+    hasMore: page.hasMore,
+    nextCursor: page.nextCursor,
+    facets
+  };
 };
 
+export const getSearchCacheStats = () => ({
+  results: resultCache.stats(),
+  products: productCache.stats()
+});
+
 export const searchCategoriesByName = async ({ term, limit }) => {
   const rows = await searchCategories({ term, limit });
   return rows.map((row) => ({
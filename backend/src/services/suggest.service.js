@@ -0,0 +1,188 @@
+import {
+  findSuggestionProducts,
+  findSuggestionProductsByIds,
+  findSuggestionCategories,
+  findSimilarProductNames
+} from '../repositories/search.repository.js';
+import { AuctionEvents, auctionEvents } from '../utils/auctionEvents.js';
+import { createPrefixTrie, tokenize } from '../utils/prefixTrie.js';
+
+const SUGGEST_MAX_PRODUCTS = Number(process.env.SUGGEST_MAX_PRODUCTS || 200000);
+const TOP_PER_NODE = 16;
+const MAX_CATEGORY_SUGGESTIONS = 3;
+const ADD_BATCH_DELAY_MS = 250;
+
+let index = null;
+let building = null;
+// changes seen while a rebuild runs, replayed onto the new index
+let changesDuringBuild = null;
+const pendingAdds = new Set();
+let addTimer = null;
+
+const createIndex = () => ({
+  products: createPrefixTrie({ topPerNode: TOP_PER_NODE }),
+  categories: createPrefixTrie({ topPerNode: TOP_PER_NODE }),
+  productEntries: new Map(),
+  categoryEntries: new Map(),
+  removed: 0,
+  builtAt: 0
+});
+
+const addProduct = (target, row) => {
+  const id = String(row.id);
+  const tokens = tokenize(row.name);
+  target.productEntries.set(id, { id: row.id, name: row.name, slug: row.slug, tokens });
+  tokens.forEach((token) => target.products.insert(token, { id, score: Number(row.bid_count) || 0 }));
+};
+
+// Removed products stay in the trie until the next rebuild and are
+// filtered out on lookup through productEntries.
+const removeProduct = (target, productId) => {
+  if (target.productEntries.delete(String(productId))) {
+    target.removed += 1;
+  }
+};
+
+const flushPendingAdds = async () => {
+  addTimer = null;
+  const ids = [...pendingAdds];
+  pendingAdds.clear();
+  if (!ids.length) return;
+  try {
+    const rows = await findSuggestionProductsByIds(ids);
+    rows
+      .filter((row) => row.status === 'ACTIVE')
+      .forEach((row) => {
+        if (index) addProduct(index, row);
+        changesDuringBuild?.push(['add', row]);
+      });
+  } catch (err) {
+    console.error('[suggest] failed to index new products', err.message);
+  }
+};
+
+const onProductChanged = (change) => {
+  if (change.created) {
+    pendingAdds.add(change.productId);
+    if (!addTimer) addTimer = setTimeout(flushPendingAdds, ADD_BATCH_DELAY_MS);
+    return;
+  }
+  if (change.status !== null && change.status !== 'ACTIVE') {
+    if (index) removeProduct(index, change.productId);
+    changesDuringBuild?.push(['remove', change.productId]);
+  }
+};
+
+auctionEvents.on(AuctionEvents.PRODUCT_CHANGED, onProductChanged);
+auctionEvents.on(AuctionEvents.RESYNC, () => {
+  if (!index) return;
+  rebuildSuggestIndex().catch((err) => console.error('[suggest] resync rebuild failed', err.message));
+});
+
+const buildIndex = async () => {
+  changesDuringBuild = [];
+  try {
+    const [products, categories] = await Promise.all([
+      findSuggestionProducts(SUGGEST_MAX_PRODUCTS),
+      findSuggestionCategories()
+    ]);
+    const next = createIndex();
+    products.forEach((row) => addProduct(next, row));
+    categories.forEach((row) => {
+      const id = String(row.id);
+      const tokens = tokenize(row.name);
+      next.categoryEntries.set(id, { id: row.id, name: row.name, parentId: row.parent_id, tokens });
+      // top-level categories first when names tie
+      tokens.forEach((token) => next.categories.insert(token, { id, score: row.parent_id ? 0 : 1 }));
+    });
+    changesDuringBuild.forEach(([kind, payload]) =>
+      kind === 'add' ? addProduct(next, payload) : removeProduct(next, payload)
+    );
+    next.builtAt = Date.now();
+    index = next;
+    return index;
+  } finally {
+    changesDuringBuild = null;
+  }
+};
+
+/**
+ * (Re)builds the suggestion index; concurrent callers share one build.
+ */
+export const rebuildSuggestIndex = () => {
+  if (!building) {
+    building = buildIndex().finally(() => {
+      building = null;
+    });
+  }
+  return building;
+};
+
+export const getSuggestIndexStats = () => ({
+  ready: Boolean(index),
+  products: index?.productEntries.size ?? 0,
+  categories: index?.categoryEntries.size ?? 0,
+  removedSinceBuild: index?.removed ?? 0,
+  productNodes: index?.products.stats().nodes ?? 0,
+  builtAt: index?.builtAt ? new Date(index.builtAt).toISOString() : null
+});
+
+const allowedDistance = (prefix) => {
+  if (prefix.length >= 6) return 2;
+  if (prefix.length >= 3) return 1;
+  return 0;
+};
+
+/**
+ * Ranked completions for a partially typed query. The last token is
+ * completed as a prefix (with 1-2 typos allowed once it is 3+ characters);
+ * earlier tokens must start a word of the name. Until the index is built,
+ * and when it has no product match, falls back to trigram similarity.
+ */
+export const suggest = async (term, { limit = 8 } = {}) => {
+  const tokens = tokenize(term);
+  if (!tokens.length) return [];
+  if (!index) {
+    rebuildSuggestIndex().catch((err) => console.error('[suggest] index build failed', err.message));
+  }
+
+  const prefix = tokens[tokens.length - 1];
+  const required = tokens.slice(0, -1);
+  const maxDistance = allowedDistance(prefix);
+  const matchesRequired = (entry) =>
+    required.every((token) => entry.tokens.some((word) => word.startsWith(token)));
+
+  const pick = (trie, entries, count) =>
+    trie
+      .lookup(prefix, { maxDistance, limit: count })
+      .map((hit) => ({ hit, entry: entries.get(hit.id) }))
+      .filter(({ entry }) => entry && matchesRequired(entry))
+      .slice(0, count);
+
+  const categories = index ? pick(index.categories, index.categoryEntries, MAX_CATEGORY_SUGGESTIONS) : [];
+  let products = index
+    ? pick(index.products, index.productEntries, limit).map(({ hit, entry }) => ({
+      type: 'product',
+      id: entry.id,
+      label: entry.name,
+      slug: entry.slug,
+      distance: hit.distance
+    }))
+    : [];
+
+  if (!products.length && term.trim().length >= 3) {
+    const rows = await findSimilarProductNames(term, limit);
+    products = rows.map((row) => ({ type: 'product', id: row.id, label: row.name, slug: row.slug, distance: null }));
+  }
+
+  return [
+    ...categories.map(({ hit, entry }) => ({
+      type: 'category',
+      id: entry.id,
+      label: entry.name,
+      parentId: entry.parentId,
+      distance: hit.distance
+    })),
+    ...products
+  ].slice(0, limit);
+};
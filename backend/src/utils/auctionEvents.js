@@ -0,0 +1,66 @@
+import { EventEmitter } from 'node:events';
+
+export const AuctionEvents = {
+  END_CHANGED: 'auction:end-changed',
+  PRODUCT_CHANGED: 'product:changed',
+  USER_CHANGED: 'user:changed',
+  AUTO_BIDS_CHANGED: 'auto-bids:changed',
+  MAIL_QUEUED: 'mail:queued',
+  // The cross-node bus may have missed events: drop or reload derived state.
+  RESYNC: 'events:resync'
+};
+
+export const auctionEvents = new EventEmitter();
+auctionEvents.setMaxListeners(50);
+
+// Emits right away; a failing listener is logged instead of thrown.
+export const emitEvent = (event, payload) => {
+  try {
+    auctionEvents.emit(event, payload);
+  } catch (err) {
+    console.warn(`[events] ${event} listener failed`, err.message);
+  }
+};
+
+/**
+ * Emits `event` once `trx` commits, or right away outside a transaction.
+ * Nothing is emitted when the transaction rolls back.
+ */
+export const emitAfterCommit = (trx, event, payload) => {
+  if (!trx?.isTransaction) {
+    emitEvent(event, payload);
+    return;
+  }
+  trx.executionPromise.then(
+    () => emitEvent(event, payload),
+    () => {}
+  );
+};
+
+const toNumberOrNull = (value) => (value === undefined || value === null ? null : Number(value));
+
+/**
+ * Publishes the listing-relevant fields of a products row after commit.
+ * Fields missing from `row` are sent as null so listeners can treat them
+ * as unknown. Pass `created` for newly listed products.
+ */
+export const emitProductChanged = (trx, row, { created = false } = {}) => {
+  if (!row?.id) return;
+  emitAfterCommit(trx, AuctionEvents.PRODUCT_CHANGED, {
+    productId: row.id,
+    currentPrice: toNumberOrNull(row.current_price),
+    bidCount: toNumberOrNull(row.bid_count),
+    endAt: row.end_at ?? null,
+    status: row.status ?? null,
+    // undefined (not null) when unknown, since null means "no bidder"
+    currentBidderId: 'current_bidder_id' in row ? toNumberOrNull(row.current_bidder_id) : undefined,
+    created
+  });
+};
+
+// Published after any write to a users row that can change who the user is
+// to the auth layer (role, status, credentials).
+export const emitUserChanged = (trx, userId) => {
+  if (!userId) return;
+  emitAfterCommit(trx, AuctionEvents.USER_CHANGED, { userId: Number(userId) });
+};
@@ -0,0 +1,49 @@
+import { ApiError } from './response.js';
+
+// Column alias used by keyset queries to return the sort value as text, so
+// timestamps keep their microseconds when they round-trip through a cursor.
+export const CURSOR_VALUE_COLUMN = 'cursor_value';
+
+/**
+ * Encodes the position after `row` as an opaque cursor. The sort is part of
+ * the payload so a cursor cannot be replayed against a different ordering.
+ */
+export const encodeCursor = (sort, row) => {
+  if (!row) return null;
+  const payload = { s: sort, v: row[CURSOR_VALUE_COLUMN], id: String(row.id) };
+  return Buffer.from(JSON.stringify(payload)).toString('base64url');
+};
+
+export const decodeCursor = (cursor, sort) => {
+  if (!cursor) return null;
+  let payload;
+  try {
+    payload = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+  } catch {
+    payload = null;
+  }
+  if (
+    !payload ||
+    typeof payload.v !== 'string' ||
+    !/^\d+$/.test(String(payload.id)) ||
+    payload.s !== sort
+  ) {
+    throw new ApiError(400, 'PAGINATION.INVALID_CURSOR', 'Cursor is invalid or does not match the sort');
+  }
+  return { value: payload.v, id: payload.id };
+};
+
+/**
+ * Restricts `query` to rows after `after` in (column, idColumn) order and
+ * orders by the same pair. Both columns must be NOT NULL.
+ */
+export const applyKeyset = (query, { column, idColumn, direction, after }) => {
+  const dir = direction === 'desc' ? 'desc' : 'asc';
+  if (after) {
+    query.whereRaw(`(??, ??) ${dir === 'desc' ? '<' : '>'} (?, ?)`, [column, idColumn, after.value, after.id]);
+  }
+  return query
+    .select(query.client.raw('??::text as ??', [column, CURSOR_VALUE_COLUMN]))
+    .orderBy(column, dir)
+    .orderBy(idColumn, dir);
+};
@@ -1,3 +1,6 @@
 export * from './bid.js';
 export * from './response.js';
-export * from './rating.js';
\ No newline at end of file
+export * from './rating.js';
+export * from './auctionEvents.js';
+export * from './cursor.js';
+export * from './lruCache.js';
@@ -0,0 +1,65 @@
+const approximateSize = (key, value) =>
+  Buffer.byteLength(String(key)) + Buffer.byteLength(JSON.stringify(value) ?? '');
+
+/**
+ * Map-backed LRU bounded by an approximate byte budget (JSON size of the
+ * values), with an optional TTL. Keeps hit/miss/eviction counters.
+ */
+export const createLruCache = ({ maxBytes, ttlMs = 0, sizeOf = approximateSize }) => {
+  const entries = new Map();
+  const counters = { hits: 0, misses: 0, evictions: 0, expirations: 0 };
+  let bytes = 0;
+
+  const remove = (key) => {
+    const entry = entries.get(key);
+    if (!entry) return false;
+    entries.delete(key);
+    bytes -= entry.size;
+    return true;
+  };
+
+  return {
+    get(key) {
+      const entry = entries.get(key);
+      if (!entry) {
+        counters.misses += 1;
+        return undefined;
+      }
+      if (entry.expiresAt && entry.expiresAt <= Date.now()) {
+        remove(key);
+        counters.expirations += 1;
+        counters.misses += 1;
+        return undefined;
+      }
+      // re-insert to mark as most recently used
+      entries.delete(key);
+      entries.set(key, entry);
+      counters.hits += 1;
+      return entry.value;
+    },
+    set(key, value) {
+      remove(key);
+      const size = sizeOf(key, value);
+      if (!(maxBytes > 0) || size > maxBytes) return;
+      while (bytes + size > maxBytes && entries.size) {
+        remove(entries.keys().next().value);
+        counters.evictions += 1;
+      }
+      entries.set(key, { value, size, expiresAt: ttlMs > 0 ? Date.now() + ttlMs : 0 });
+      bytes += size;
+    },
+    delete: remove,
+    deleteWhere(predicate) {
+      [...entries.entries()]
+        .filter(([key, entry]) => predicate(entry.value, key))
+        .forEach(([key]) => remove(key));
+    },
+    clear() {
+      entries.clear();
+      bytes = 0;
+    },
+    stats() {
+      return { ...counters, entries: entries.size, bytes, maxBytes };
+    }
+  };
+};
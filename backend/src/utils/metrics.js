@@ -0,0 +1,140 @@
+// Minimal Prometheus registry: labelled counters and histograms kept in
+// memory per process, plus collectors that produce gauges at scrape time.
+// Rendered in the text exposition format by renderMetrics().
+
+const DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const metrics = new Map();
+const collectors = [];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+
+const formatLabels = (labels) => {
+  const pairs = Object.entries(labels).filter(([, value]) => value !== undefined && value !== null);
+  if (!pairs.length) return '';
+  return `{${pairs.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}`;
+};
+
+const seriesKey = (labelNames, labels) => labelNames.map((name) => labels[name] ?? '').join('\u0001');
+
+const pickLabels = (labelNames, labels) =>
+  Object.fromEntries(labelNames.map((name) => [name, labels[name] ?? '']));
+
+const register = (name, metric) => {
+  if (metrics.has(name)) {
+    throw new Error(`Metric ${name} is already registered`);
+  }
+  metrics.set(name, metric);
+  return metric;
+};
+
+export const createCounter = ({ name, help, labelNames = [] }) => {
+  const series = new Map();
+  return register(name, {
+    inc(labels = {}, value = 1) {
+      const key = seriesKey(labelNames, labels);
+      const entry = series.get(key);
+      if (entry) {
+        entry.value += value;
+      } else {
+        series.set(key, { labels: pickLabels(labelNames, labels), value });
+      }
+    },
+    render() {
+      const lines = [`# HELP ${name} ${help}`, `# TYPE ${name} counter`];
+      series.forEach(({ labels, value }) => lines.push(`${name}${formatLabels(labels)} ${value}`));
+      return lines;
+    }
+  });
+};
+
+export const createHistogram = ({ name, help, labelNames = [], buckets = DEFAULT_BUCKETS }) => {
+  const series = new Map();
+  return register(name, {
+    // `value` is in seconds, like every Prometheus duration
+    observe(labels, value) {
+      const key = seriesKey(labelNames, labels);
+      let entry = series.get(key);
+      if (!entry) {
+        entry = { labels: pickLabels(labelNames, labels), counts: new Array(buckets.length).fill(0), sum: 0, count: 0 };
+        series.set(key, entry);
+      }
+      const index = buckets.findIndex((bound) => value <= bound);
+      if (index !== -1) entry.counts[index] += 1;
+      entry.sum += value;
+      entry.count += 1;
+    },
+    startTimer(labels = {}) {
+      const started = process.hrtime.bigint();
+      return (extraLabels = {}) =>
+        this.observe({ ...labels, ...extraLabels }, Number(process.hrtime.bigint() - started) / 1e9);
+    },
+    render() {
+      const lines = [`# HELP ${name} ${help}`, `# TYPE ${name} histogram`];
+      series.forEach(({ labels, counts, sum, count }) => {
+        let cumulative = 0;
+        buckets.forEach((bound, index) => {
+          cumulative += counts[index];
+          lines.push(`${name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+        });
+        lines.push(`${name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`);
+        lines.push(`${name}_sum${formatLabels(labels)} ${sum}`);
+        lines.push(`${name}_count${formatLabels(labels)} ${count}`);
+      });
+      return lines;
+    }
+  });
+};
+
+/**
+ * Registers a callback run on every scrape. It returns gauge samples as
+ * `{ name, help, value, labels? }`; samples sharing a name are grouped.
+ */
+export const registerCollector = (collect) => {
+  collectors.push(collect);
+};
+
+const toSnakeCase = (value) => value.replace(/([a-z0-9])([A-Z])/g, '$1_$2').replace(/\W+/g, '_').toLowerCase();
+
+/**
+ * Gauges for every numeric (or boolean) field of a `get*Stats()` object,
+ * named `<prefix>_<field>`; nested objects add their key to the name.
+ */
+export const statsToGauges = (prefix, stats, help) => {
+  const samples = [];
+  const walk = (path, value) => {
+    if (typeof value === 'number' && Number.isFinite(value)) {
+      samples.push({ name: `${prefix}_${path}`, help, value });
+    } else if (typeof value === 'boolean') {
+      samples.push({ name: `${prefix}_${path}`, help, value: value ? 1 : 0 });
+    } else if (value && typeof value === 'object' && !Array.isArray(value)) {
+      Object.entries(value).forEach(([key, child]) => walk(path ? `${path}_${toSnakeCase(key)}` : toSnakeCase(key), child));
+    }
+  };
+  walk('', stats);
+  return samples;
+};
+
+export const renderMetrics = async () => {
+  const lines = [];
+  metrics.forEach((metric) => lines.push(...metric.render()));
+
+  const gauges = new Map();
+  const results = await Promise.allSettled(collectors.map((collect) => collect()));
+  results.forEach((result) => {
+    if (result.status === 'rejected') {
+      console.warn('[metrics] collector failed', result.reason?.message);
+      return;
+    }
+    (result.value || []).forEach((sample) => {
+      if (!gauges.has(sample.name)) gauges.set(sample.name, { help: sample.help, samples: [] });
+      gauges.get(sample.name).samples.push(sample);
+    });
+  });
+  gauges.forEach(({ help, samples }, name) => {
+    lines.push(`# HELP ${name} ${help || name}`, `# TYPE ${name} gauge`);
+    samples.forEach((sample) => lines.push(`${name}${formatLabels(sample.labels || {})} ${sample.value}`));
+  });
+
+  return `${lines.join('\n')}\n`;
+};
@@ -0,0 +1,120 @@
+// Folds Vietnamese (and other Latin) diacritics so "dien thoai" finds "điện thoại".
+export const foldText = (value = '') =>
+  value
+    .toString()
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .replace(/đ/g, 'd')
+    .replace(/Đ/g, 'D')
+    .toLowerCase();
+
+export const tokenize = (value = '') => foldText(value).split(/[^\p{L}\p{N}]+/u).filter(Boolean);
+
+const createNode = () => ({ children: new Map(), top: [] });
+
+/**
+ * Character trie where every node keeps the `topPerNode` best-scored
+ * entries below it, so a prefix lookup costs O(prefix length) no matter how
+ * many names share the prefix. Entries are `{ id, score }`; removal is left
+ * to the caller (filter on lookup, rebuild periodically).
+ */
+export const createPrefixTrie = ({ topPerNode = 16, maxDepth = 24 } = {}) => {
+  const root = createNode();
+  let nodes = 1;
+
+  const offer = (node, entry) => {
+    const { top } = node;
+    const existing = top.findIndex((item) => item.id === entry.id);
+    if (existing !== -1) {
+      if (top[existing].score >= entry.score) return;
+      top.splice(existing, 1);
+    }
+    if (top.length >= topPerNode && top[top.length - 1].score >= entry.score) return;
+    let index = top.length;
+    while (index > 0 && top[index - 1].score < entry.score) index -= 1;
+    top.splice(index, 0, entry);
+    if (top.length > topPerNode) top.pop();
+  };
+
+  const insert = (token, entry) => {
+    let node = root;
+    const chars = [...token].slice(0, maxDepth);
+    for (const char of chars) {
+      let child = node.children.get(char);
+      if (!child) {
+        child = createNode();
+        node.children.set(char, child);
+        nodes += 1;
+      }
+      node = child;
+      offer(node, entry);
+    }
+  };
+
+  const findExact = (prefix) => {
+    let node = root;
+    for (const char of [...prefix].slice(0, maxDepth)) {
+      node = node.children.get(char);
+      if (!node) return null;
+    }
+    return node;
+  };
+
+  // Levenshtein walk: collects nodes whose path is within `maxDistance`
+  // edits of `prefix`, pruning branches once every cell exceeds it.
+  const findFuzzy = (prefix, maxDistance) => {
+    const chars = [...prefix].slice(0, maxDepth);
+    const matches = [];
+    const firstRow = chars.map((_, index) => index + 1);
+    firstRow.unshift(0);
+
+    const walk = (node, char, previousRow, depth) => {
+      const row = [previousRow[0] + 1];
+      let rowMin = row[0];
+      for (let col = 1; col <= chars.length; col += 1) {
+        const cost = chars[col - 1] === char ? 0 : 1;
+        const value = Math.min(row[col - 1] + 1, previousRow[col] + 1, previousRow[col - 1] + cost);
+        row.push(value);
+        if (value < rowMin) rowMin = value;
+      }
+      const distance = row[chars.length];
+      if (distance <= maxDistance) {
+        matches.push({ node, distance });
+        return;
+      }
+      if (rowMin > maxDistance || depth >= chars.length + maxDistance) return;
+      node.children.forEach((child, nextChar) => walk(child, nextChar, row, depth + 1));
+    };
+
+    root.children.forEach((child, char) => walk(child, char, firstRow, 1));
+    return matches;
+  };
+
+  return {
+    insert,
+    /**
+     * Best entries for `prefix`: exact-prefix matches first, then (when
+     * `maxDistance` > 0 and there is room) near misses, each tagged with
+     * the edit distance of its prefix.
+     */
+    lookup(prefix, { maxDistance = 0, limit = topPerNode } = {}) {
+      const seen = new Map();
+      const exact = findExact(prefix);
+      exact?.top.forEach((entry) => seen.set(entry.id, { ...entry, distance: 0 }));
+      if (maxDistance > 0 && seen.size < limit) {
+        findFuzzy(prefix, maxDistance).forEach(({ node, distance }) => {
+          node.top.forEach((entry) => {
+            const current = seen.get(entry.id);
+            if (!current || current.distance > distance) {
+              seen.set(entry.id, { ...entry, distance });
+            }
+          });
+        });
+      }
+      return [...seen.values()].sort((a, b) => a.distance - b.distance || b.score - a.score);
+    },
+    stats() {
+      return { nodes };
+    }
+  };
+};
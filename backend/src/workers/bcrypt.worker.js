@@ -0,0 +1,17 @@
+import { parentPort } from 'node:worker_threads';
+import { performance } from 'node:perf_hooks';
+import bcrypt from 'bcrypt';
+
+// Runs on its own thread, so the sync calls keep bcrypt off libuv's shared
+// threadpool (file I/O, DNS, crypto used by the request path).
+parentPort.on('message', ({ id, op, password, hash, rounds }) => {
+  const startedAt = performance.now();
+  try {
+    const result = op === 'compare'
+      ? bcrypt.compareSync(password, hash)
+      : bcrypt.hashSync(password, rounds);
+    parentPort.postMessage({ id, result, runMs: performance.now() - startedAt });
+  } catch (err) {
+    parentPort.postMessage({ id, error: err.message, runMs: performance.now() - startedAt });
+  }
+});
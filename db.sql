@@ -54,6 +54,8 @@ CREATE TABLE IF NOT EXISTS users (
   negative_score INTEGER NOT NULL DEFAULT 0,
   status user_status_enum NOT NULL,
   date_of_birth DATE,
+  notification_mode VARCHAR(16) NOT NULL DEFAULT 'IMMEDIATE'
+    CHECK (notification_mode IN ('IMMEDIATE', 'DIGEST')),
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
@@ -94,6 +96,7 @@ CREATE TABLE IF NOT EXISTS products (
   allow_unrated_bidders BOOLEAN NOT NULL DEFAULT FALSE,
   current_bidder_id BIGINT REFERENCES users(id) ON DELETE SET NULL,
   bid_count INTEGER NOT NULL DEFAULT 0,
+  auto_bid_version INTEGER NOT NULL DEFAULT 0,
   highlight_until TIMESTAMPTZ,
   status product_status_enum NOT NULL,
   start_at TIMESTAMPTZ NOT NULL,
@@ -303,6 +306,7 @@ CREATE TABLE IF NOT EXISTS refresh_tokens (
   expires_at TIMESTAMPTZ NOT NULL,
   revoked_at TIMESTAMPTZ,
   rotated_from INTEGER,
+  family_id UUID,
   user_agent VARCHAR(255),
   ip_address VARCHAR(255),
   created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
@@ -310,24 +314,42 @@ CREATE TABLE IF NOT EXISTS refresh_tokens (
 );
 CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user_id ON refresh_tokens (user_id);
 CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens (expires_at);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family_id ON refresh_tokens (family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_revoked_at
+  ON refresh_tokens (revoked_at)
+  WHERE revoked_at IS NOT NULL;
+
+-- Search vector trigger (accent-insensitive, name weighted above description)
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'vn_unaccent') THEN
+    CREATE TEXT SEARCH CONFIGURATION vn_unaccent (COPY = simple);
+    ALTER TEXT SEARCH CONFIGURATION vn_unaccent
+      ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+  END IF;
+END
+$$;
 
--- Search vector trigger
 CREATE OR REPLACE FUNCTION products_search_vector_trigger()
 RETURNS trigger AS $$
 begin
   new.search_vector :=
-    to_tsvector('simple', coalesce(new.name, '') || ' ' || coalesce(new.description, ''));
+    setweight(to_tsvector('vn_unaccent', coalesce(new.name, '')), 'A') ||
+    setweight(to_tsvector('vn_unaccent', coalesce(new.description, '')), 'B');
   return new;
 end
 $$ LANGUAGE plpgsql;
 
 DROP TRIGGER IF EXISTS trg_products_search_vector ON products;
 CREATE TRIGGER trg_products_search_vector
-BEFORE INSERT OR UPDATE ON products
+BEFORE INSERT OR UPDATE OF name, description ON products
 FOR EACH ROW EXECUTE FUNCTION products_search_vector_trigger();
 
 UPDATE products
-SET search_vector = to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))
+SET search_vector =
+  setweight(to_tsvector('vn_unaccent', coalesce(name, '')), 'A') ||
+  setweight(to_tsvector('vn_unaccent', coalesce(description, '')), 'B')
 WHERE search_vector IS NULL;
 
 CREATE INDEX IF NOT EXISTS idx_products_search_vector
@@ -348,3 +370,42 @@ CREATE INDEX IF NOT EXISTS idx_products_active_created_at
 CREATE INDEX IF NOT EXISTS idx_products_active_cat_end_at
   ON products (category_id, end_at)
   WHERE status = 'ACTIVE';
+
+-- Search suggestions / category search (trigram)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_products_active_name_trgm
+  ON products USING GIN (name gin_trgm_ops)
+  WHERE status = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS idx_categories_name_trgm
+  ON categories USING GIN (name gin_trgm_ops);
+
+-- Mail outbox (written in the same transaction as the change it reports)
+CREATE TABLE IF NOT EXISTS mail_outbox (
+  id BIGSERIAL PRIMARY KEY,
+  kind VARCHAR(40) NOT NULL,
+  user_id BIGINT REFERENCES users(id) ON DELETE CASCADE,
+  email VARCHAR(255),
+  payload JSONB NOT NULL DEFAULT '{}',
+  coalesce_key VARCHAR(255),
+  coalesced_count INTEGER NOT NULL DEFAULT 0,
+  status VARCHAR(16) NOT NULL DEFAULT 'PENDING'
+    CHECK (status IN ('PENDING', 'SENDING', 'SENT', 'FAILED')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  locked_at TIMESTAMPTZ,
+  sent_at TIMESTAMPTZ,
+  last_error TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_mail_outbox_due
+  ON mail_outbox (available_at)
+  WHERE status = 'PENDING';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mail_outbox_pending_key
+  ON mail_outbox (coalesce_key)
+  WHERE status = 'PENDING' AND coalesce_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_mail_outbox_delivered_key
+  ON mail_outbox (coalesce_key, locked_at DESC)
+  WHERE status IN ('SENDING', 'SENT') AND coalesce_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_mail_outbox_finished
+  ON mail_outbox (created_at)
+  WHERE status IN ('SENT', 'FAILED');
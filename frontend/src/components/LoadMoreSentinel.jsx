@@ -0,0 +1,34 @@
+import { useEffect, useRef } from 'react'
+
+// Calls onLoadMore when scrolled into view; the button covers browsers
+// without IntersectionObserver and users who stop short of the sentinel.
+export default function LoadMoreSentinel({ hasMore, loading, onLoadMore, label = 'Load more' }) {
+  const sentinelRef = useRef(null)
+  const callbackRef = useRef(onLoadMore)
+  callbackRef.current = onLoadMore
+
+  useEffect(() => {
+    const node = sentinelRef.current
+    if (!node || !hasMore || loading || typeof IntersectionObserver === 'undefined') return undefined
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          callbackRef.current()
+        }
+      },
+      { rootMargin: '400px 0px' }
+    )
+    observer.observe(node)
+    return () => observer.disconnect()
+  }, [hasMore, loading])
+
+  if (!hasMore) return null
+
+  return (
+    <div ref={sentinelRef} className="d-flex justify-content-center mt-4">
+      <button type="button" className="btn btn-outline-secondary" onClick={() => onLoadMore()} disabled={loading}>
+        {loading ? 'Loading...' : label}
+      </button>
+    </div>
+  )
+}
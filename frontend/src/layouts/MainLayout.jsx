@@ -1,7 +1,10 @@
-import { useEffect, useMemo, useState } from 'react'
+import { useEffect, useMemo, useRef, useState } from 'react'
 import { Link, NavLink, Outlet, useNavigate } from 'react-router-dom'
 import { useAuth } from '../contexts/AuthContext'
 import { fetchCategories } from '../services/categories'
+import { suggestSearch } from '../services/search'
+
+const SUGGEST_DEBOUNCE_MS = 150
 
 export default function MainLayout() {
   const navigate = useNavigate()
@@ -10,6 +13,9 @@ export default function MainLayout() {
   const [categoryError, setCategoryError] = useState(null)
   const [searchValue, setSearchValue] = useState('')
   const [searchError, setSearchError] = useState('')
+  const [suggestions, setSuggestions] = useState([])
+  const [showSuggestions, setShowSuggestions] = useState(false)
+  const suggestRequest = useRef(0)
 
   useEffect(() => {
     let isMounted = true
@@ -28,6 +34,35 @@ export default function MainLayout() {
     }
   }, [])
 
+  useEffect(() => {
+    const term = searchValue.trim()
+    const id = ++suggestRequest.current
+    if (term.length < 2) {
+      setSuggestions([])
+      return undefined
+    }
+    const timer = setTimeout(() => {
+      suggestSearch(term)
+        .then((response) => {
+          if (id === suggestRequest.current) setSuggestions(response?.data?.suggestions || [])
+        })
+        .catch(() => {
+          if (id === suggestRequest.current) setSuggestions([])
+        })
+    }, SUGGEST_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [searchValue])
+
+  const handleSuggestionSelect = (suggestion) => {
+    setShowSuggestions(false)
+    setSearchValue('')
+    if (suggestion.type === 'category') {
+      navigate(`/products?categoryId=${suggestion.id}`)
+    } else {
+      navigate(`/products/${suggestion.id}`)
+    }
+  }
+
   const handleLogout = () => {
     logout()
     navigate('/login')
@@ -45,6 +80,7 @@ export default function MainLayout() {
       return
     }
     setSearchError('')
+    setShowSuggestions(false)
     navigate(`/search?q=${encodeURIComponent(term)}`)
   }
 
@@ -182,7 +218,7 @@ export default function MainLayout() {
             <ul className="navbar-nav ms-auto align-items-lg-center gap-0.5">
               <li className="nav-item me-lg-3 mb-2 mb-lg-0">
                 <form className="d-flex gap-2" onSubmit={handleSearch} noValidate>
-                  <div>
+                  <div className="position-relative">
                     <div className="input-group">
                     <button type="submit" className="input-group-text bg-light border-end-0">
                       <svg xmlns="http://www.w3.org/2000/svg" width="16" height="16" fill="currentColor" className="bi bi-search text-muted" viewBox="0 0 16 16">
@@ -194,9 +230,34 @@ export default function MainLayout() {
                         className="form-control border-start-0 bg-light"
                         placeholder="Search items..."
                         value={searchValue}
-                        onChange={(event) => setSearchValue(event.target.value)}
+                        onChange={(event) => {
+                          setSearchValue(event.target.value)
+                          setShowSuggestions(true)
+                        }}
+                        onFocus={() => setShowSuggestions(true)}
+                        onBlur={() => setTimeout(() => setShowSuggestions(false), 150)}
+                        autoComplete="off"
                       />
                     </div>
+                    {showSuggestions && suggestions.length > 0 && (
+                      <ul className="list-group position-absolute w-100 shadow-sm mt-1" style={{ zIndex: 1050 }}>
+                        {suggestions.map((suggestion) => (
+                          <li key={`${suggestion.type}-${suggestion.id}`} className="list-group-item list-group-item-action p-0">
+                            <button
+                              type="button"
+                              className="btn btn-link text-start text-decoration-none text-dark w-100 px-3 py-2 small"
+                              onMouseDown={(event) => event.preventDefault()}
+                              onClick={() => handleSuggestionSelect(suggestion)}
+                            >
+                              {suggestion.type === 'category' && (
+                                <span className="badge bg-light text-secondary me-2">Category</span>
+                              )}
+                              {suggestion.label}
+                            </button>
+                          </li>
+                        ))}
+                      </ul>
+                    )}
                     {searchError && <div className="text-danger small mt-1">{searchError}</div>}
                   </div>
                 </form>
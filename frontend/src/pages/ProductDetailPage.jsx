@@ -5,6 +5,7 @@ import 'react-quill/dist/quill.snow.css'
 import {
   fetchProductBids,
   fetchProductDetail,
+  subscribeProductUpdates,
   placeManualBid,
   registerAutoBid,
   buyNowProduct,
@@ -140,6 +141,37 @@ export default function ProductDetailPage() {
     }
   }, [productId])
 
+  const liveProductRef = useRef(null)
+  liveProductRef.current = detail?.product || null
+
+  useEffect(() => {
+    let bidsTimer = null
+    const unsubscribe = subscribeProductUpdates(productId, (delta) => {
+      const current = liveProductRef.current
+      if (!current) return
+      const patch = {}
+      ;['currentPrice', 'bidCount', 'endAt', 'status', 'currentBidderId'].forEach((field) => {
+        if (delta[field] !== undefined && delta[field] !== current[field]) {
+          patch[field] = delta[field]
+        }
+      })
+      if (!Object.keys(patch).length) return
+      setDetail((previous) =>
+        previous?.product ? { ...previous, product: { ...previous.product, ...patch } } : previous
+      )
+      if (patch.status && patch.status !== 'ACTIVE') {
+        // viewer-specific fields (order link, permissions) need the full detail
+        reloadProduct().catch(() => {})
+      }
+      clearTimeout(bidsTimer)
+      bidsTimer = setTimeout(() => reloadBidHistory().catch(() => {}), 500)
+    })
+    return () => {
+      clearTimeout(bidsTimer)
+      unsubscribe()
+    }
+  }, [productId, reloadProduct, reloadBidHistory])
+
   const product = detail?.product
   const watchlistInfo = detail?.watchlist || { isWatchlisted: false, count: 0 }
   const permissions = detail?.permissions || {}
@@ -2,6 +2,7 @@ import { useEffect, useMemo, useRef, useState } from 'react'
 import { useSearchParams } from 'react-router-dom'
 import { fetchProducts, addToWatchlist, removeFromWatchlist } from '../services/products'
 import ProductCard from '../components/ProductCard'
+import LoadMoreSentinel from '../components/LoadMoreSentinel'
 import { useAuth } from '../contexts/AuthContext'
 
 const SORT_OPTIONS = [
@@ -16,57 +17,78 @@ export default function ProductListPage() {
   const { isAuthenticated } = useAuth()
   const [searchParams, setSearchParams] = useSearchParams()
   const [items, setItems] = useState([])
-  const [meta, setMeta] = useState({ page: 1, totalPages: 0, total: 0 })
+  const [meta, setMeta] = useState({ total: 0, hasMore: false, nextCursor: null })
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState(null)
   const [watchlistLoading, setWatchlistLoading] = useState({})
   const [watchlistStatus, setWatchlistStatus] = useState({})
   const watchlistTimers = useRef({})
+  const requestId = useRef(0)
 
-  const currentPage = Number(searchParams.get('page')) || 1
   const currentSort = searchParams.get('sort') || SORT_OPTIONS[0].value
   const categoryId = searchParams.get('categoryId')
 
   useEffect(() => {
-    let isMounted = true
+    const id = ++requestId.current
     setLoading(true)
+    setItems([])
     fetchProducts({
-      page: currentPage,
       sort: currentSort,
       categoryId
     })
       .then((response) => {
-        if (!isMounted) return
+        if (id !== requestId.current) return
         setItems(response?.data?.items || [])
-        setMeta(response?.meta || { page: 1, totalPages: 0, total: 0 })
+        setMeta({ total: 0, hasMore: false, nextCursor: null, ...(response?.meta || {}) })
         setError(null)
       })
       .catch((err) => {
-        if (!isMounted) return
+        if (id !== requestId.current) return
         setError(err.message || 'Unable to load products')
       })
       .finally(() => {
-        if (isMounted) setLoading(false)
+        if (id === requestId.current) setLoading(false)
       })
     return () => {
-      isMounted = false
+      requestId.current += 1
     }
-  }, [currentPage, currentSort, categoryId])
+  }, [currentSort, categoryId])
 
-  const handleSortChange = (event) => {
-    const nextSort = event.target.value
-    setSearchParams((prev) => {
-      const params = new URLSearchParams(prev)
-      params.set('sort', nextSort)
-      params.set('page', '1')
-      return params
+  // later pages follow the cursor and skip the count; the first page's total is kept
+  const loadMore = () => {
+    if (loading || loadingMore || !meta.nextCursor) return
+    const id = requestId.current
+    setLoadingMore(true)
+    fetchProducts({
+      sort: currentSort,
+      categoryId,
+      cursor: meta.nextCursor,
+      includeTotal: false
     })
+      .then((response) => {
+        if (id !== requestId.current) return
+        const nextItems = response?.data?.items || []
+        setItems((prev) => [...prev, ...nextItems])
+        setMeta((prev) => ({
+          ...prev,
+          hasMore: Boolean(response?.meta?.hasMore),
+          nextCursor: response?.meta?.nextCursor || null
+        }))
+      })
+      .catch((err) => {
+        if (id !== requestId.current) return
+        setError(err.message || 'Unable to load more products')
+      })
+      .finally(() => setLoadingMore(false))
   }
 
-  const goToPage = (nextPage) => {
+  const handleSortChange = (event) => {
+    const nextSort = event.target.value
     setSearchParams((prev) => {
       const params = new URLSearchParams(prev)
-      params.set('page', String(nextPage))
+      params.set('sort', nextSort)
+      params.delete('page')
       return params
     })
   }
@@ -126,7 +148,7 @@ export default function ProductListPage() {
         <div>
           <h1 className="h3 fw-bold text-primary mb-1">Products</h1>
           <p className="text-secondary mb-0 small">
-            Showing <span className="fw-bold text-dark">{items.length}</span> of {meta.total} items — sorted by {sortLabel || 'custom'}
+            Showing <span className="fw-bold text-dark">{items.length}</span> of {meta.countMode === 'estimate' ? 'about ' : ''}{meta.total} items — sorted by {sortLabel || 'custom'}
           </p>
         </div>
         <div className="d-flex align-items-center gap-3">
@@ -192,30 +214,8 @@ export default function ProductListPage() {
         ))}
       </div>
 
-      {meta.totalPages > 1 && (
-        <nav className="mt-5 d-flex justify-content-center" aria-label="Product pagination">
-          <ul className="pagination shadow-sm">
-            <li className={`page-item ${meta.page <= 1 ? 'disabled' : ''}`}>
-              <button className="page-link border-0" onClick={() => goToPage(meta.page - 1)} disabled={meta.page <= 1}>
-                Previous
-              </button>
-            </li>
-            <li className="page-item disabled">
-              <span className="page-link border-0 fw-bold text-dark px-4">
-                Page {meta.page} / {meta.totalPages}
-              </span>
-            </li>
-            <li className={`page-item ${meta.page >= meta.totalPages ? 'disabled' : ''}`}>
-              <button
-                className="page-link border-0"
-                onClick={() => goToPage(meta.page + 1)}
-                disabled={meta.page >= meta.totalPages}
-              >
-                Next
-              </button>
-            </li>
-          </ul>
-        </nav>
+      {!loading && (
+        <LoadMoreSentinel hasMore={meta.hasMore} loading={loadingMore} onLoadMore={loadMore} label="Load more products" />
       )}
     </div>
   )
@@ -7,7 +7,14 @@ import { useAuth } from '../contexts/AuthContext'
 export default function ProfilePage() {
   const { user, setUser } = useAuth()
   const [profile, setProfile] = useState(null)
-  const [form, setForm] = useState({ email: '', fullName: '', phoneNumber: '', address: '', dateOfBirth: '' })
+  const [form, setForm] = useState({
+    email: '',
+    fullName: '',
+    phoneNumber: '',
+    address: '',
+    dateOfBirth: '',
+    notificationMode: 'IMMEDIATE'
+  })
   const [loading, setLoading] = useState(true)
   const [updating, setUpdating] = useState(false)
   const [requesting, setRequesting] = useState(false)
@@ -35,7 +42,8 @@ export default function ProfilePage() {
           fullName: data.user?.fullName || '',
           phoneNumber: data.user?.phoneNumber || '',
           address: data.user?.address || '',
-          dateOfBirth: data.user?.dateOfBirth?.slice(0, 10) || ''
+          dateOfBirth: data.user?.dateOfBirth?.slice(0, 10) || '',
+          notificationMode: data.user?.notificationMode || 'IMMEDIATE'
         })
       })
       .catch((error) => {
@@ -422,7 +430,7 @@ export default function ProfilePage() {
                     onChange={handleChange}
                   />
                 </div>
-                <div className="mb-4">
+                <div className="mb-3">
                   <label htmlFor="address" className="form-label">
                     Address
                   </label>
@@ -435,6 +443,22 @@ export default function ProfilePage() {
                     onChange={handleChange}
                   />
                 </div>
+                <div className="mb-4">
+                  <label htmlFor="notificationMode" className="form-label">
+                    Bid emails
+                  </label>
+                  <select
+                    id="notificationMode"
+                    name="notificationMode"
+                    className="form-select"
+                    value={form.notificationMode}
+                    onChange={handleChange}
+                  >
+                    <option value="IMMEDIATE">Every bid and outbid</option>
+                    <option value="DIGEST">Periodic summary</option>
+                  </select>
+                  <div className="form-text">A summary groups busy auctions into one email every few minutes.</div>
+                </div>
                 <button type="submit" className="btn btn-primary" disabled={updating}>
                   {updating ? 'Saving…' : 'Save changes'}
                 </button>
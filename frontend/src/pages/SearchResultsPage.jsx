@@ -4,10 +4,13 @@ import { searchProducts } from '../services/search'
 import { fetchCategories } from '../services/categories'
 import { addToWatchlist, removeFromWatchlist } from '../services/products'
 import ProductCard from '../components/ProductCard'
+import LoadMoreSentinel from '../components/LoadMoreSentinel'
 import { useAuth } from '../contexts/AuthContext'
+import { formatVND } from '../utils/format'
 
-const DEFAULT_META = { total: 0, page: 1, limit: 12, hasMore: false }
+const DEFAULT_META = { total: 0, limit: 12, hasMore: false, nextCursor: null }
 const SORT_OPTIONS = [
+  { value: 'relevance,desc', label: 'Best match' },
   { value: 'created_at,desc', label: 'Newly listed' },
   { value: 'end_at,asc', label: 'Ending soon' },
   { value: 'price,asc', label: 'Price: low to high' },
@@ -15,6 +18,12 @@ const SORT_OPTIONS = [
   { value: 'bid_count,desc', label: 'Most bids' }
 ]
 
+const ENDING_WINDOW_LABELS = {
+  '1h': { label: 'Within 1 hour', hours: 1 },
+  '24h': { label: 'Within 24 hours', hours: 24 },
+  '7d': { label: 'Within 7 days', hours: 24 * 7 }
+}
+
 const LOGIC_OPTIONS = [
   { value: 'and', label: 'Match all (AND)' },
   { value: 'or', label: 'Match any (OR)' }
@@ -45,12 +54,13 @@ export default function SearchResultsPage() {
   const [searchParams, setSearchParams] = useSearchParams()
   const [items, setItems] = useState([])
   const [categories, setCategories] = useState([])
+  const [facets, setFacets] = useState(null)
   const [meta, setMeta] = useState(DEFAULT_META)
   const [loading, setLoading] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState(null)
   const [searchErrors, setSearchErrors] = useState({})
   const term = (searchParams.get('q') || '').trim()
-  const page = Number(searchParams.get('page') || 1)
   const sort = searchParams.get('sort') || SORT_OPTIONS[0].value
   const categoryId = searchParams.get('categoryId') || ''
   const [formTerm, setFormTerm] = useState(term)
@@ -74,6 +84,7 @@ export default function SearchResultsPage() {
   const [endAtLogic, setEndAtLogic] = useState('and')
   const [showAdvanced, setShowAdvanced] = useState(false)
   const searchKey = searchParams.toString()
+  const requestId = useRef(0)
 
   useEffect(() => {
     setFormTerm(term)
@@ -112,14 +123,7 @@ export default function SearchResultsPage() {
     return 'Selected category'
   }, [categoryId, categoryTree])
 
-  useEffect(() => {
-    if (!term) {
-      setItems([])
-      setMeta({ ...DEFAULT_META, page: 1 })
-      setLoading(false)
-      return
-    }
-    const filters = {
+  const currentFilters = () => ({
       priceMin: searchParams.get('priceMin') || undefined,
       priceMax: searchParams.get('priceMax') || undefined,
       priceLogic: searchParams.get('priceLogic') || undefined,
@@ -134,11 +138,21 @@ export default function SearchResultsPage() {
       endAtFrom: searchParams.get('endAtFrom') || undefined,
       endAtTo: searchParams.get('endAtTo') || undefined,
       endAtLogic: searchParams.get('endAtLogic') || undefined
+  })
+
+  useEffect(() => {
+    const id = ++requestId.current
+    if (!term) {
+      setItems([])
+      setMeta(DEFAULT_META)
+      setLoading(false)
+      return
     }
     setLoading(true)
     setError(null)
-    searchProducts(term, { page, sort, categoryId: categoryId || undefined, filters })
+    searchProducts(term, { sort, categoryId: categoryId || undefined, facets: true, filters: currentFilters() })
       .then((response) => {
+        if (id !== requestId.current) return
         const payload = response?.data || {}
         setItems(
           (payload.items || []).map((item) => ({
@@ -147,20 +161,56 @@ export default function SearchResultsPage() {
           }))
         )
         setCategories(payload.categories || [])
-        setMeta({
-          ...DEFAULT_META,
-          ...(payload.meta || {}),
-          page: payload.meta?.page || page
-        })
+        setFacets(payload.facets || null)
+        setMeta({ ...DEFAULT_META, ...(payload.meta || {}) })
       })
       .catch((err) => {
+        if (id !== requestId.current) return
         setItems([])
-        setMeta({ ...DEFAULT_META, page })
+        setMeta(DEFAULT_META)
         setCategories([])
+        setFacets(null)
         setError(err.message || 'Unable to search products')
       })
-      .finally(() => setLoading(false))
-  }, [term, page, sort, categoryId, searchKey])
+      .finally(() => {
+        if (id === requestId.current) setLoading(false)
+      })
+  }, [term, sort, categoryId, searchKey])
+
+  // follow-up pages use the cursor and skip the count; the first page's total is kept
+  const loadMore = () => {
+    if (!term || loading || loadingMore || !meta.nextCursor) return
+    const id = requestId.current
+    setLoadingMore(true)
+    searchProducts(term, {
+      sort,
+      categoryId: categoryId || undefined,
+      cursor: meta.nextCursor,
+      includeTotal: false,
+      filters: currentFilters()
+    })
+      .then((response) => {
+        if (id !== requestId.current) return
+        const payload = response?.data || {}
+        setItems((prev) => [
+          ...prev,
+          ...(payload.items || []).map((item) => ({
+            ...item,
+            isWatchlisted: Boolean(item.isWatchlisted)
+          }))
+        ])
+        setMeta((prev) => ({
+          ...prev,
+          hasMore: Boolean(payload.meta?.hasMore),
+          nextCursor: payload.meta?.nextCursor || null
+        }))
+      })
+      .catch((err) => {
+        if (id !== requestId.current) return
+        setError(err.message || 'Unable to load more results')
+      })
+      .finally(() => setLoadingMore(false))
+  }
 
   const handleSubmit = (event) => {
     event.preventDefault()
@@ -175,21 +225,39 @@ export default function SearchResultsPage() {
       return
     }
     setSearchErrors({})
-    setSearchParams(buildSearchParams({ nextTerm: trimmed, nextPage: 1 }))
-  }
-
-  const handlePageChange = (nextPage) => {
-    if (!term) return
-    setSearchParams(buildSearchParams({ nextTerm: term, nextPage }))
+    setSearchParams(buildSearchParams({ nextTerm: trimmed }))
   }
 
   const handleSortChange = (event) => {
     const nextSort = event.target.value
-    setSearchParams(buildSearchParams({ nextTerm: term, nextPage: 1, nextSort }))
+    setSearchParams(buildSearchParams({ nextTerm: term, nextSort }))
   }
 
   const handleCategoryChange = (nextCat) => {
-    setSearchParams(buildSearchParams({ nextTerm: term, nextPage: 1, nextCategoryId: nextCat }))
+    setSearchParams(buildSearchParams({ nextTerm: term, nextCategoryId: nextCat }))
+  }
+
+  const applyFacetFilters = (next) => {
+    const params = buildSearchParams({ nextTerm: term })
+    Object.entries(next).forEach(([key, value]) => {
+      if (value === null || value === undefined || value === '') {
+        delete params[key]
+      } else {
+        params[key] = String(value)
+      }
+    })
+    setSearchParams(params)
+  }
+
+  const handlePriceFacet = (bucket) => {
+    applyFacetFilters({ priceMin: bucket.min || null, priceMax: bucket.max ? bucket.max - 1 : null, priceLogic: 'and' })
+  }
+
+  const handleEndingFacet = (windowKey) => {
+    const window = ENDING_WINDOW_LABELS[windowKey]
+    if (!window) return
+    const endAtTo = new Date(Date.now() + window.hours * 60 * 60 * 1000).toISOString()
+    applyFacetFilters({ endAtFrom: null, endAtTo, endAtLogic: 'and' })
   }
 
   const setStatusWithTimeout = (productId, payload) => {
@@ -255,10 +323,9 @@ export default function SearchResultsPage() {
     return params
   }
 
-  const buildSearchParams = ({ nextTerm, nextPage, nextSort, nextCategoryId } = {}) => {
+  const buildSearchParams = ({ nextTerm, nextSort, nextCategoryId } = {}) => {
     const params = {
-      q: nextTerm ?? term,
-      page: String(nextPage ?? 1)
+      q: nextTerm ?? term
     }
     const filters = buildFilterParams()
     Object.assign(params, filters)
@@ -271,14 +338,13 @@ export default function SearchResultsPage() {
 
   const renderSummary = useMemo(() => {
     if (!term || !meta.total) return null
-    const rangeStart = (meta.page - 1) * meta.limit + 1
-    const rangeEnd = Math.min(rangeStart + items.length - 1, meta.total)
     return (
       <span className="text-muted">
-        Showing {rangeStart}-{rangeEnd} of {meta.total} results for <strong>{term}</strong>
+        Showing {items.length} of {meta.countMode === 'estimate' ? 'about ' : ''}{meta.total} results for{' '}
+        <strong>{term}</strong>
       </span>
     )
-  }, [items.length, meta.limit, meta.page, meta.total, term])
+  }, [items.length, meta.countMode, meta.total, term])
 
   const hasActiveFilters = Boolean(
     categoryId ||
@@ -390,7 +456,7 @@ export default function SearchResultsPage() {
                   <button
                     type="button"
                     className="btn btn-sm btn-outline-secondary"
-                    onClick={() => setSearchParams({ q: term, page: '1', sort })}
+                    onClick={() => setSearchParams({ q: term, sort })}
                     disabled={!hasActiveFilters}
                   >
                     Clear filters
@@ -563,6 +629,79 @@ export default function SearchResultsPage() {
           </div>
         </div>
       </form>
+      {term && facets && (
+        <div className="border rounded-3 bg-white p-3 mb-4">
+          <div className="row g-3 small">
+            <div className="col-12 col-lg-5">
+              <div className="fw-semibold text-secondary mb-2">Categories</div>
+              <div className="d-flex flex-wrap gap-2">
+                {facets.categories.map((category) => (
+                  <div key={category.id} className="d-flex flex-wrap gap-1">
+                    <button
+                      type="button"
+                      className={`btn btn-sm ${String(category.id) === String(categoryId) ? 'btn-primary' : 'btn-outline-primary'}`}
+                      onClick={() => handleCategoryChange(String(category.id))}
+                    >
+                      {category.name} <span className="badge bg-light text-dark ms-1">{category.count}</span>
+                    </button>
+                    {category.children.map((child) => (
+                      <button
+                        key={child.id}
+                        type="button"
+                        className={`btn btn-sm ${String(child.id) === String(categoryId) ? 'btn-secondary' : 'btn-outline-secondary'}`}
+                        onClick={() => handleCategoryChange(String(child.id))}
+                      >
+                        {child.name} <span className="badge bg-light text-dark ms-1">{child.count}</span>
+                      </button>
+                    ))}
+                  </div>
+                ))}
+              </div>
+            </div>
+            <div className="col-12 col-md-6 col-lg-4">
+              <div className="fw-semibold text-secondary mb-2">Price</div>
+              <div className="d-flex flex-wrap gap-1">
+                {facets.price
+                  .filter((bucket) => bucket.count > 0)
+                  .map((bucket) => (
+                    <button
+                      key={bucket.min}
+                      type="button"
+                      className="btn btn-sm btn-outline-secondary"
+                      onClick={() => handlePriceFacet(bucket)}
+                    >
+                      {bucket.max ? `${formatVND(bucket.min)} – ${formatVND(bucket.max)}` : `${formatVND(bucket.min)}+`}
+                      <span className="badge bg-light text-dark ms-1">{bucket.count}</span>
+                    </button>
+                  ))}
+              </div>
+            </div>
+            <div className="col-12 col-md-6 col-lg-3">
+              <div className="fw-semibold text-secondary mb-2">Ending</div>
+              <div className="d-flex flex-wrap gap-1">
+                {facets.ending
+                  // buckets are disjoint; "within N" includes the shorter windows
+                  .map((bucket, index) => ({
+                    ...bucket,
+                    count: facets.ending.slice(0, index + 1).reduce((sum, item) => sum + item.count, 0)
+                  }))
+                  .filter((bucket) => bucket.count > 0 && ENDING_WINDOW_LABELS[bucket.window])
+                  .map((bucket) => (
+                    <button
+                      key={bucket.window}
+                      type="button"
+                      className="btn btn-sm btn-outline-secondary"
+                      onClick={() => handleEndingFacet(bucket.window)}
+                    >
+                      {ENDING_WINDOW_LABELS[bucket.window].label}
+                      <span className="badge bg-light text-dark ms-1">{bucket.count}</span>
+                    </button>
+                  ))}
+              </div>
+            </div>
+          </div>
+        </div>
+      )}
       {!term && (
         <div className="alert alert-light">Type a keyword above to explore available auctions.</div>
       )}
@@ -602,6 +741,10 @@ export default function SearchResultsPage() {
         ))}
       </div>
 
+      {term && !loading && (
+        <LoadMoreSentinel hasMore={meta.hasMore} loading={loadingMore} onLoadMore={loadMore} label="Load more results" />
+      )}
+
       {categories.length > 0 && !hasActiveFilters && (
         <div className="mt-4">
           <h4 className="mb-3">Matching categories</h4>
@@ -623,27 +766,6 @@ export default function SearchResultsPage() {
           </div>
         </div>
       )}
-      {term && meta.total > meta.limit && (
-        <div className="d-flex align-items-center justify-content-between mt-4">
-          <button
-            type="button"
-            className="btn btn-outline-secondary"
-            onClick={() => handlePageChange(page - 1)}
-            disabled={page <= 1 || loading}
-          >
-            Previous
-          </button>
-          <span className="text-muted">Page {page}</span>
-          <button
-            type="button"
-            className="btn btn-outline-secondary"
-            onClick={() => handlePageChange(page + 1)}
-            disabled={!meta.hasMore || loading}
-          >
-            Next
-          </button>
-        </div>
-      )}
     </div>
   )
 }
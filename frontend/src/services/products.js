@@ -12,6 +12,21 @@ export function fetchProductBids(productId, params = {}) {
   return apiClient.get(`/products/${productId}/bids`, { params })
 }
 
+// Live bid/price/end-time deltas over SSE; returns an unsubscribe function.
+// EventSource reconnects by itself and the server resends a snapshot.
+export function subscribeProductUpdates(productId, onUpdate) {
+  if (typeof EventSource === 'undefined') return () => {}
+  const source = new EventSource(`${apiClient.defaults.baseURL}/products/${productId}/stream`)
+  source.addEventListener('product', (event) => {
+    try {
+      onUpdate(JSON.parse(event.data))
+    } catch (_err) {
+      // ignore malformed frames
+    }
+  })
+  return () => source.close()
+}
+
 export function createProduct(formData) {
   return apiClient.post('/products', formData, {
     headers: {
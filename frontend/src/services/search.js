@@ -1,7 +1,19 @@
 import apiClient from './api'
 
-export function searchProducts(term, { page = 1, limit, categoryId, sort, filters = {} } = {}) {
+export function searchProducts(
+  term,
+  { page = 1, limit, categoryId, sort, cursor, includeTotal, facets, filters = {} } = {}
+) {
   const params = { q: term, page, ...filters }
+  if (facets) {
+    params.facets = true
+  }
+  if (cursor) {
+    params.cursor = cursor
+  }
+  if (includeTotal !== undefined) {
+    params.includeTotal = includeTotal
+  }
   if (limit) {
     params.limit = limit
   }
@@ -13,3 +25,11 @@ export function searchProducts(term, { page = 1, limit, categoryId, sort, filter
   }
   return apiClient.get('/search', { params })
 }
+
+export function suggestSearch(term, { limit } = {}) {
+  const params = { q: term }
+  if (limit) {
+    params.limit = limit
+  }
+  return apiClient.get('/search/suggest', { params })
+}
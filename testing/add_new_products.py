@@ -3,6 +3,8 @@ import os
 import psycopg2
 from datetime import datetime, timedelta
 
+from bulk_loader import copy_upsert
+
 DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
     "port": int(os.getenv("DB_PORT", 5433)),
@@ -293,41 +295,48 @@ def ensure_categories(conn):
             ids[name] = cur.fetchone()[0]
     return ids
 
-def insert_product(conn, product, cat_ids, seller_id):
+PRODUCT_COLUMNS = (
+    "seller_id", "category_id", "name", "slug", "description",
+    "start_price", "price_step", "current_price", "buy_now_price",
+    "auto_extend", "enable_auto_bid", "current_bidder_id",
+    "bid_count", "highlight_until", "status", "start_at", "end_at", "created_at", "updated_at",
+)
+
+
+def product_row(product, cat_ids, seller_id, start):
+    end = start + timedelta(days=product["duration_days"])
+    return (
+        seller_id,
+        cat_ids[product["category"]],
+        product["name"],
+        product["name"].lower().replace(" ", "-"),
+        f"Auto-seeded product {product['name']}",
+        product["start_price"],
+        product["price_step"],
+        product["start_price"],
+        product["buy_now"],
+        True,
+        True,
+        None,
+        0,
+        None,
+        "ACTIVE",
+        start,
+        end,
+        start,
+        start,
+    )
+
+def upsert_products(conn, products, cat_ids, seller_id):
+    start = datetime.utcnow()
     with conn.cursor() as cur:
-        start = datetime.utcnow()
-        end = start + timedelta(days=product["duration_days"])
-        cur.execute(
-            """
-            INSERT INTO products (
-                seller_id, category_id, name, slug, description,
-                start_price, price_step, current_price, buy_now_price,
-                auto_extend, enable_auto_bid, current_bidder_id,
-                bid_count, highlight_until, status, start_at, end_at, created_at, updated_at
-            )
-            VALUES (
-                %(seller_id)s, %(category_id)s, %(name)s, %(slug)s, %(description)s,
-                %(start_price)s, %(price_step)s, %(current_price)s, %(buy_now_price)s,
-                true, true, NULL, 0, NULL, 'ACTIVE', %(start_at)s, %(end_at)s, %(start_at)s, %(start_at)s
-            )
-            ON CONFLICT (slug) DO UPDATE SET
-                current_price = EXCLUDED.current_price,
-                status = EXCLUDED.status,
-                end_at = EXCLUDED.end_at
-            """,
-            {
-                "seller_id": seller_id,
-                "category_id": cat_ids[product["category"]],
-                "name": product["name"],
-                "slug": product["name"].lower().replace(" ", "-"),
-                "description": f"Auto-seeded product {product['name']}",
-                "start_price": product["start_price"],
-                "price_step": product["price_step"],
-                "current_price": product["start_price"],
-                "buy_now_price": product["buy_now"],
-                "start_at": start,
-                "end_at": end,
-            },
+        return copy_upsert(
+            cur,
+            "products",
+            PRODUCT_COLUMNS,
+            (product_row(product, cat_ids, seller_id, start) for product in products),
+            conflict_columns=("slug",),
+            update_columns=("current_price", "status", "end_at"),
         )
 
 def main():
@@ -336,8 +345,7 @@ def main():
     try:
         seller_id = ensure_user(conn, "tester@example.com")
         cat_ids = ensure_categories(conn)
-        for product in PRODUCTS:
-            insert_product(conn, product, cat_ids, seller_id)
+        upsert_products(conn, PRODUCTS, cat_ids, seller_id)
         conn.commit()
         print("Seeded products successfully.")
     except Exception as exc:
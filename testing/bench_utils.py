@@ -0,0 +1,14 @@
+"""
+Helpers shared by the load, benchmark and report scripts under testing/.
+"""
+
+import math
+
+
+def percentile(values, pct):
+  """Nearest-rank percentile of `values`; 0 for an empty sample."""
+  if not values:
+    return 0
+  ordered = sorted(values)
+  rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+  return ordered[min(rank, len(ordered) - 1)]
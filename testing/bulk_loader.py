@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Bulk catalog loader shared by the seed scripts.
+
+Streams product bundles into `products`, `product_images`, `bids` and
+`auto_bids` with `COPY ... FROM STDIN` instead of one INSERT per row.
+
+A bundle is a dict:
+    {
+        "product": {...products columns, without id...},
+        "images": [{"image_url": ..., "display_order": ...}, ...],
+        "bids": [{"user_id": ..., "bid_amount": ..., "is_auto_bid": ..., "created_at": ...}, ...],
+        "auto_bids": [{"user_id": ..., "max_bid_amount": ...}, ...],
+    }
+
+`current_price`, `bid_count` and `current_bidder_id` are derived from the
+bundle's bids before the product row is copied, so no follow-up UPDATE is
+needed. Product ids are reserved from the sequence once per chunk so child
+rows can reference them inside the same COPY pass.
+"""
+
+import csv
+import io
+import os
+from datetime import date, datetime
+
+import psycopg2
+
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", 5433)),
+    "dbname": os.getenv("DB_NAME", "auction_db"),
+    "user": os.getenv("DB_USER", "auction_admin"),
+    "password": os.getenv("DB_PASSWORD", "SieuMatKhau123!@"),
+}
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 5000))
+NULL_MARKER = "\\N"
+
+PRODUCT_COLUMNS = (
+    "id",
+    "seller_id",
+    "category_id",
+    "name",
+    "slug",
+    "description",
+    "start_price",
+    "price_step",
+    "current_price",
+    "buy_now_price",
+    "auto_extend",
+    "enable_auto_bid",
+    "allow_unrated_bidders",
+    "current_bidder_id",
+    "bid_count",
+    "highlight_until",
+    "status",
+    "start_at",
+    "end_at",
+    "created_at",
+    "updated_at",
+)
+IMAGE_COLUMNS = ("product_id", "image_url", "display_order")
+BID_COLUMNS = ("product_id", "user_id", "bid_amount", "is_auto_bid", "created_at")
+AUTO_BID_COLUMNS = ("product_id", "user_id", "max_bid_amount", "created_at", "updated_at")
+
+PRODUCT_DEFAULTS = {
+    "description": None,
+    "buy_now_price": None,
+    "auto_extend": True,
+    "enable_auto_bid": True,
+    "allow_unrated_bidders": False,
+    "highlight_until": None,
+    "status": "ACTIVE",
+}
+
+
+def connect():
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = False
+    return conn
+
+
+def _format_value(value):
+    if value is None:
+        return NULL_MARKER
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(cur, table, columns, rows):
+    """COPY an iterable of tuples into `table`. Returns the number of rows sent."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    count = 0
+    for row in rows:
+        writer.writerow([_format_value(value) for value in row])
+        count += 1
+    if not count:
+        return 0
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')",
+        buffer,
+    )
+    return count
+
+
+def reserve_ids(cur, table, count):
+    """Pull `count` ids from the table's serial sequence in one round trip."""
+    if count <= 0:
+        return []
+    cur.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        (table, count),
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def apply_bid_aggregates(product, bids):
+    """Derive current_price / current_bidder_id / bid_count from the bundle bids.
+
+    Mirrors findTopBids ordering in bid.repository.js: highest amount wins,
+    ties go to the latest bid.
+    """
+    product = dict(product)
+    if not bids:
+        product["current_price"] = product.get("current_price") or product["start_price"]
+        product["current_bidder_id"] = None
+        product["bid_count"] = 0
+        return product
+
+    top = bids[0]
+    for bid in bids[1:]:
+        if bid["bid_amount"] > top["bid_amount"]:
+            top = bid
+        elif bid["bid_amount"] == top["bid_amount"]:
+            placed, leader = bid.get("created_at"), top.get("created_at")
+            if placed is None or leader is None or placed >= leader:
+                top = bid
+    product["current_price"] = top["bid_amount"]
+    product["current_bidder_id"] = top["user_id"]
+    product["bid_count"] = len(bids)
+    return product
+
+
+def _product_row(product_id, product):
+    values = {**PRODUCT_DEFAULTS, **product, "id": product_id}
+    values.setdefault("created_at", values["start_at"])
+    values.setdefault("updated_at", values["created_at"])
+    return tuple(values[column] for column in PRODUCT_COLUMNS)
+
+
+def _load_chunk(cur, chunk, stats, collect_ids):
+    ids = reserve_ids(cur, "products", len(chunk))
+    product_rows = []
+    image_rows = []
+    bid_rows = []
+    auto_bid_rows = []
+
+    for product_id, bundle in zip(ids, chunk):
+        bids = bundle.get("bids") or []
+        product = apply_bid_aggregates(bundle["product"], bids)
+        product_rows.append(_product_row(product_id, product))
+        for image in bundle.get("images") or []:
+            image_rows.append((product_id, image["image_url"], image.get("display_order", 0)))
+        for bid in bids:
+            bid_rows.append(
+                (
+                    product_id,
+                    bid["user_id"],
+                    bid["bid_amount"],
+                    bool(bid.get("is_auto_bid", False)),
+                    bid.get("created_at") or product["start_at"],
+                )
+            )
+        for auto_bid in bundle.get("auto_bids") or []:
+            created_at = auto_bid.get("created_at") or product["start_at"]
+            auto_bid_rows.append(
+                (product_id, auto_bid["user_id"], auto_bid["max_bid_amount"], created_at, created_at)
+            )
+
+    stats["products"] += copy_rows(cur, "products", PRODUCT_COLUMNS, product_rows)
+    stats["images"] += copy_rows(cur, "product_images", IMAGE_COLUMNS, image_rows)
+    stats["bids"] += copy_rows(cur, "bids", BID_COLUMNS, bid_rows)
+    stats["auto_bids"] += copy_rows(cur, "auto_bids", AUTO_BID_COLUMNS, auto_bid_rows)
+    if collect_ids:
+        stats["product_ids"].extend(ids)
+
+
+def load_catalog(conn, bundles, chunk_size=DEFAULT_CHUNK_SIZE, collect_ids=False, commit_every_chunk=False):
+    """Stream product bundles into the catalog tables in chunks of `chunk_size`.
+
+    The caller owns the transaction unless `commit_every_chunk` is set, which
+    keeps very large loads from holding a single long transaction.
+    """
+    stats = {"products": 0, "images": 0, "bids": 0, "auto_bids": 0, "product_ids": []}
+    chunk = []
+    with conn.cursor() as cur:
+        for bundle in bundles:
+            chunk.append(bundle)
+            if len(chunk) >= chunk_size:
+                _load_chunk(cur, chunk, stats, collect_ids)
+                chunk = []
+                if commit_every_chunk:
+                    conn.commit()
+        if chunk:
+            _load_chunk(cur, chunk, stats, collect_ids)
+            if commit_every_chunk:
+                conn.commit()
+    return stats
+
+
+def copy_upsert(cur, table, columns, rows, conflict_columns, update_columns):
+    """COPY rows into a temp staging table, then merge them with ON CONFLICT.
+
+    For loaders that need upsert semantics (COPY itself cannot resolve conflicts).
+    """
+    stage = f"_stage_{table}"
+    cur.execute(f"DROP TABLE IF EXISTS {stage}")
+    cur.execute(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+    )
+    count = copy_rows(cur, stage, columns, rows)
+    if not count:
+        return 0
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+    cur.execute(
+        f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        SELECT {', '.join(columns)} FROM {stage}
+        ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {assignments}
+        """
+    )
+    cur.execute(f"DROP TABLE IF EXISTS {stage}")
+    return count
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Synthetic marketplace generator for load-testing datasets.
+
+Builds users, a category tree and product bundles at any scale and feeds
+them to bulk_loader (COPY). Output is fully deterministic for a given
+--seed, so the same dataset can be rebuilt on every benchmark host.
+
+Skew knobs:
+- --zipf: product popularity exponent; bids per product follow 1/rank^s,
+  normalised so the catalog average stays at --bids-per-product.
+- --bidder-zipf: how concentrated bidding activity is across users.
+- --end-distribution: uniform | ending-soon | exponential end_at spread
+  over --end-window-days; --expired-ratio leaves a share of ACTIVE
+  auctions already past end_at for finalizer benchmarks.
+
+Examples:
+  python testing/generate_marketplace.py --products 200 --dry-run
+  python testing/generate_marketplace.py --users 20000 --products 500000 --bids-per-product 8
+  python testing/generate_marketplace.py --tag gen42 --purge
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from bulk_loader import DEFAULT_CHUNK_SIZE, connect, copy_rows, load_catalog, reserve_ids
+
+
+PASSWORD_HASH = os.getenv(
+    "GEN_PASSWORD_HASH",
+    "$2b$10$xZOqVPBacXrQhfhbJDPdkuJ3yS8rsGVABg6WbmJnVZYTiHJ3YZlKa",
+)
+
+NOUNS = [
+    "Phone", "Laptop", "Camera", "Watch", "Sneakers", "Jacket", "Painting", "Guitar",
+    "Headphones", "Console", "Bicycle", "Lamp", "Vase", "Ring", "Handbag", "Drone",
+]
+ADJECTIVES = [
+    "Vintage", "Limited", "Classic", "Pro", "Signed", "Rare", "Modern", "Compact",
+    "Deluxe", "Handmade", "Refurbished", "Collector", "Premium", "Mini", "Ultra", "Retro",
+]
+USER_COLUMNS = ("id", "email", "password_hash", "full_name", "role", "status", "positive_score", "negative_score")
+CATEGORY_COLUMNS = ("id", "name", "parent_id")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic auction marketplace")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--bids-per-product", type=float, default=5.0)
+    parser.add_argument("--category-depth", type=int, default=2)
+    parser.add_argument("--category-fanout", type=int, default=5)
+    parser.add_argument("--seller-ratio", type=float, default=0.05)
+    parser.add_argument("--zipf", type=float, default=1.1, help="product popularity exponent (0 = flat)")
+    parser.add_argument("--bidder-zipf", type=float, default=0.8, help="bidder activity exponent (0 = flat)")
+    parser.add_argument(
+        "--end-distribution",
+        choices=("uniform", "ending-soon", "exponential"),
+        default="uniform",
+    )
+    parser.add_argument("--end-window-days", type=float, default=7.0)
+    parser.add_argument("--expired-ratio", type=float, default=0.0)
+    parser.add_argument("--auto-bid-ratio", type=float, default=0.3, help="share of auto-bid products with registered ceilings")
+    parser.add_argument("--images-per-product", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tag", default=None, help="prefix for generated emails/slugs (default gen<seed>)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="generate and count rows without touching the DB")
+    parser.add_argument("--purge", action="store_true", help="delete rows previously generated with --tag and exit")
+    args = parser.parse_args(argv)
+    args.tag = args.tag or f"gen{args.seed}"
+    if args.users < 2 or args.products < 0 or args.category_depth < 1 or args.category_fanout < 1:
+        parser.error("need --users >= 2, --products >= 0, --category-depth >= 1, --category-fanout >= 1")
+    # at least one user must be left over as a bidder
+    if not 0 <= args.seller_ratio < 1 or int(args.users * args.seller_ratio) >= args.users:
+        parser.error("need 0 <= --seller-ratio < 1 so that some users are bidders")
+    return args
+
+
+def zipf_cum_weights(count, exponent):
+    total = 0.0
+    cumulative = []
+    for rank in range(1, count + 1):
+        total += 1.0 / (rank ** exponent)
+        cumulative.append(total)
+    return cumulative
+
+
+def harmonic(count, exponent):
+    return sum(1.0 / (rank ** exponent) for rank in range(1, count + 1))
+
+
+def scatter_rank(index, count):
+    """Deterministic permutation of 0..count-1 so popularity isn't tied to id order."""
+    if count <= 1:
+        return 0
+    stride = 2654435761 % count or 1
+    while math.gcd(stride, count) != 1:
+        stride += 1
+    return (index * stride) % count
+
+
+def generate_users(args):
+    seller_count = max(1, int(args.users * args.seller_ratio))
+    for idx in range(args.users):
+        role = "SELLER" if idx < seller_count else "BIDDER"
+        yield {
+            "email": f"{args.tag}-user{idx}@example.com",
+            "full_name": f"{args.tag.title()} User {idx}",
+            "role": role,
+            # counters must match the ratings table (npm run ratings:verify);
+            # generated users have no ratings, so only allow_unrated products take their bids
+            "positive_score": 0,
+        }
+
+
+def generate_categories(args):
+    """Yield (key, name, parent_key) breadth-first; leaves are at --category-depth."""
+    level = [None]
+    for depth in range(1, args.category_depth + 1):
+        next_level = []
+        for parent in level:
+            for child in range(args.category_fanout):
+                key = f"{parent}.{child}" if parent else str(child)
+                next_level.append(key)
+                yield key, f"{args.tag.title()} Category {key}", parent
+        level = next_level
+
+
+def sample_end_at(rng, args, now):
+    window = timedelta(days=args.end_window_days)
+    if args.expired_ratio and rng.random() < args.expired_ratio:
+        return now - timedelta(seconds=rng.uniform(1, 3600))
+    if args.end_distribution == "ending-soon":
+        fraction = min(rng.expovariate(8.0), 1.0)
+    elif args.end_distribution == "exponential":
+        fraction = min(rng.expovariate(2.0), 1.0)
+    else:
+        fraction = rng.random()
+    return now + timedelta(seconds=60) + window * fraction
+
+
+def generate_product_bundles(args, seller_ids, bidder_ids, leaf_category_ids, now):
+    rng = random.Random(args.seed)
+    norm = harmonic(args.products, args.zipf) / max(args.products, 1)
+    bidder_weights = zipf_cum_weights(len(bidder_ids), args.bidder_zipf)
+
+    for idx in range(args.products):
+        rank = scatter_rank(idx, args.products) + 1
+        popularity = (1.0 / (rank ** args.zipf)) / norm if norm else 0
+        expected_bids = args.bids_per_product * popularity
+        bid_total = int(expected_bids) + (1 if rng.random() < expected_bids % 1 else 0)
+
+        adjective = rng.choice(ADJECTIVES)
+        noun = rng.choice(NOUNS)
+        price_step = rng.choice((10000, 50000, 100000, 500000))
+        start_price = price_step * rng.randint(2, 200)
+        end_at = sample_end_at(rng, args, now)
+        start_at = min(now, end_at) - timedelta(hours=rng.uniform(1, 24 * 7))
+        auto_enabled = rng.random() < 0.8
+
+        bids = []
+        amount = start_price
+        bid_span = max((min(now, end_at) - start_at).total_seconds(), 1.0)
+        offsets = sorted(rng.uniform(0, bid_span) for _ in range(bid_total))
+        for offset in offsets:
+            amount += price_step * rng.choice((1, 1, 1, 2, 3))
+            bids.append(
+                {
+                    "user_id": rng.choices(bidder_ids, cum_weights=bidder_weights)[0],
+                    "bid_amount": amount,
+                    "is_auto_bid": auto_enabled and rng.random() < 0.3,
+                    "created_at": start_at + timedelta(seconds=offset),
+                }
+            )
+
+        auto_bids = []
+        if auto_enabled and rng.random() < args.auto_bid_ratio:
+            for user_id in rng.sample(bidder_ids, min(len(bidder_ids), rng.randint(1, 3))):
+                auto_bids.append(
+                    {
+                        "user_id": user_id,
+                        "max_bid_amount": amount + price_step * rng.randint(1, 20),
+                        "created_at": start_at,
+                    }
+                )
+
+        yield {
+            "product": {
+                "seller_id": seller_ids[rng.randrange(len(seller_ids))],
+                "category_id": leaf_category_ids[rng.randrange(len(leaf_category_ids))],
+                "name": f"{adjective} {noun} {idx}",
+                "slug": f"{args.tag}-product-{idx}",
+                "description": f"Generated {adjective.lower()} {noun.lower()} for load testing ({args.tag}).",
+                "start_price": start_price,
+                "price_step": price_step,
+                "buy_now_price": start_price * rng.randint(3, 10) if rng.random() < 0.4 else None,
+                "enable_auto_bid": auto_enabled,
+                "allow_unrated_bidders": rng.random() < 0.5,
+                "start_at": start_at,
+                "end_at": end_at,
+                "created_at": start_at,
+                "updated_at": bids[-1]["created_at"] if bids else start_at,
+            },
+            "images": [
+                {
+                    "image_url": f"https://placehold.co/800x600?text={args.tag}+{idx}-{order}",
+                    "display_order": order,
+                }
+                for order in range(1, args.images_per_product + 1)
+            ],
+            "bids": bids,
+            "auto_bids": auto_bids,
+        }
+
+
+def load_users(cur, args):
+    users = list(generate_users(args))
+    ids = reserve_ids(cur, "users", len(users))
+    copy_rows(
+        cur,
+        "users",
+        USER_COLUMNS,
+        (
+            (user_id, user["email"], PASSWORD_HASH, user["full_name"], user["role"], "CONFIRMED", user["positive_score"], 0)
+            for user_id, user in zip(ids, users)
+        ),
+    )
+    seller_ids = [user_id for user_id, user in zip(ids, users) if user["role"] == "SELLER"]
+    bidder_ids = [user_id for user_id, user in zip(ids, users) if user["role"] == "BIDDER"]
+    return seller_ids, bidder_ids
+
+
+def load_categories(cur, args):
+    categories = list(generate_categories(args))
+    ids = dict(zip((key for key, _, _ in categories), reserve_ids(cur, "categories", len(categories))))
+    copy_rows(
+        cur,
+        "categories",
+        CATEGORY_COLUMNS,
+        ((ids[key], name, ids.get(parent)) for key, name, parent in categories),
+    )
+    return [ids[key] for key, _, _ in categories if key.count(".") == args.category_depth - 1]
+
+
+def purge(conn, tag):
+    slug_pattern = f"{tag}-product-%"
+    email_pattern = f"{tag}-user%@example.com"
+    products = "SELECT id FROM products WHERE slug LIKE %(slug)s"
+    orders = f"SELECT id FROM orders WHERE product_id IN ({products})"
+    with conn.cursor() as cur:
+        for statement in (
+            f"DELETE FROM auto_bid_events WHERE product_id IN ({products})",
+            f"DELETE FROM auto_bids WHERE product_id IN ({products})",
+            f"DELETE FROM bids WHERE product_id IN ({products})",
+            f"DELETE FROM product_images WHERE product_id IN ({products})",
+            f"DELETE FROM watchlist WHERE product_id IN ({products})",
+            f"DELETE FROM answers WHERE question_id IN (SELECT id FROM questions WHERE product_id IN ({products}))",
+            f"DELETE FROM questions WHERE product_id IN ({products})",
+            f"DELETE FROM order_messages WHERE order_id IN ({orders})",
+            f"DELETE FROM ratings WHERE order_id IN ({orders})",
+            f"DELETE FROM orders WHERE product_id IN ({products})",
+            f"DELETE FROM product_description_history WHERE product_id IN ({products})",
+            f"DELETE FROM bid_blacklist WHERE product_id IN ({products})",
+            "DELETE FROM products WHERE slug LIKE %(slug)s",
+            "DELETE FROM categories WHERE name LIKE %(category)s AND parent_id IS NOT NULL",
+            "DELETE FROM categories WHERE name LIKE %(category)s",
+            "DELETE FROM refresh_tokens WHERE user_id IN (SELECT id FROM users WHERE email LIKE %(email)s)",
+            "DELETE FROM users WHERE email LIKE %(email)s",
+        ):
+            cur.execute(
+                statement,
+                {"slug": slug_pattern, "email": email_pattern, "category": f"{tag.title()} Category %"},
+            )
+            print(f"   {cur.rowcount:>8}  {statement.split(' WHERE ')[0]}")
+
+
+def dry_run(args, now):
+    seller_count = max(1, int(args.users * args.seller_ratio))
+    seller_ids = list(range(1, seller_count + 1))
+    bidder_ids = list(range(seller_count + 1, args.users + 1))
+    leaf_ids = list(range(1, args.category_fanout ** args.category_depth + 1))
+    stats = {"products": 0, "images": 0, "bids": 0, "auto_bids": 0, "max_bids": 0}
+    for bundle in generate_product_bundles(args, seller_ids, bidder_ids, leaf_ids, now):
+        stats["products"] += 1
+        stats["images"] += len(bundle["images"])
+        stats["bids"] += len(bundle["bids"])
+        stats["auto_bids"] += len(bundle["auto_bids"])
+        stats["max_bids"] = max(stats["max_bids"], len(bundle["bids"]))
+    stats["categories"] = sum(args.category_fanout ** depth for depth in range(1, args.category_depth + 1))
+    return stats
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    started = time.perf_counter()
+
+    if args.dry_run:
+        stats = dry_run(args, now)
+        print(f"[dry-run] tag={args.tag} seed={args.seed}")
+        for key, value in stats.items():
+            print(f"   {key}: {value}")
+        return
+
+    conn = connect()
+    try:
+        if args.purge:
+            print(f"Purging generated data for tag={args.tag}")
+            purge(conn, args.tag)
+            conn.commit()
+            return
+
+        with conn.cursor() as cur:
+            seller_ids, bidder_ids = load_users(cur, args)
+            leaf_category_ids = load_categories(cur, args)
+        conn.commit()
+
+        bundles = generate_product_bundles(args, seller_ids, bidder_ids, leaf_category_ids, now)
+        stats = load_catalog(conn, bundles, chunk_size=args.chunk_size, commit_every_chunk=True)
+        conn.commit()
+        elapsed = time.perf_counter() - started
+        print(f"[OK] tag={args.tag} seed={args.seed} loaded in {elapsed:.1f}s")
+        print(f"   users: {len(seller_ids) + len(bidder_ids)} (sellers={len(seller_ids)})")
+        print(f"   leaf categories: {len(leaf_category_ids)}")
+        for key in ("products", "images", "bids", "auto_bids"):
+            print(f"   {key}: {stats[key]}")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -11,6 +11,8 @@ import random
 
 import psycopg2
 
+from bulk_loader import load_catalog
+
 
 DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
@@ -101,95 +103,55 @@ def cleanup_product(conn, slug):
         cur.execute("DELETE FROM products WHERE id=%s", (product_id,))
 
 
-def create_products(conn, seller_id, bidder_ids, category_ids):
-    products = []
-    now = datetime.now(timezone.utc)
-    with conn.cursor() as cur:
-        for idx in range(20):
-            category_id = category_ids[idx % len(category_ids)]
-            name = f"Week8 Product {idx + 1:02d}"
-            slug = f"week8-product-{idx + 1:02d}"
-            cleanup_product(conn, slug)
-            start_at = now - timedelta(hours=2)
-            end_at = now + timedelta(days=3 - (idx % 3))
-            start_price = 600000 + idx * 25000
-            current_price = start_price
-            auto_enabled = idx % 2 == 0
-            cur.execute(
-                """
-                INSERT INTO products (
-                    seller_id, category_id, name, slug, description,
-                    start_price, price_step, current_price, buy_now_price,
-                    auto_extend, enable_auto_bid, status,
-                    start_at, end_at, created_at, updated_at
-                )
-                VALUES (
-                    %(seller)s, %(category)s, %(name)s, %(slug)s, %(desc)s,
-                    %(start_price)s, 50000, %(current_price)s, %(buy_now)s,
-                    TRUE, %(auto)s, 'ACTIVE',
-                    %(start_at)s, %(end_at)s, %(start_at)s, %(start_at)s
-                )
-                RETURNING id
-                """,
+def build_product_bundles(seller_id, bidder_ids, category_ids, now):
+    for idx in range(20):
+        start_at = now - timedelta(hours=2)
+        start_price = 600000 + idx * 25000
+        auto_enabled = idx % 2 == 0
+        bid_amount = start_price + 50000
+        bundle = {
+            "product": {
+                "seller_id": seller_id,
+                "category_id": category_ids[idx % len(category_ids)],
+                "name": f"Week8 Product {idx + 1:02d}",
+                "slug": f"week8-product-{idx + 1:02d}",
+                "description": "Seeded product for Week 8 regression scenarios.",
+                "start_price": start_price,
+                "price_step": 50000,
+                "buy_now_price": start_price * 2,
+                "enable_auto_bid": auto_enabled,
+                "start_at": start_at,
+                "end_at": now + timedelta(days=3 - (idx % 3)),
+                "created_at": start_at,
+                "updated_at": now,
+            },
+            "images": [
                 {
-                    "seller": seller_id,
-                    "category": category_id,
-                    "name": name,
-                    "slug": slug,
-                    "desc": "Seeded product for Week 8 regression scenarios.",
-                    "start_price": start_price,
-                    "current_price": current_price,
-                    "buy_now": start_price * 2,
-                    "auto": auto_enabled,
-                    "start_at": start_at,
-                    "end_at": end_at,
-                },
-            )
-            product_id = cur.fetchone()[0]
-            products.append(product_id)
-            for order in range(1, 4):
-                cur.execute(
-                    """
-                    INSERT INTO product_images (product_id, image_url, display_order)
-                    VALUES (%s, %s, %s)
-                    """,
-                    (
-                        product_id,
-                        f"https://placehold.co/800x600?text=Week8+{idx+1}-{order}",
-                        order,
-                    ),
-                )
+                    "image_url": f"https://placehold.co/800x600?text=Week8+{idx+1}-{order}",
+                    "display_order": order,
+                }
+                for order in range(1, 4)
+            ],
             # add some bids / auto bids
-            bidder_id = random.choice(bidder_ids)
-            bid_amount = current_price + 50000
-            cur.execute(
-                """
-                INSERT INTO bids (product_id, user_id, bid_amount, is_auto_bid)
-                VALUES (%s, %s, %s, FALSE)
-                """,
-                (product_id, bidder_id, bid_amount),
-            )
-            cur.execute(
-                """
-                UPDATE products
-                SET current_price=%s, current_bidder_id=%s, bid_count=1, updated_at=now()
-                WHERE id=%s
-                """,
-                (bid_amount, bidder_id, product_id),
+            "bids": [
+                {"user_id": random.choice(bidder_ids), "bid_amount": bid_amount, "created_at": now}
+            ],
+            "auto_bids": [],
+        }
+        if auto_enabled:
+            bundle["auto_bids"].append(
+                {"user_id": random.choice(bidder_ids), "max_bid_amount": bid_amount + 200000}
             )
-            if auto_enabled:
-                auto_bidder = random.choice(bidder_ids)
-                max_amount = bid_amount + 200000
-                cur.execute(
-                    """
-                    INSERT INTO auto_bids (product_id, user_id, max_bid_amount, created_at, updated_at)
-                    VALUES (%s, %s, %s, now(), now())
-                    ON CONFLICT (product_id, user_id) DO UPDATE
-                    SET max_bid_amount=excluded.max_bid_amount, updated_at=now()
-                    """,
-                    (product_id, auto_bidder, max_amount),
-                )
-    return products
+        yield bundle
+
+
+def create_products(conn, seller_id, bidder_ids, category_ids):
+    now = datetime.now(timezone.utc)
+    bundles = list(build_product_bundles(seller_id, bidder_ids, category_ids, now))
+    for bundle in bundles:
+        cleanup_product(conn, bundle["product"]["slug"])
+    stats = load_catalog(conn, bundles, collect_ids=True)
+    return stats["product_ids"]
 
 
 def create_orders(conn, seller_id, bidder_ids, product_ids):
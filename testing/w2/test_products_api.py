@@ -6,6 +6,9 @@ Scenarios:
 1) Valid sort=end_at,desc&page=1&limit=5
 2) Valid categoryId=2&sort=price,asc&page=2&limit=10
 3) Invalid sort=foo,asc -> expect 400 PRODUCTS.INVALID_SORT
+4) Garbage cursor -> expect 400 PAGINATION.INVALID_CURSOR
+5) Cursor walk over every sort: no duplicates, same rows as one big page
+6) countMode=estimate / countMode=none -> meta.countMode echoes the mode used
 
 Environment variables:
   API_BASE_URL  (default: http://localhost:3000)
@@ -115,12 +118,16 @@ def validate_products_response(body: Any, expected_sort: Optional[str]) -> bool:
     print(pretty_json(meta))
 
     # Required fields
-    required_meta_fields = ["page", "limit", "total", "totalPages", "sort"]
+    required_meta_fields = ["page", "limit", "total", "totalPages", "countMode", "sort"]
     for field in required_meta_fields:
         if field not in meta:
             print(f"❌ Meta missing field: {field}")
             ok = False
 
+    if meta.get("countMode") == "none" and meta.get("total") is not None:
+        print("❌ countMode=none should not report a total")
+        ok = False
+
     # ---- Validate sort object ----
     sort_obj = meta.get("sort")
     if isinstance(sort_obj, dict):
@@ -239,6 +246,49 @@ def run_test_case(tc: ProductsTestCase) -> bool:
     return True
 
 
+def check_cursor_walk(sort: str, limit: int = 5, max_pages: int = 20) -> bool:
+    """
+    Follow meta.nextCursor from the first page and compare the ids with a
+    single page of the same size, which exercises the keyset predicate.
+    """
+    print("\n==============================================")
+    print(f"Cursor walk: sort={sort}, limit={limit}")
+
+    seen = []
+    cursor = None
+    for _ in range(max_pages):
+        params = {"sort": sort, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        resp = requests.get(PRODUCTS_URL, params=params, timeout=10)
+        if resp.status_code != 200:
+            print(f"❌ Cursor page failed with status {resp.status_code}: {resp.text}")
+            return False
+        body = resp.json()
+        meta = body.get("meta") or {}
+        if cursor and meta.get("total") is not None:
+            print("❌ Cursor pages should skip the total unless includeTotal=true")
+            return False
+        seen.extend(item["id"] for item in extract_items_block(body) or [])
+        cursor = meta.get("nextCursor")
+        if not meta.get("hasMore"):
+            break
+
+    if len(seen) != len(set(seen)):
+        print(f"❌ Duplicate ids across cursor pages: {seen}")
+        return False
+
+    resp = requests.get(PRODUCTS_URL, params={"sort": sort, "limit": min(len(seen), 100) or 1}, timeout=10)
+    expected = [item["id"] for item in extract_items_block(resp.json()) or []]
+    if seen[: len(expected)] != expected:
+        print(f"⚠️ Cursor walk {seen[:len(expected)]} differs from single page {expected}")
+        print("   (bids placed during the walk can reorder price/bid_count sorts)")
+        return False
+
+    print(f"✅ {len(seen)} ids across cursor pages, no duplicates")
+    return True
+
+
 # ================== MAIN ==================
 
 def main():
@@ -265,6 +315,25 @@ def main():
             expected_error_code="PRODUCTS.INVALID_SORT",
             description="Should reject invalid sort and return 400 with PRODUCTS.INVALID_SORT.",
         ),
+        ProductsTestCase(
+            name="4. Invalid cursor",
+            params={"sort": "end_at,asc", "cursor": "not-a-cursor", "limit": 5},
+            expected_status=400,
+            expected_error_code="PAGINATION.INVALID_CURSOR",
+            description="Should reject cursors that do not decode or belong to another sort.",
+        ),
+        ProductsTestCase(
+            name="5. Planner-estimated total",
+            params={"sort": "end_at,asc", "countMode": "estimate", "limit": 5},
+            expected_status=200,
+            description="Should return meta.countMode=estimate with an approximate total.",
+        ),
+        ProductsTestCase(
+            name="6. Skip the total",
+            params={"sort": "end_at,asc", "countMode": "none", "limit": 5},
+            expected_status=200,
+            description="Should return meta.total=null and meta.countMode=none.",
+        ),
     ]
 
     all_passed = True
@@ -272,6 +341,9 @@ def main():
         ok = run_test_case(tc)
         all_passed = all_passed and ok
 
+    for sort in ["created_at,desc", "end_at,asc", "price,asc", "price,desc", "bid_count,desc"]:
+        all_passed = check_cursor_walk(sort) and all_passed
+
     print("\n============== SUMMARY ==============")
     if all_passed:
         print("🎉 All tests PASSED")
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Concurrent bid load driver (asyncio + httpx).
+
+Pre-provisions N bidders with the register/login flow from
+test_bidding_flows.py, then fires concurrent POST /products/:id/bid and
+/auto-bid traffic at a handful of hot products and reports:
+- throughput (attempts/s and accepted bids/s)
+- p50/p95/p99 latency per request kind
+- error-code breakdown (BIDS.AMOUNT_TOO_LOW, lock/pool timeouts, ...)
+
+Prerequisites:
+  1. Backend running at API_BASE_URL (default http://localhost:3001)
+  2. Hot products must accept unrated bidders (allow_unrated_bidders) or the
+     provisioned accounts need ratings, otherwise every bid is BIDDER.RATING_REQUIRED.
+  3. Newly registered accounts must be confirmed before login; pass
+     --confirm-via-db to flip them to CONFIRMED directly (uses DB_* env vars).
+
+Example:
+  python testing/w5/load_bidding.py --bidders 50 --hot-products 3 --concurrency 40 --duration 30
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_utils import percentile  # noqa: E402
+from test_bidding_flows import BASE_API, login_user, register_user  # noqa: E402
+
+
+PASSWORD = os.getenv("LOAD_BIDDER_PASSWORD", "LoadPass123!")
+MIN_BID_PATTERN = re.compile(r"(\d+)\s*$")
+
+
+def classify_error(status, payload, exc=None):
+  if exc is not None:
+    if isinstance(exc, httpx.TimeoutException):
+      return "CLIENT.TIMEOUT"
+    return f"CLIENT.{type(exc).__name__}"
+  error = (payload or {}).get("error") or {}
+  code = error.get("code") or f"HTTP_{status}"
+  message = (error.get("message") or "").lower()
+  if "lock timeout" in message or "lock_timeout" in message:
+    return "DB.LOCK_TIMEOUT"
+  if "deadlock" in message:
+    return "DB.DEADLOCK"
+  if "timeout acquiring a connection" in message:
+    return "DB.POOL_TIMEOUT"
+  if "statement timeout" in message:
+    return "DB.STATEMENT_TIMEOUT"
+  return code
+
+
+class LoadStats:
+  def __init__(self):
+    self.latencies = defaultdict(list)
+    self.outcomes = Counter()
+    self.errors = Counter()
+    self.accepted = Counter()
+    self.started = None
+    self.finished = None
+
+  def record(self, kind, elapsed_ms, ok, error_code=None):
+    self.latencies[kind].append(elapsed_ms)
+    self.outcomes[(kind, "ok" if ok else "error")] += 1
+    if ok:
+      self.accepted[kind] += 1
+    else:
+      self.errors[error_code] += 1
+
+  def summary(self):
+    wall = max((self.finished or time.perf_counter()) - (self.started or 0), 1e-9)
+    attempts = sum(len(values) for values in self.latencies.values())
+    kinds = {}
+    for kind, values in self.latencies.items():
+      kinds[kind] = {
+        "attempts": len(values),
+        "accepted": self.accepted[kind],
+        "acceptance_rate": round(self.accepted[kind] / len(values), 4) if values else 0,
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+        "max_ms": round(max(values), 2),
+      }
+    return {
+      "wall_seconds": round(wall, 3),
+      "attempts": attempts,
+      "attempts_per_sec": round(attempts / wall, 2),
+      "accepted_per_sec": round(sum(self.accepted.values()) / wall, 2),
+      "kinds": kinds,
+      "errors": dict(self.errors.most_common()),
+    }
+
+
+class PriceBook:
+  """Latest known price per product, updated from bid responses instead of extra GETs."""
+
+  def __init__(self, products):
+    self.products = {item["id"]: item for item in products}
+    self.prices = {item["id"]: int(item["currentPrice"]) for item in products}
+
+  def step(self, product_id):
+    return int(self.products[product_id]["priceStep"])
+
+  def next_amount(self, product_id, rng, max_steps=3):
+    return self.prices[product_id] + self.step(product_id) * rng.randint(1, max_steps)
+
+  def observe(self, product_id, payload):
+    data = (payload or {}).get("data") or {}
+    product = data.get("product") or {}
+    if product.get("currentPrice") is not None:
+      self.prices[product_id] = max(self.prices[product_id], int(product["currentPrice"]))
+      return
+    message = ((payload or {}).get("error") or {}).get("message") or ""
+    match = MIN_BID_PATTERN.search(message)
+    if match:
+      self.prices[product_id] = max(self.prices[product_id], int(match.group(1)) - self.step(product_id))
+
+
+def confirm_users_via_db(emails):
+  import psycopg2
+
+  config = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", 5433)),
+    "dbname": os.getenv("DB_NAME", "auction_db"),
+    "user": os.getenv("DB_USER", "auction_admin"),
+    "password": os.getenv("DB_PASSWORD", "SieuMatKhau123!@"),
+  }
+  conn = psycopg2.connect(**config)
+  try:
+    with conn.cursor() as cur:
+      cur.execute("UPDATE users SET status='CONFIRMED' WHERE email = ANY(%s)", (list(emails),))
+    conn.commit()
+  finally:
+    conn.close()
+
+
+def try_login(email):
+  # login_user raises on any non-200 (e.g. an unconfirmed account)
+  try:
+    return login_user(email, PASSWORD)
+  except RuntimeError:
+    return None, None
+
+
+def provision_bidders(count, prefix="load", confirm_via_db=False, workers=8):
+  """Register + login `count` bidders with the Week 5 helpers. Returns [(token, user_id), ...],
+  with (None, None) for accounts that could not log in."""
+  emails = [f"{prefix}-{uuid.uuid4().hex[:10]}@example.com" for _ in range(count)]
+  quiet = io.StringIO()
+  with contextlib.redirect_stdout(quiet), ThreadPoolExecutor(max_workers=workers) as pool:
+    list(pool.map(lambda email: register_user(email, PASSWORD), emails))
+  if confirm_via_db:
+    confirm_users_via_db(emails)
+  with contextlib.redirect_stdout(quiet), ThreadPoolExecutor(max_workers=workers) as pool:
+    return list(pool.map(try_login, emails))
+
+
+def discover_hot_products(count, product_ids=None):
+  with httpx.Client(timeout=15) as client:
+    if product_ids:
+      items = []
+      for product_id in product_ids:
+        body = client.get(f"{BASE_API}/products/{product_id}").json()
+        items.append((body.get("data") or {}).get("product"))
+      return [item for item in items if item]
+    body = client.get(f"{BASE_API}/products", params={"limit": count, "sort": "bid_count,desc"}).json()
+    return ((body.get("data") or {}).get("items") or [])[:count]
+
+
+async def timed_post(client, path, token, body):
+  started = time.perf_counter()
+  try:
+    response = await client.post(path, json=body, headers={"Authorization": f"Bearer {token}"})
+  except httpx.HTTPError as exc:
+    return (time.perf_counter() - started) * 1000, None, None, exc
+  elapsed = (time.perf_counter() - started) * 1000
+  try:
+    payload = response.json()
+  except ValueError:
+    payload = {}
+  return elapsed, response.status_code, payload, None
+
+
+async def place_bid(client, stats, book, product_id, token, rng):
+  amount = book.next_amount(product_id, rng)
+  elapsed, status, payload, exc = await timed_post(client, f"/products/{product_id}/bid", token, {"amount": amount})
+  ok = status == 201
+  stats.record("bid", elapsed, ok, None if ok else classify_error(status, payload, exc))
+  book.observe(product_id, payload)
+  return ok, payload
+
+
+async def register_auto_bid(client, stats, book, product_id, token, rng, max_steps=10):
+  ceiling = book.next_amount(product_id, rng, max_steps=max_steps)
+  elapsed, status, payload, exc = await timed_post(
+    client, f"/products/{product_id}/auto-bid", token, {"maxBidAmount": ceiling}
+  )
+  ok = status == 201
+  stats.record("auto_bid", elapsed, ok, None if ok else classify_error(status, payload, exc))
+  book.observe(product_id, payload)
+  return ok, payload
+
+
+async def worker(client, stats, book, bidders, product_ids, deadline, args, seed):
+  rng = random.Random(seed)
+  while time.perf_counter() < deadline:
+    token, _ = rng.choice(bidders)
+    product_id = rng.choice(product_ids)
+    if rng.random() < args.auto_bid_ratio:
+      await register_auto_bid(client, stats, book, product_id, token, rng)
+    else:
+      await place_bid(client, stats, book, product_id, token, rng)
+    if args.think_ms:
+      await asyncio.sleep(rng.uniform(0, args.think_ms) / 1000)
+
+
+async def run_load(args, bidders, products):
+  stats = LoadStats()
+  book = PriceBook(products)
+  product_ids = [item["id"] for item in products]
+  limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+  async with httpx.AsyncClient(base_url=BASE_API, timeout=args.timeout, limits=limits) as client:
+    stats.started = time.perf_counter()
+    deadline = stats.started + args.duration
+    await asyncio.gather(
+      *(worker(client, stats, book, bidders, product_ids, deadline, args, args.seed + index)
+        for index in range(args.concurrency))
+    )
+    stats.finished = time.perf_counter()
+  return stats
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Concurrent bid/auto-bid load driver")
+  parser.add_argument("--bidders", type=int, default=20)
+  parser.add_argument("--hot-products", type=int, default=1)
+  parser.add_argument("--product-ids", default="", help="comma-separated ids instead of discovering by bid_count")
+  parser.add_argument("--concurrency", type=int, default=20)
+  parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+  parser.add_argument("--auto-bid-ratio", type=float, default=0.2)
+  parser.add_argument("--think-ms", type=float, default=0.0)
+  parser.add_argument("--timeout", type=float, default=15.0)
+  parser.add_argument("--seed", type=int, default=7)
+  parser.add_argument("--confirm-via-db", action="store_true")
+  parser.add_argument("--json-out", default=None, help="write the summary JSON to this path")
+  return parser.parse_args(argv)
+
+
+def print_summary(summary):
+  print(f"\nwall={summary['wall_seconds']}s attempts={summary['attempts']} "
+        f"({summary['attempts_per_sec']}/s) accepted={summary['accepted_per_sec']}/s")
+  for kind, data in summary["kinds"].items():
+    print(f"  {kind:<9} n={data['attempts']:<6} ok={data['accepted']:<6} "
+          f"p50={data['p50_ms']}ms p95={data['p95_ms']}ms p99={data['p99_ms']}ms max={data['max_ms']}ms")
+  if summary["errors"]:
+    print("  errors:")
+    for code, count in summary["errors"].items():
+      print(f"    {code:<28} {count}")
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  product_ids = [int(value) for value in args.product_ids.split(",") if value.strip()]
+  products = discover_hot_products(args.hot_products, product_ids)
+  if not products:
+    raise SystemExit("No ACTIVE products found to target.")
+  print(f"API base: {BASE_API}")
+  print(f"Targets: {[item['id'] for item in products]}")
+
+  print(f"Provisioning {args.bidders} bidders...")
+  bidders = [entry for entry in provision_bidders(args.bidders, confirm_via_db=args.confirm_via_db) if entry[0]]
+  if not bidders:
+    raise SystemExit("No bidder could log in; are accounts confirmed?")
+
+  stats = asyncio.run(run_load(args, bidders, products))
+  summary = stats.summary()
+  summary["config"] = {key: value for key, value in vars(args).items() if key != "json_out"}
+  print_summary(summary)
+  if args.json_out:
+    with open(args.json_out, "w", encoding="utf-8") as handle:
+      json.dump(summary, handle, indent=2)
+    print(f"\nSummary written to {args.json_out}")
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
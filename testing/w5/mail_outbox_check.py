@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Mail outbox / coalescing / digest check.
+
+Seeds a fresh Week 5 auction, provisions three bidders (two IMMEDIATE, one
+switched to DIGEST via PUT /profile) and has them outbid each other. Then it
+reads mail_outbox directly and verifies:
+- every outbid / bid-received event is queued exactly once: the rows of a
+  coalesce key add up (1 + coalesced_count) to the number of events
+- at most one PENDING row per coalesce key, and a key's next row is not due
+  before the previous one was claimed + MAIL_COALESCE_WINDOW_SECONDS
+- the DIGEST bidder got no outbid mails, only one digest whose item count
+  matches the outbids, due MAIL_DIGEST_WINDOW_SECONDS after it was queued
+With --dispatch it then waits for the API's dispatcher to deliver what is
+due, pulls the coalesced and digest rows forward and waits for those too.
+
+Prerequisites:
+  1. Backend running at API_BASE_URL with the mail dispatcher enabled and
+     the same MAIL_COALESCE_WINDOW_SECONDS / MAIL_DIGEST_WINDOW_SECONDS
+  2. DB reachable with the DB_* env vars used by the seed scripts
+
+Example:
+  python testing/w5/mail_outbox_check.py --rounds 3 --dispatch --timeout 60
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+import httpx
+import psycopg2
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import seed_week5_data  # noqa: E402
+from load_bidding import BASE_API, provision_bidders  # noqa: E402
+
+
+COALESCE_WINDOW_SECONDS = float(os.getenv("MAIL_COALESCE_WINDOW_SECONDS", 60))
+DIGEST_WINDOW_SECONDS = float(os.getenv("MAIL_DIGEST_WINDOW_SECONDS", 900))
+# clock skew between the DB and the window arithmetic
+TOLERANCE = timedelta(seconds=1)
+
+OUTBOX_SQL = """
+  SELECT id, kind, user_id, coalesce_key, coalesced_count, status, payload,
+         available_at, locked_at, created_at, last_error
+  FROM mail_outbox
+  WHERE id > %s AND (user_id = ANY(%s) OR coalesce_key LIKE %s)
+  ORDER BY id
+"""
+
+
+def seed_auction():
+  conn = psycopg2.connect(**seed_week5_data.DB_CONFIG)
+  try:
+    seller_id = seed_week5_data.upsert_seller(conn)
+    _, child_id = seed_week5_data.ensure_categories(conn)
+    product_id = seed_week5_data.reset_product(conn, seller_id, child_id)
+    with conn.cursor() as cur:
+      cur.execute("UPDATE products SET allow_unrated_bidders = TRUE WHERE id = %s", (product_id,))
+      # earlier runs may have left the seller in DIGEST mode
+      cur.execute("UPDATE users SET notification_mode = 'IMMEDIATE' WHERE id = %s", (seller_id,))
+      cur.execute("SELECT coalesce(max(id), 0) FROM mail_outbox")
+      start_id = cur.fetchone()[0]
+    conn.commit()
+  except Exception:
+    conn.rollback()
+    raise
+  finally:
+    conn.close()
+  return seller_id, product_id, start_id
+
+
+def set_digest_mode(client, token):
+  response = client.put("/profile", json={"notificationMode": "DIGEST"}, headers={"Authorization": f"Bearer {token}"})
+  if response.status_code != 200:
+    raise SystemExit(f"PUT /profile notificationMode=DIGEST -> {response.status_code}: {response.text}")
+
+
+def run_bidding(client, product_id, bidders, rounds):
+  """Bidders take turns topping the price; returns accepted bids and outbids per user."""
+  body = client.get(f"/products/{product_id}").json()
+  product = body["data"]["product"]
+  price, step = int(product["currentPrice"]), int(product.get("priceStep") or 50_000)
+  accepted = 0
+  outbids = {user_id: 0 for _, user_id in bidders}
+  leader = None
+  for _ in range(rounds):
+    for token, user_id in bidders:
+      response = client.post(
+        f"/products/{product_id}/bid", json={"amount": price + step}, headers={"Authorization": f"Bearer {token}"}
+      )
+      if response.status_code != 201:
+        raise SystemExit(f"bid by user {user_id} -> {response.status_code}: {response.text}")
+      price = int(response.json()["data"]["product"]["currentPrice"])
+      accepted += 1
+      if leader is not None and leader != user_id:
+        outbids[leader] += 1
+      leader = user_id
+  return accepted, outbids
+
+
+def fetch_rows(user_ids, product_id, start_id):
+  conn = psycopg2.connect(**seed_week5_data.DB_CONFIG)
+  conn.autocommit = True
+  try:
+    with conn.cursor() as cur:
+      cur.execute(OUTBOX_SQL, (start_id, list(user_ids), f"%:{product_id}"))
+      columns = [column[0] for column in cur.description]
+      return [dict(zip(columns, row)) for row in cur.fetchall()]
+  finally:
+    conn.close()
+
+
+def superseded(row):
+  # folded into a newer pending mail of the same key when it was requeued
+  return row["status"] == "FAILED" and (row["last_error"] or "").startswith("superseded")
+
+
+def check_key(rows, key, expected, failures):
+  """Event count and coalesce window for the rows of one coalesce key."""
+  keyed = [row for row in rows if row["coalesce_key"] == key]
+  events = sum(1 + row["coalesced_count"] for row in keyed if not superseded(row))
+  pending = [row for row in keyed if row["status"] == "PENDING"]
+  if events != expected:
+    failures.append(f"{key}: {events} events queued, expected {expected}")
+  if len(pending) > 1:
+    failures.append(f"{key}: {len(pending)} PENDING rows")
+  window = timedelta(seconds=COALESCE_WINDOW_SECONDS)
+  for previous, row in zip(keyed, keyed[1:]):
+    if previous["locked_at"] and row["available_at"] + TOLERANCE < previous["locked_at"] + window:
+      failures.append(f"{key}: mail {row['id']} due {row['available_at']}, inside the window of mail {previous['id']}")
+  return {"rows": len(keyed), "events": events, "statuses": [row["status"] for row in keyed]}
+
+
+def check_digest(rows, user_id, product_id, expected, failures):
+  direct = [row for row in rows if row["user_id"] == user_id and row["kind"] == "outbid"]
+  if direct:
+    failures.append(f"user {user_id} is in DIGEST mode but got {len(direct)} outbid mails")
+  digests = [row for row in rows if row["coalesce_key"] == f"digest:{user_id}"]
+  item = f"outbid:{product_id}"
+  counted = sum(int(((row["payload"] or {}).get("items") or {}).get(item, {}).get("count", 0)) for row in digests)
+  if counted != expected:
+    failures.append(f"digest:{user_id}: item {item} counts {counted} outbids, expected {expected}")
+  if len([row for row in digests if row["status"] == "PENDING"]) > 1:
+    failures.append(f"digest:{user_id}: more than one PENDING digest")
+  window = timedelta(seconds=DIGEST_WINDOW_SECONDS)
+  for row in digests:
+    if row["available_at"] + TOLERANCE < row["created_at"] + window:
+      failures.append(f"digest mail {row['id']} is due before the digest window ends")
+  return {"rows": len(digests), "outbids_counted": counted, "statuses": [row["status"] for row in digests]}
+
+
+def wait_for_dispatch(ids, timeout, pull_forward=False):
+  """Waits until none of `ids` is PENDING/SENDING; optionally makes them due now first."""
+  conn = psycopg2.connect(**seed_week5_data.DB_CONFIG)
+  conn.autocommit = True
+  try:
+    with conn.cursor() as cur:
+      if pull_forward:
+        cur.execute("UPDATE mail_outbox SET available_at = now() WHERE id = ANY(%s) AND status = 'PENDING'", (ids,))
+      deadline = time.perf_counter() + timeout
+      while True:
+        cur.execute("SELECT status, count(*) FROM mail_outbox WHERE id = ANY(%s) GROUP BY status", (ids,))
+        statuses = dict(cur.fetchall())
+        if not statuses.get("PENDING") and not statuses.get("SENDING"):
+          return statuses
+        if time.perf_counter() > deadline:
+          return statuses
+        time.sleep(0.5)
+  finally:
+    conn.close()
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Verify outbox queueing, coalescing and digests for a bid sequence")
+  parser.add_argument("--rounds", type=int, default=3, help="times each bidder tops the price")
+  parser.add_argument("--dispatch", action="store_true", help="also wait for the dispatcher to deliver the mails")
+  parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for each dispatch phase")
+  parser.add_argument("--skip-db-confirm", action="store_true", help="bidders are confirmed some other way")
+  return parser.parse_args(argv)
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  seller_id, product_id, start_id = seed_auction()
+  # ids come back as strings (BIGINT); mail_outbox.user_id reads as int
+  bidders = [
+    (token, int(user_id))
+    for token, user_id in provision_bidders(3, prefix="outbox", confirm_via_db=not args.skip_db_confirm)
+    if token
+  ]
+  if len(bidders) < 3:
+    raise SystemExit("Could not log in three bidders.")
+  digest_token, digest_user = bidders[2]
+
+  with httpx.Client(base_url=BASE_API, timeout=15) as client:
+    set_digest_mode(client, digest_token)
+    accepted, outbids = run_bidding(client, product_id, bidders, args.rounds)
+
+  user_ids = [user_id for _, user_id in bidders] + [seller_id]
+  rows = fetch_rows(user_ids, product_id, start_id)
+  failures = []
+  report = {
+    "product_id": product_id,
+    "bids": accepted,
+    "windows": {"coalesce_seconds": COALESCE_WINDOW_SECONDS, "digest_seconds": DIGEST_WINDOW_SECONDS},
+    "keys": {},
+  }
+  key = f"bid-received:{seller_id}:{product_id}"
+  report["keys"][key] = check_key(rows, key, accepted, failures)
+  for _, user_id in bidders[:2]:
+    key = f"outbid:{user_id}:{product_id}"
+    report["keys"][key] = check_key(rows, key, outbids[user_id], failures)
+  report["keys"][f"digest:{digest_user}"] = check_digest(rows, digest_user, product_id, outbids[digest_user], failures)
+
+  if args.dispatch:
+    ids = [row["id"] for row in rows]
+    # first what is due now, then the coalesced and digest mails pulled forward
+    report["dispatch"] = {
+      "due": wait_for_dispatch([row["id"] for row in rows if row["available_at"] <= row["created_at"] + TOLERANCE],
+                               args.timeout),
+      "all": wait_for_dispatch(ids, args.timeout, pull_forward=True),
+    }
+    final = fetch_rows(user_ids, product_id, start_id)
+    for row in final:
+      if row["status"] in ("PENDING", "SENDING"):
+        failures.append(f"mail {row['id']} ({row['kind']}) still {row['status']} after {args.timeout}s")
+      elif row["status"] == "FAILED" and not superseded(row):
+        failures.append(f"mail {row['id']} ({row['kind']}) FAILED: {row['last_error']}")
+
+  report["failures"] = failures
+  print(json.dumps(report, indent=2, default=str))
+  if failures:
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Last-second sniping storm benchmark.
+
+Seeds auctions that end at T+60s (via seed_week5_data.reset_product), then
+ramps concurrent manual and auto-bids into the auto-extend window while a
+DB poller samples lock waits on the product rows. Results are emitted as
+JSON so builds can be compared:
+- bid acceptance rate and p50/p95/p99/max latency per request kind
+- lock-wait time (waiting backends and longest wait, sampled from pg_stat_activity)
+- extensions applied (end_at movement vs. the configured extend amount)
+
+Prerequisites:
+  1. Backend running at API_BASE_URL (default http://localhost:3001)
+  2. DB reachable with the DB_* env vars used by the seed scripts (the storm
+     products are reset in place and new bidders are confirmed directly)
+
+Example:
+  python testing/w5/snipe_storm.py --auctions 2 --bidders 200 --peak-concurrency 150 --json-out storm.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import timedelta
+
+import httpx
+import psycopg2
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import seed_week5_data  # noqa: E402
+from bench_utils import percentile  # noqa: E402
+from load_bidding import BASE_API, LoadStats, PriceBook, place_bid, provision_bidders, register_auto_bid  # noqa: E402
+
+
+LOCK_WAIT_SQL = """
+  SELECT count(*),
+         coalesce(max(extract(epoch FROM now() - query_start)) * 1000, 0)
+  FROM pg_stat_activity
+  WHERE wait_event_type = 'Lock'
+    AND datname = current_database()
+"""
+
+
+def seed_storm_auctions(count, ends_in_seconds):
+  conn = psycopg2.connect(**seed_week5_data.DB_CONFIG)
+  conn.autocommit = False
+  base_slug, base_name = seed_week5_data.PRODUCT_SLUG, seed_week5_data.PRODUCT_NAME
+  product_ids = []
+  try:
+    seller_id = seed_week5_data.upsert_seller(conn)
+    _, child_id = seed_week5_data.ensure_categories(conn)
+    for index in range(count):
+      seed_week5_data.PRODUCT_SLUG = f"{base_slug}-storm-{index}"
+      seed_week5_data.PRODUCT_NAME = f"{base_name} Storm {index}"
+      product_ids.append(seed_week5_data.reset_product(conn, seller_id, child_id))
+    with conn.cursor() as cur:
+      cur.execute(
+        """
+        UPDATE products
+        SET end_at = now() + %s, allow_unrated_bidders = TRUE, auto_extend = TRUE
+        WHERE id = ANY(%s)
+        """,
+        (timedelta(seconds=ends_in_seconds), product_ids),
+      )
+      cur.execute("SELECT key, value FROM settings WHERE key IN ('extend_window_min', 'extend_amount_min')")
+      settings = dict(cur.fetchall())
+    conn.commit()
+  except Exception:
+    conn.rollback()
+    raise
+  finally:
+    seed_week5_data.PRODUCT_SLUG, seed_week5_data.PRODUCT_NAME = base_slug, base_name
+    conn.close()
+  return product_ids, {
+    "window_minutes": float(settings.get("extend_window_min", 5)),
+    "extend_minutes": float(settings.get("extend_amount_min", 10)),
+  }
+
+
+class DbPoller(threading.Thread):
+  """Samples lock waits and product end_at/bid_count while the storm runs."""
+
+  def __init__(self, product_ids, interval):
+    super().__init__(daemon=True)
+    self.product_ids = product_ids
+    self.interval = interval
+    self.stop_event = threading.Event()
+    self.lock_samples = []
+    self.end_at_changes = {product_id: 0 for product_id in product_ids}
+    self.initial = {}
+    self.final = {}
+
+  def snapshot(self, cur):
+    cur.execute("SELECT id, end_at, bid_count, status FROM products WHERE id = ANY(%s)", (self.product_ids,))
+    return {row[0]: {"end_at": row[1], "bid_count": row[2], "status": row[3]} for row in cur.fetchall()}
+
+  def run(self):
+    conn = psycopg2.connect(**seed_week5_data.DB_CONFIG)
+    conn.autocommit = True
+    try:
+      with conn.cursor() as cur:
+        self.initial = self.snapshot(cur)
+        previous = self.initial
+        while not self.stop_event.is_set():
+          cur.execute(LOCK_WAIT_SQL)
+          waiting, longest_ms = cur.fetchone()
+          self.lock_samples.append((int(waiting), float(longest_ms)))
+          current = self.snapshot(cur)
+          for product_id, row in current.items():
+            if row["end_at"] != previous.get(product_id, {}).get("end_at"):
+              self.end_at_changes[product_id] += 1
+          previous = current
+          self.stop_event.wait(self.interval)
+        self.final = self.snapshot(cur)
+    finally:
+      conn.close()
+
+  def stop(self):
+    self.stop_event.set()
+    self.join()
+
+
+async def storm_worker(client, stats, book, bidders, product_ids, start_delay, deadline, args, seed):
+  await asyncio.sleep(start_delay)
+  rng = random.Random(seed)
+  while time.perf_counter() < deadline:
+    token, _ = rng.choice(bidders)
+    product_id = rng.choice(product_ids)
+    if rng.random() < args.auto_bid_ratio:
+      await register_auto_bid(client, stats, book, product_id, token, rng, max_steps=20)
+    else:
+      await place_bid(client, stats, book, product_id, token, rng)
+
+
+async def run_storm(args, bidders, products):
+  stats = LoadStats()
+  book = PriceBook(products)
+  product_ids = [item["id"] for item in products]
+  limits = httpx.Limits(max_connections=args.peak_concurrency, max_keepalive_connections=args.peak_concurrency)
+  async with httpx.AsyncClient(base_url=BASE_API, timeout=args.timeout, limits=limits) as client:
+    stats.started = time.perf_counter()
+    deadline = stats.started + args.lead_in + args.duration
+    tasks = []
+    for index in range(args.peak_concurrency):
+      # linear ramp from --start-concurrency to --peak-concurrency over --ramp seconds
+      if index < args.start_concurrency:
+        delay = args.lead_in
+      else:
+        span = max(args.peak_concurrency - args.start_concurrency, 1)
+        delay = args.lead_in + args.ramp * (index - args.start_concurrency + 1) / span
+      tasks.append(
+        storm_worker(client, stats, book, bidders, product_ids, delay, deadline, args, args.seed + index)
+      )
+    await asyncio.gather(*tasks)
+    stats.finished = time.perf_counter()
+  return stats
+
+
+def fetch_products(product_ids):
+  with httpx.Client(base_url=BASE_API, timeout=15) as client:
+    return [client.get(f"/products/{product_id}").json()["data"]["product"] for product_id in product_ids]
+
+
+def build_report(args, stats, poller, settings):
+  summary = stats.summary()
+  waits = [sample[0] for sample in poller.lock_samples]
+  longest = [sample[1] for sample in poller.lock_samples]
+  extend_ms = settings["extend_minutes"] * 60 * 1000
+  products = {}
+  for product_id, before in poller.initial.items():
+    after = poller.final.get(product_id, before)
+    moved_ms = (after["end_at"] - before["end_at"]).total_seconds() * 1000
+    products[str(product_id)] = {
+      "bids_recorded": after["bid_count"] - before["bid_count"],
+      "status": after["status"],
+      "end_at_moved_seconds": round(moved_ms / 1000, 3),
+      "extensions_applied": round(moved_ms / extend_ms) if extend_ms else 0,
+      "end_at_changes_observed": poller.end_at_changes.get(product_id, 0),
+    }
+  return {
+    "scenario": "snipe_storm",
+    "config": {key: value for key, value in vars(args).items() if key != "json_out"},
+    "extend_settings": settings,
+    "throughput": {
+      "wall_seconds": summary["wall_seconds"],
+      "attempts_per_sec": summary["attempts_per_sec"],
+      "accepted_per_sec": summary["accepted_per_sec"],
+    },
+    "latency": summary["kinds"],
+    "errors": summary["errors"],
+    "lock_wait": {
+      "samples": len(poller.lock_samples),
+      "max_waiting_backends": max(waits) if waits else 0,
+      "avg_waiting_backends": round(sum(waits) / len(waits), 2) if waits else 0,
+      "p95_waiting_backends": percentile(waits, 95) if waits else 0,
+      "max_wait_ms": round(max(longest), 2) if longest else 0,
+      "p95_wait_ms": round(percentile(longest, 95), 2) if longest else 0,
+    },
+    "products": products,
+  }
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Final-minute sniping storm benchmark")
+  parser.add_argument("--auctions", type=int, default=1)
+  parser.add_argument("--ends-in", type=float, default=60.0, help="seconds until the seeded auctions end")
+  parser.add_argument("--bidders", type=int, default=100)
+  parser.add_argument("--start-concurrency", type=int, default=10)
+  parser.add_argument("--peak-concurrency", type=int, default=100)
+  parser.add_argument("--lead-in", type=float, default=0.0, help="seconds to wait before the first bids")
+  parser.add_argument("--ramp", type=float, default=30.0, help="seconds to reach peak concurrency")
+  parser.add_argument("--duration", type=float, default=60.0, help="seconds of bidding after lead-in")
+  parser.add_argument("--auto-bid-ratio", type=float, default=0.25)
+  parser.add_argument("--timeout", type=float, default=30.0)
+  parser.add_argument("--poll-interval", type=float, default=0.1)
+  parser.add_argument("--seed", type=int, default=11)
+  parser.add_argument("--skip-db-confirm", action="store_true", help="bidders are confirmed some other way")
+  parser.add_argument("--json-out", default=None)
+  args = parser.parse_args(argv)
+  args.start_concurrency = min(args.start_concurrency, args.peak_concurrency)
+  return args
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  bidders = [entry for entry in provision_bidders(args.bidders, prefix="storm", confirm_via_db=not args.skip_db_confirm) if entry[0]]
+  if not bidders:
+    raise SystemExit("No bidder could log in.")
+
+  product_ids, settings = seed_storm_auctions(args.auctions, args.ends_in)
+  products = fetch_products(product_ids)
+
+  poller = DbPoller(product_ids, args.poll_interval)
+  poller.start()
+  try:
+    stats = asyncio.run(run_storm(args, bidders, products))
+  finally:
+    poller.stop()
+
+  report = build_report(args, stats, poller, settings)
+  output = json.dumps(report, indent=2, default=str)
+  if args.json_out:
+    with open(args.json_out, "w", encoding="utf-8") as handle:
+      handle.write(output)
+  print(output)
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for GET /api/search/suggest.
+
+Builds keystroke-style prefixes (and one-typo variants) from active product
+names returned by /api/products, replays them with a thread pool and prints
+p50/p95/p99/max latency plus the share of empty answers as JSON.
+
+Server-side time is what the target is about, so run this close to the API
+(same host) and compare the numbers between builds rather than absolutely.
+
+Example:
+  python testing/w7/bench_suggest.py --samples 2000 --workers 8
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_utils import percentile  # noqa: E402
+
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3001")
+BASE_API = f"{API_BASE_URL}/api"
+
+
+def load_names(limit):
+  response = requests.get(f"{BASE_API}/products", params={"limit": limit, "sort": "bid_count,desc"}, timeout=15)
+  response.raise_for_status()
+  items = (response.json().get("data") or {}).get("items") or []
+  return [item["name"] for item in items if item.get("name")]
+
+
+def with_typo(rng, word):
+  if len(word) < 4:
+    return word
+  index = rng.randrange(1, len(word) - 1)
+  return word[:index] + word[index + 1:]
+
+
+def build_queries(names, samples, typo_ratio, seed):
+  rng = random.Random(seed)
+  queries = []
+  while len(queries) < samples:
+    words = rng.choice(names).split()
+    word = rng.choice(words)
+    if len(word) < 2:
+      continue
+    prefix = word[: rng.randint(2, len(word))]
+    if rng.random() < typo_ratio:
+      prefix = with_typo(rng, prefix)
+    queries.append(prefix)
+  return queries
+
+
+def run_query(session, query):
+  started = time.perf_counter()
+  response = session.get(f"{BASE_API}/search/suggest", params={"q": query}, timeout=10)
+  elapsed_ms = (time.perf_counter() - started) * 1000
+  suggestions = (response.json().get("data") or {}).get("suggestions") or [] if response.ok else []
+  return elapsed_ms, response.status_code, len(suggestions)
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Search suggest latency benchmark")
+  parser.add_argument("--names", type=int, default=100, help="product names to derive prefixes from")
+  parser.add_argument("--samples", type=int, default=1000)
+  parser.add_argument("--workers", type=int, default=4)
+  parser.add_argument("--typo-ratio", type=float, default=0.2)
+  parser.add_argument("--seed", type=int, default=7)
+  args = parser.parse_args()
+
+  names = load_names(args.names)
+  if not names:
+    raise SystemExit("No active products to build queries from.")
+  queries = build_queries(names, args.samples, args.typo_ratio, args.seed)
+
+  session = requests.Session()
+  run_query(session, queries[0])  # warm-up (first call may trigger the index build)
+  started = time.perf_counter()
+  with ThreadPoolExecutor(max_workers=args.workers) as pool:
+    results = list(pool.map(lambda query: run_query(session, query), queries))
+  wall = time.perf_counter() - started
+
+  latencies = [result[0] for result in results]
+  errors = sum(1 for result in results if result[1] != 200)
+  empty = sum(1 for result in results if result[1] == 200 and result[2] == 0)
+  print(json.dumps({
+    "samples": len(results),
+    "requests_per_sec": round(len(results) / wall, 1) if wall else 0,
+    "latency_ms": {
+      "p50": round(percentile(latencies, 50), 2),
+      "p95": round(percentile(latencies, 95), 2),
+      "p99": round(percentile(latencies, 99), 2),
+      "max": round(max(latencies), 2),
+    },
+    "errors": errors,
+    "empty_ratio": round(empty / len(results), 3),
+  }, indent=2))
+
+
+if __name__ == "__main__":
+  main()
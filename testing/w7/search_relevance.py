@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Relevance and latency regression for GET /api/search.
+
+Seeds a handful of Vietnamese listings (with --seed), then runs accented,
+unaccented and mixed-case queries against them with sort=relevance,desc
+(builds without it fall back to their default order, recorded as "sort" in
+the summary, so a baseline can come from the previous build) and checks that:
+  - the expected listing is within the top K results,
+  - a listing matching in its name ranks above one matching only in the
+    description (when a case names a decoy).
+
+Each query is replayed --rounds times; the first call is reported as cold
+(the API caches result pages), the rest as warm. Prints a JSON report and
+exits non-zero on any miss or, with --baseline, when hit rate drops or p95
+latency grows past --tolerance.
+
+Example:
+  python testing/w7/search_relevance.py --seed --rounds 20 --save w7_relevance.json
+  python testing/w7/search_relevance.py --baseline w7_relevance.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_utils import percentile  # noqa: E402
+
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3001")
+BASE_API = f"{API_BASE_URL}/api"
+
+PRODUCTS = [
+  ("Điện thoại Samsung Galaxy S10 cũ", "w7-rel-dien-thoai", "Máy còn đẹp, pin tốt, kèm sạc."),
+  ("Đồng hồ cơ Seiko 5 Automatic", "w7-rel-dong-ho", "Đồng hồ chính hãng, dây thép không gỉ."),
+  ("Máy ảnh Canon AE-1 Program", "w7-rel-may-anh", "Máy ảnh phim cổ điển kèm ống kính 50mm."),
+  ("Áo dài lụa tơ tằm Hà Đông", "w7-rel-ao-dai", "Áo dài may đo, lụa mềm, màu xanh ngọc."),
+  ("Bàn phím cơ Leopold FC900R", "w7-rel-ban-phim", "Switch Cherry MX Brown, keycap PBT."),
+  ("Chuột gaming Logitech G502", "w7-rel-chuot", "Tặng kèm lót chuột, hợp với bàn phím cơ."),
+]
+
+CASES = [
+  {"q": "điện thoại", "expect": "w7-rel-dien-thoai", "top": 3},
+  {"q": "dien thoai", "expect": "w7-rel-dien-thoai", "top": 3},
+  {"q": "DIEN THOAI samsung", "expect": "w7-rel-dien-thoai", "top": 1},
+  {"q": "dong ho seiko", "expect": "w7-rel-dong-ho", "top": 1},
+  {"q": "đồng hồ", "expect": "w7-rel-dong-ho", "top": 3},
+  {"q": "may anh canon", "expect": "w7-rel-may-anh", "top": 1},
+  {"q": "ao dai lua", "expect": "w7-rel-ao-dai", "top": 1},
+  {"q": "ha dong", "expect": "w7-rel-ao-dai", "top": 3},
+  {"q": "ban phim co", "expect": "w7-rel-ban-phim", "top": 3, "above": "w7-rel-chuot"},
+]
+
+
+def seed_products():
+  import psycopg2
+  from seed_week7_data import DB_CONFIG, SELLER_EMAIL, SELLER_PASSWORD_HASH, ensure_category, upsert_user
+
+  conn = psycopg2.connect(**DB_CONFIG)
+  try:
+    seller_id = upsert_user(conn, SELLER_EMAIL, SELLER_PASSWORD_HASH, "SELLER")
+    category_id = ensure_category(conn)
+    start_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    with conn.cursor() as cur:
+      for name, slug, description in PRODUCTS:
+        cur.execute("DELETE FROM products WHERE slug=%s", (slug,))
+        cur.execute(
+          """
+          INSERT INTO products (
+            seller_id, category_id, name, slug, description,
+            start_price, price_step, current_price,
+            auto_extend, enable_auto_bid, status,
+            start_at, end_at, created_at, updated_at
+          )
+          VALUES (%s, %s, %s, %s, %s, 500000, 50000, 500000, TRUE, TRUE, 'ACTIVE', %s, %s, %s, %s)
+          """,
+          (seller_id, category_id, name, slug, description,
+           start_at, start_at + timedelta(days=3), start_at, start_at),
+        )
+    conn.commit()
+  finally:
+    conn.close()
+  print(f"Seeded {len(PRODUCTS)} listings; give the API a moment to drop cached search pages.")
+
+
+def rejected_filters(response):
+  # older builds reject sort=relevance (the oldest ones includeTotal too),
+  # either with a 400 or with an empty 200 "Invalid search filters" page
+  if response.status_code == 400:
+    return True
+  return response.ok and response.json().get("message") == "Invalid search filters"
+
+
+def run_search(session, query, options):
+  params = {"q": query, "limit": 20}
+  if options["sort"]:
+    params.update(sort=options["sort"], includeTotal="false")
+  started = time.perf_counter()
+  response = session.get(f"{BASE_API}/search", params=params, timeout=15)
+  elapsed_ms = (time.perf_counter() - started) * 1000
+  if options["sort"] and rejected_filters(response):
+    print(f"sort={options['sort']} is not supported here; using the API's default order", file=sys.stderr)
+    options["sort"] = None
+    return run_search(session, query, options)
+  response.raise_for_status()
+  items = (response.json().get("data") or {}).get("items") or []
+  return elapsed_ms, [item.get("slug") for item in items]
+
+
+def position(slugs, slug):
+  return slugs.index(slug) + 1 if slug in slugs else None
+
+
+def evaluate(session, case, rounds, options):
+  latencies = []
+  slugs = []
+  for _ in range(rounds):
+    elapsed_ms, slugs = run_search(session, case["q"], options)
+    latencies.append(elapsed_ms)
+
+  rank = position(slugs, case["expect"])
+  result = {
+    "q": case["q"],
+    "expect": case["expect"],
+    "rank": rank,
+    "hit": rank is not None and rank <= case["top"],
+    "cold_ms": round(latencies[0], 2),
+    "warm_ms": [round(value, 2) for value in latencies[1:]],
+  }
+  if case.get("above"):
+    decoy = position(slugs, case["above"])
+    ordered = rank is not None and (decoy is None or rank < decoy)
+    result["above"] = {"slug": case["above"], "rank": decoy, "ok": ordered}
+    result["hit"] = result["hit"] and ordered
+  return result
+
+
+def summarize(results, sort):
+  cold = [result["cold_ms"] for result in results]
+  warm = [value for result in results for value in result["warm_ms"]]
+  reciprocal = [1 / result["rank"] if result["rank"] else 0 for result in results]
+  return {
+    "cases": len(results),
+    "sort": sort or "default",
+    "hit_rate": round(sum(1 for result in results if result["hit"]) / len(results), 3),
+    "mrr": round(sum(reciprocal) / len(results), 3),
+    "cold_ms": {"p50": round(percentile(cold, 50), 2), "p95": round(percentile(cold, 95), 2)},
+    "warm_ms": {"p50": round(percentile(warm, 50), 2), "p95": round(percentile(warm, 95), 2)},
+  }
+
+
+def compare(summary, baseline, tolerance):
+  problems = []
+  if summary["hit_rate"] < baseline["hit_rate"]:
+    problems.append(f"hit rate {summary['hit_rate']} < baseline {baseline['hit_rate']}")
+  if summary["mrr"] < baseline["mrr"]:
+    problems.append(f"MRR {summary['mrr']} < baseline {baseline['mrr']}")
+  for phase in ("cold_ms", "warm_ms"):
+    limit = baseline[phase]["p95"] * (1 + tolerance)
+    if summary[phase]["p95"] > limit:
+      problems.append(f"{phase} p95 {summary[phase]['p95']} > {round(limit, 2)}")
+  return problems
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Search relevance/latency regression")
+  parser.add_argument("--seed", action="store_true", help="insert the Vietnamese fixtures first (needs DB access)")
+  parser.add_argument("--rounds", type=int, default=10, help="calls per query; the first one counts as cold")
+  parser.add_argument("--baseline", help="JSON summary from a previous --save to compare against")
+  parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth over the baseline")
+  parser.add_argument("--save", help="write this run's summary to a file")
+  args = parser.parse_args()
+
+  if args.seed:
+    seed_products()
+
+  session = requests.Session()
+  options = {"sort": "relevance,desc"}
+  results = [evaluate(session, case, max(args.rounds, 2), options) for case in CASES]
+  summary = summarize(results, options["sort"])
+
+  problems = [f"miss: {result['q']!r} -> {result['expect']} at {result['rank']}" for result in results if not result["hit"]]
+  if args.baseline:
+    with open(args.baseline, encoding="utf-8") as handle:
+      problems += compare(summary, json.load(handle), args.tolerance)
+
+  print(json.dumps({
+    "summary": summary,
+    "results": [{key: value for key, value in result.items() if key != "warm_ms"} for result in results],
+    "problems": problems,
+  }, indent=2, ensure_ascii=False))
+
+  if args.save:
+    with open(args.save, "w", encoding="utf-8") as handle:
+      json.dump(summary, handle, indent=2)
+
+  if problems:
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -58,6 +58,13 @@ def main():
   response, body = request("get", "/search", params={"q": "camera"})
   assert response.status_code == 200, "Search should succeed"
   assert (body.get("data") or {}).get("items"), "Search should return products"
+  response, body = request("get", "/search", params={"q": "camera", "facets": "true"})
+  facets = (body.get("data") or {}).get("facets") or {}
+  meta = (body.get("data") or {}).get("meta") or {}
+  assert facets.get("categories") is not None, "Faceted search should return category counts"
+  if meta.get("countMode") == "exact":
+    total = meta["total"]
+    assert sum(bucket["count"] for bucket in facets.get("price", [])) == total, "Price buckets should cover every match"
 
   # 2. Reset password flow
   email = f"w7-reset-{uuid.uuid4().hex[:5]}@example.com"
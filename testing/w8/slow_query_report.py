@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Aggregates the API slow-query log (SLOW_QUERY_LOG=true) by SQL fingerprint.
+
+Reads backend/logs/slow-queries.jsonl plus its rotated siblings (.1, .2, ...)
+or the files given, groups entries by fingerprint and prints them ordered
+by total time (or --sort count / p95 / max): call count, p50/p95/max ms,
+the callers that issued the shape, and the plan nodes of the latest
+EXPLAIN (sequential scans and row-estimate misses are flagged), so index
+work can start from the queries that actually cost the most.
+
+Example:
+  python testing/w8/slow_query_report.py --top 15
+  python testing/w8/slow_query_report.py backend/logs/slow-queries.jsonl* --since 2026-10-18T00:00 --json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_utils import percentile  # noqa: E402
+
+
+DEFAULT_LOG = os.path.join(
+  os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+  "backend", "logs", "slow-queries.jsonl",
+)
+
+
+def log_files(paths):
+  if paths:
+    return paths
+  return sorted(glob.glob(f"{DEFAULT_LOG}*"), key=os.path.getmtime)
+
+
+def read_entries(paths, since):
+  for path in paths:
+    with open(path, encoding="utf-8") as handle:
+      for line_no, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+          continue
+        try:
+          entry = json.loads(line)
+        except json.JSONDecodeError:
+          print(f"skipping malformed line {path}:{line_no}", file=sys.stderr)
+          continue
+        if since and entry.get("at", "") < since:
+          continue
+        yield entry
+
+
+def walk_plan(node, found):
+  """Collects scan nodes and estimate misses from an EXPLAIN (FORMAT JSON) tree."""
+  node_type = node.get("Node Type", "")
+  relation = node.get("Relation Name")
+  if relation and "Scan" in node_type:
+    found["scans"].append(f"{node_type} on {relation}" + (f" ({node['Index Name']})" if node.get("Index Name") else ""))
+  planned = node.get("Plan Rows")
+  actual = node.get("Actual Rows")
+  if planned and actual is not None:
+    ratio = max(planned, actual) / max(min(planned, actual), 1)
+    if ratio >= 10:
+      found["misestimates"].append(f"{node_type}{' on ' + relation if relation else ''}: planned {planned}, actual {actual}")
+  for child in node.get("Plans", []):
+    walk_plan(child, found)
+
+
+def summarize_plan(explain):
+  plan = explain.get("plan") if explain else None
+  if not plan:
+    return None
+  root = plan[0] if isinstance(plan, list) else plan
+  found = {"scans": [], "misestimates": []}
+  walk_plan(root.get("Plan", {}), found)
+  summary = {
+    "analyzed": explain.get("analyzed", False),
+    "total_cost": root.get("Plan", {}).get("Total Cost"),
+    "execution_ms": root.get("Execution Time"),
+    "scans": found["scans"],
+    "misestimates": found["misestimates"],
+  }
+  summary["seq_scans"] = [scan for scan in found["scans"] if scan.startswith("Seq Scan")]
+  return summary
+
+
+def aggregate(entries):
+  groups = defaultdict(lambda: {
+    "durations": [], "callers": Counter(), "errors": 0, "in_transaction": 0, "explain": None, "explain_at": "",
+  })
+  fingerprints = {}
+  for entry in entries:
+    key = entry.get("fingerprintId") or entry.get("fingerprint")
+    group = groups[key]
+    fingerprints[key] = entry.get("fingerprint", "")
+    group["durations"].append(float(entry.get("durationMs", 0)))
+    group["callers"][entry.get("caller", "unknown")] += 1
+    group["errors"] += 1 if entry.get("error") else 0
+    group["in_transaction"] += 1 if entry.get("inTransaction") else 0
+    if entry.get("explain") and entry.get("at", "") >= group["explain_at"]:
+      group["explain"] = entry["explain"]
+      group["explain_at"] = entry.get("at", "")
+
+  rows = []
+  for key, group in groups.items():
+    durations = group["durations"]
+    rows.append({
+      "fingerprint_id": key,
+      "fingerprint": fingerprints[key],
+      "count": len(durations),
+      "total_ms": round(sum(durations), 1),
+      "p50_ms": round(percentile(durations, 50), 1),
+      "p95_ms": round(percentile(durations, 95), 1),
+      "max_ms": round(max(durations), 1),
+      "callers": dict(group["callers"].most_common(5)),
+      "errors": group["errors"],
+      "in_transaction": group["in_transaction"],
+      "plan": summarize_plan(group["explain"]),
+    })
+  return rows
+
+
+def print_table(rows, total_ms, width):
+  for rank, row in enumerate(rows, 1):
+    share = row["total_ms"] / total_ms * 100 if total_ms else 0
+    print(f"#{rank} {row['fingerprint_id']}  total {row['total_ms']}ms ({share:.1f}%)  "
+          f"n={row['count']}  p50 {row['p50_ms']}  p95 {row['p95_ms']}  max {row['max_ms']}")
+    sql = row["fingerprint"]
+    print(f"   {sql[:width]}{'…' if len(sql) > width else ''}")
+    print(f"   callers: {', '.join(f'{name} ×{count}' for name, count in row['callers'].items())}")
+    plan = row["plan"]
+    if plan:
+      label = "EXPLAIN ANALYZE" if plan["analyzed"] else "EXPLAIN"
+      print(f"   {label}: cost {plan['total_cost']}" + (f", {plan['execution_ms']}ms" if plan["execution_ms"] is not None else ""))
+      for scan in plan["seq_scans"]:
+        print(f"     ! {scan}")
+      for miss in plan["misestimates"][:3]:
+        print(f"     ~ {miss}")
+    print()
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Aggregate the slow-query JSONL log by fingerprint")
+  parser.add_argument("files", nargs="*", help=f"log files (default: {DEFAULT_LOG}*)")
+  parser.add_argument("--since", help="ignore entries before this ISO timestamp")
+  parser.add_argument("--sort", choices=["total", "count", "p95", "max"], default="total")
+  parser.add_argument("--top", type=int, default=20)
+  parser.add_argument("--width", type=int, default=160, help="truncate printed SQL to this many characters")
+  parser.add_argument("--json", action="store_true", help="print the aggregated rows as JSON")
+  args = parser.parse_args()
+
+  files = log_files(args.files)
+  if not files:
+    raise SystemExit("No slow-query log found; start the API with SLOW_QUERY_LOG=true first.")
+
+  rows = aggregate(read_entries(files, args.since))
+  if not rows:
+    raise SystemExit("The log has no entries in range.")
+  sort_key = {"total": "total_ms", "count": "count", "p95": "p95_ms", "max": "max_ms"}[args.sort]
+  rows.sort(key=lambda row: row[sort_key], reverse=True)
+  total_ms = sum(row["total_ms"] for row in rows)
+
+  if args.json:
+    print(json.dumps({"files": files, "fingerprints": len(rows), "total_ms": round(total_ms, 1), "rows": rows[: args.top]},
+                     indent=2, ensure_ascii=False))
+    return
+
+  print(f"{len(rows)} fingerprints, {sum(row['count'] for row in rows)} slow queries, {round(total_ms, 1)}ms total "
+        f"from {len(files)} file(s)\n")
+  print_table(rows[: args.top], total_ms, args.width)
+
+
+if __name__ == "__main__":
+  main()
@@ -4,14 +4,29 @@ Manual refresh-token regression (do not auto-run):
 - Login, capture access token
 - Call refresh to get new access token
 - Call logout to revoke refresh token
+
+With --storm it becomes a rotation-storm benchmark instead: --sessions
+logins each rotate their refresh token --rotations times (sequentially per
+session, sessions in parallel), then log out. Prints refresh latency
+percentiles and checks that replayed/rotated and logged-out tokens are
+rejected, e.g.
+
+  python testing/w8/test_refresh_flow.py --storm --sessions 50 --rotations 40 --workers 16
 """
 
+import argparse
 import json
 import os
-import uuid
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_utils import percentile  # noqa: E402
+
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:3001")
 BASE_API = f"{API_BASE_URL}/api"
 BYPASS_TOKEN = os.getenv("RECAPTCHA_BYPASS_TOKEN", "local-dev")
@@ -46,7 +61,7 @@ def request(method, path, token=None, **kwargs):
   return response, payload, response.cookies
 
 
-def main():
+def run_flow():
   print(f"API base: {API_BASE_URL}")
   if not USER_EMAIL or not USER_PASSWORD:
     raise SystemExit("Please set W8_REFRESH_EMAIL and W8_REFRESH_PASSWORD for an existing confirmed account.")
@@ -74,5 +89,92 @@ def main():
   print("\n✅ Refresh/logout flow executed and verified.")
 
 
+def login_for_refresh(session, retries=5):
+  for attempt in range(retries):
+    response = session.post(f"{BASE_API}/auth/login", json={"email": USER_EMAIL, "password": USER_PASSWORD}, timeout=30)
+    if response.status_code == 429:
+      time.sleep(float(response.headers.get("Retry-After", 1)) * (attempt + 1))
+      continue
+    response.raise_for_status()
+    return response.cookies.get("refresh_token")
+  raise RuntimeError("login kept returning 429")
+
+
+def refresh_once(session, refresh_token):
+  # send exactly this token, not whatever the jar kept from earlier responses
+  session.cookies.clear()
+  started = time.perf_counter()
+  response = session.post(f"{BASE_API}/auth/refresh", cookies={"refresh_token": refresh_token}, timeout=30)
+  elapsed_ms = (time.perf_counter() - started) * 1000
+  return elapsed_ms, response.status_code, response.cookies.get("refresh_token")
+
+
+def storm_session(rotations):
+  session = requests.Session()
+  result = {"latencies": [], "errors": 0, "replay_rejected": None, "logout_rejected": None}
+  first_token = token = login_for_refresh(session)
+  if not token:
+    raise RuntimeError("login did not set a refresh_token cookie")
+
+  for _ in range(rotations):
+    elapsed_ms, status, next_token = refresh_once(session, token)
+    result["latencies"].append(elapsed_ms)
+    if status != 200 or not next_token:
+      result["errors"] += 1
+      break
+    token = next_token
+
+  # a rotated-away token must not work again
+  if token != first_token:
+    _, status, _ = refresh_once(session, first_token)
+    result["replay_rejected"] = status == 401
+
+  # logout revokes the whole family, including the latest token
+  session.post(f"{BASE_API}/auth/logout", json={"refreshToken": token}, timeout=30)
+  _, status, _ = refresh_once(session, token)
+  result["logout_rejected"] = status == 401
+  return result
+
+
+def run_storm(sessions, rotations, workers):
+  started = time.perf_counter()
+  with ThreadPoolExecutor(max_workers=workers) as pool:
+    results = list(pool.map(lambda _: storm_session(rotations), range(sessions)))
+  wall = time.perf_counter() - started
+
+  latencies = [value for result in results for value in result["latencies"]]
+  report = {
+    "sessions": sessions,
+    "rotations": len(latencies),
+    "refresh_per_sec": round(len(latencies) / wall, 1) if wall else 0,
+    "latency_ms": {
+      "p50": round(percentile(latencies, 50), 2),
+      "p95": round(percentile(latencies, 95), 2),
+      "p99": round(percentile(latencies, 99), 2),
+      "max": round(max(latencies), 2) if latencies else 0,
+    },
+    "errors": sum(result["errors"] for result in results),
+    "replay_not_rejected": sum(1 for result in results if result["replay_rejected"] is False),
+    "logout_not_rejected": sum(1 for result in results if result["logout_rejected"] is False),
+  }
+  print(pretty(report))
+  if report["errors"] or report["replay_not_rejected"] or report["logout_not_rejected"]:
+    raise SystemExit(1)
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Refresh-token flow check / rotation-storm benchmark")
+  parser.add_argument("--storm", action="store_true", help="run the rotation-storm benchmark")
+  parser.add_argument("--sessions", type=int, default=20)
+  parser.add_argument("--rotations", type=int, default=25, help="refreshes per session")
+  parser.add_argument("--workers", type=int, default=8)
+  args = parser.parse_args()
+
+  if args.storm:
+    run_storm(args.sessions, args.rotations, args.workers)
+  else:
+    run_flow()
+
+
 if __name__ == "__main__":
   main()